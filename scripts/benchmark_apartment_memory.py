@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Compare the memory footprint of Apartment objects: a plain dict-based model
+holding every field eagerly versus the slotted model backed by the columnar
+store, whose large text fields stay in the store until accessed.
+
+Usage:
+    python scripts/benchmark_apartment_memory.py [--rows 100000]
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from data.apartment_store import ApartmentStore, APARTMENT_FIELDS
+from utils.synthetic import make_apartment_frame
+
+
+class EagerApartment:
+    """The original model: a per-instance __dict__ with every field copied in."""
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+def measure(build):
+    tracemalloc.start()
+    objects = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    store = ApartmentStore.from_dataframe(make_apartment_frame(args.rows))
+
+    def build_eager():
+        # Copy the strings so the eager model owns its text, as it does when
+        # rows are read out of string-typed (non-object) DataFrame columns
+        columns = [[(value + ' ')[:-1] if isinstance(value, str) else value
+                    for value in store._field_values(field, range(len(store)))]
+                   for field in APARTMENT_FIELDS]
+        return [EagerApartment(**dict(zip(APARTMENT_FIELDS, values)))
+                for values in zip(*columns)]
+
+    eager, eager_bytes = measure(build_eager)
+    del eager
+    compact, compact_bytes = measure(store.to_apartments)
+
+    print(f"Rows:                {args.rows:,}")
+    print(f"Eager dict model:    {eager_bytes / 2**20:8.1f} MiB "
+          f"({eager_bytes / args.rows:,.0f} bytes/apartment)")
+    print(f"Slotted lazy model:  {compact_bytes / 2**20:8.1f} MiB "
+          f"({compact_bytes / args.rows:,.0f} bytes/apartment)")
+    print(f"Reduction:           {eager_bytes / compact_bytes:8.1f}x")
+    print(f"Sample body (lazy):  {compact[0].body[:40]!r}")
+
+
+if __name__ == "__main__":
+    main()
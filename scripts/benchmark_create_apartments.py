@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark Apartment object creation: the original iterrows() loop versus the
+column-wise bulk path used by DatasetManager.create_apartments().
+
+Usage:
+    python scripts/benchmark_create_apartments.py [--sizes 100000 1000000]
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.apartment import Apartment
+from data.apartment_store import ApartmentStore, APARTMENT_FIELDS
+from utils.synthetic import make_apartment_frame
+
+
+def create_with_iterrows(df):
+    """The row-by-row construction create_apartments() used previously."""
+    apartments = []
+    for _, row in df.iterrows():
+        apartments.append(Apartment(**{field: row.get(field) for field in APARTMENT_FIELDS}))
+    return apartments
+
+
+def create_with_store(df):
+    return ApartmentStore.from_dataframe(df).to_apartments()
+
+
+def same_value(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b and type(a) is type(b)
+
+
+def check_identical(expected, actual):
+    if len(expected) != len(actual):
+        return False
+    return all(same_value(getattr(e, field), getattr(a, field))
+               for e, a in zip(expected, actual) for field in APARTMENT_FIELDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'iterrows (s)':>14} {'bulk (s)':>10} {'speedup':>9} {'identical':>10}")
+    for size in args.sizes:
+        df = make_apartment_frame(size)
+
+        start = time.perf_counter()
+        legacy = create_with_iterrows(df)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bulk = create_with_store(df)
+        bulk_time = time.perf_counter() - start
+
+        identical = check_identical(legacy, bulk)
+        print(f"{size:>10,} {legacy_time:>14.3f} {bulk_time:>10.3f} "
+              f"{legacy_time / bulk_time:>8.1f}x {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark radius queries: the scalar per-apartment haversine loop, a full
+vectorized NumPy scan, and the grid index used by filter_by_proximity().
+
+Usage:
+    python scripts/benchmark_proximity.py [--sizes 100000 10000000] [--queries 50]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from algorithms.spatial import GridIndex, haversine_km
+from data.location_analysis import LocationAnalysis
+
+# The scalar loop is only timed up to this many points
+SCALAR_LIMIT = 200_000
+
+
+def make_points(n, rng):
+    """Points clustered around a few US metros, plus a uniform background."""
+    centres = np.array([[40.71, -74.01], [34.05, -118.24], [41.88, -87.63],
+                        [29.76, -95.37], [39.74, -104.99], [47.61, -122.33]])
+    which = rng.integers(0, len(centres), n)
+    lats = centres[which, 0] + rng.normal(0, 0.3, n)
+    lons = centres[which, 1] + rng.normal(0, 0.3, n)
+    background = rng.random(n) < 0.1
+    lats[background] = rng.uniform(25, 49, background.sum())
+    lons[background] = rng.uniform(-125, -67, background.sum())
+    return lats, lons
+
+
+def scalar_query(lats, lons, lat, lon, radius):
+    distance = LocationAnalysis().calculate_distance
+    return [i for i, (a, b) in enumerate(zip(lats, lons))
+            if distance(lat, lon, a, b) <= radius]
+
+
+def full_scan(lats, lons, lat, lon, radius):
+    return np.flatnonzero(haversine_km(lat, lon, lats, lons) <= radius)
+
+
+def timed(func, queries):
+    start = time.perf_counter()
+    results = [func(*q) for q in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 10_000_000])
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--radius', type=float, default=10.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'points':>11} {'build (s)':>10} {'scalar (ms)':>12} {'scan (ms)':>10} "
+          f"{'grid (ms)':>10} {'identical':>10}")
+
+    for size in args.sizes:
+        lats, lons = make_points(size, rng)
+        picks = rng.integers(0, size, args.queries)
+        queries = [(lats[i], lons[i], args.radius) for i in picks]
+
+        start = time.perf_counter()
+        index = GridIndex(lats, lons)
+        build_time = time.perf_counter() - start
+
+        grid_results, grid_time = timed(index.query_radius, queries)
+        scan_results, scan_time = timed(lambda *q: full_scan(lats, lons, *q), queries)
+        identical = all(np.array_equal(g, s) for g, s in zip(grid_results, scan_results))
+
+        scalar_cell = "skipped"
+        if size <= SCALAR_LIMIT:
+            lat_list, lon_list = lats.tolist(), lons.tolist()
+            scalar_results, scalar_time = timed(
+                lambda *q: scalar_query(lat_list, lon_list, *q), queries[:5])
+            identical &= all(np.array_equal(g, s) for g, s in zip(grid_results, scalar_results))
+            scalar_cell = f"{scalar_time * 1e3:.2f}"
+
+        print(f"{size:>11,} {build_time:>10.2f} {scalar_cell:>12} {scan_time * 1e3:>10.2f} "
+              f"{grid_time * 1e3:>10.3f} {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ingest and analysis pipeline at several dataset sizes.
+
+Times loading, cleaning, object creation, sorting, searching, proximity
+queries and group-by on synthetic data (median and p95 of several runs,
+plus peak traced memory), writes the results as JSON and, given a
+baseline file from an earlier run, flags cases whose median got slower.
+
+Usage:
+    python scripts/run_benchmarks.py [--sizes 10000 100000] [--repeat 5]
+        [--output results.json] [--baseline baseline.json] [--threshold 0.1]
+        [--only sort search]
+
+Exits with status 1 when a regression is found.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from algorithms.search import SearchAlgorithms
+from algorithms.sorting import SortingAlgorithms
+from algorithms.spatial import GridIndex
+from data.dataset_manager import DatasetManager
+from data.groupby import group_by
+from data.indexes import spatial_index
+from utils.benchmark import (DEFAULT_REGRESSION_THRESHOLD, DEFAULT_REPEAT, DEFAULT_WARMUP,
+                             compare_to_baseline, format_results, load_results, measure,
+                             write_results)
+from utils.synthetic import make_apartment_frame
+
+# Object-level sorts are only timed up to this many apartments
+OBJECT_SORT_LIMIT = 200_000
+
+STAGES = ('load', 'clean', 'create', 'sort', 'search', 'proximity', 'groupby')
+
+
+def quiet(func):
+    """Wrap a pipeline step so its progress prints stay out of the report."""
+    def run(*args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args, **kwargs)
+    return run
+
+
+def write_dataset(size, directory):
+    path = Path(directory) / f"apartments_{size}.csv"
+    make_apartment_frame(size, seed=size).to_csv(path, sep=';', index=False)
+    return str(path)
+
+
+def run_size(size, directory, stages, repeat, warmup):
+    """Every selected benchmark at one dataset size."""
+    def bench(name, func, *args, **kwargs):
+        kwargs.setdefault('repeat', repeat)
+        kwargs.setdefault('warmup', warmup)
+        return measure(func, *args, name=name, size=size, **kwargs)
+
+    path = write_dataset(size, directory)
+    manager = DatasetManager(path)
+    quiet(manager.load_data)()
+    quiet(manager.clean_data)()
+    store = manager.store
+    results = []
+
+    if 'load' in stages:
+        results.append(bench('load_data', quiet(manager.load_data)))
+    if 'clean' in stages:
+        results.append(bench('clean_data', quiet(manager.clean_data)))
+        store = manager.store
+    if 'create' in stages:
+        results.append(bench('create_apartments', quiet(manager.create_apartments)))
+
+    if 'sort' in stages:
+        results.append(bench('sort_store_state_price', SortingAlgorithms.multi_key_sort,
+                             store, ['state', ('price', 'desc')], return_permutation=True))
+        results.append(bench('top_k_price_per_state', SortingAlgorithms.top_k,
+                             store, 'price', 10, group_by='state', return_rows=True))
+        if size <= OBJECT_SORT_LIMIT:
+            apartments = store.to_apartments()
+            key = lambda apt: apt.price
+            for algorithm in ('merge', 'heap', 'numpy'):
+                results.append(bench(f"sort_{algorithm}", SortingAlgorithms.sort_by,
+                                     apartments, key, algorithm))
+
+    if 'search' in stages:
+        prices = store.valid_values('price')
+        targets = np.random.default_rng(size).choice(prices, 100)
+        results.append(bench('search_price_index_x100', lambda: [
+            SearchAlgorithms.binary_search_by_price(store, price) for price in targets]))
+        results.append(bench('search_city', SearchAlgorithms.search_by_city, store, 'Austin'))
+        results.append(bench('query_combined', manager.query_rows,
+                             bedrooms=(2, 3), price=(None, 2000), state='TX'))
+
+    if 'proximity' in stages:
+        lats, lons = store.column('latitude'), store.column('longitude')
+        results.append(bench('grid_index_build', GridIndex, lats, lons))
+        index = spatial_index(store)
+        valid = np.flatnonzero(~np.isnan(lats))
+        picks = np.random.default_rng(size).choice(valid, 100)
+        results.append(bench('proximity_10km_x100', lambda: [
+            index.query_radius(lats[i], lons[i], 10.0) for i in picks]))
+
+    if 'groupby' in stages:
+        results.append(bench('groupby_state_bedrooms', group_by, store, ['state', 'bedrooms'],
+                             count=('price', 'count'), mean=('price', 'mean'),
+                             median=('price', 'median'), cities=('cityname', 'nunique')))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--only', nargs='+', choices=STAGES, default=list(STAGES),
+                        help="Run only these stages")
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against results from an earlier run")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative slowdown of the median that counts as a regression")
+    args = parser.parse_args()
+
+    measurements = []
+    with tempfile.TemporaryDirectory(prefix='apartment_bench_') as directory:
+        for size in args.sizes:
+            measurements.extend(run_size(size, directory, set(args.only),
+                                         args.repeat, args.warmup))
+
+    comparisons = []
+    if args.baseline:
+        comparisons = compare_to_baseline(measurements, load_results(args.baseline))
+
+    print(format_results(measurements, comparisons, args.threshold))
+    if args.output:
+        write_results(measurements, args.output,
+                      meta={'sizes': args.sizes, 'repeat': args.repeat, 'warmup': args.warmup})
+        print(f"\nResults written to {args.output}")
+
+    regressions = [c for c in comparisons if c.regressed(args.threshold)]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for c in regressions:
+            print(f"  {c.name} @ {c.size:,}: {c.baseline * 1e3:.3f} -> {c.current * 1e3:.3f} ms "
+                  f"({c.ratio:.2f}x)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
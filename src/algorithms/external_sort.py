@@ -0,0 +1,222 @@
+import heapq
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import pandas as pd
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+# Memory the sorter aims to stay within: one run while sorting, or the
+# read buffers of `fan_in` runs plus an output buffer while merging
+DEFAULT_MEMORY_BUDGET = 64 << 20
+
+# Runs merged at once; more runs than this need extra merge passes
+DEFAULT_FAN_IN = 16
+
+# Smallest block read from or written to a spill file
+MIN_BLOCK_ROWS = 64
+
+# Rows of the first run measured to estimate the size of a row as Python objects
+SAMPLE_ROWS = 256
+
+
+class ExternalSorter:
+    """
+    Sorts a stream of DataFrame chunks that need not fit in memory.
+
+    Chunks are collected into runs of about half of `memory_budget` bytes
+    (concatenating a run briefly holds it twice); each run is sorted in
+    memory and spilled to a temporary binary file as a series of pickled
+    blocks, only one of which is built as Python rows at a time. The runs
+    are then k-way merged with a heap, at most `fan_in` at a time (with
+    intermediate passes if there are more), so only one block per run is
+    resident during the merge.
+
+    The sort is stable and rows whose key is missing come last in either
+    direction, like SortingAlgorithms. Spill files live in a private
+    temporary directory that is removed when the sort finishes, fails, or
+    its output iterator is closed.
+    """
+
+    def __init__(self, key: str, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 fan_in: int = DEFAULT_FAN_IN, reverse: bool = False,
+                 temp_dir: Optional[str] = None):
+        """
+        Args:
+            key: Column to sort by (e.g. 'price' or 'time')
+            memory_budget: Approximate bytes of rows held in memory at once
+            fan_in: Maximum number of runs merged in one pass (at least 2)
+            reverse: Sort in descending order
+            temp_dir: Where to create the spill directory (default: system temp)
+        """
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        if memory_budget <= 0:
+            raise ValueError("memory_budget must be positive")
+        self.key = key
+        self.memory_budget = memory_budget
+        self.fan_in = fan_in
+        self.reverse = reverse
+        self.temp_dir = temp_dir
+        self.block_rows = MIN_BLOCK_ROWS
+        self.stats = {}
+
+    def sort(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Sort the rows of all chunks by the key.
+
+        Returns:
+            Iterator of sorted DataFrame blocks; concatenated, they hold
+            every input row exactly once
+        """
+        workdir = tempfile.mkdtemp(prefix='apartment_sort_', dir=self.temp_dir)
+        self.stats = {'rows': 0, 'runs': 0, 'merge_passes': 0, 'spilled_bytes': 0}
+        try:
+            columns, runs = self._write_runs(chunks, workdir)
+            while len(runs) > self.fan_in:
+                runs = self._merge_pass(runs, workdir)
+            yield from self._emit(columns, runs)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def sort_to_csv(self, chunks: Iterable[pd.DataFrame], output_path: str,
+                    sep: str = ';') -> int:
+        """
+        Sort into a CSV file (semicolon-separated, like the source data).
+
+        The file is written under a temporary name and moved into place only
+        once complete, so a failed sort never leaves a partial output.
+
+        Returns:
+            Number of rows written
+        """
+        directory = os.path.dirname(os.path.abspath(output_path))
+        handle, partial = tempfile.mkstemp(prefix='.sorting_', suffix='.csv', dir=directory)
+        rows = 0
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8', newline='') as output:
+                for block in self.sort(chunks):
+                    block.to_csv(output, sep=sep, index=False, header=rows == 0)
+                    rows += len(block)
+            os.replace(partial, output_path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return rows
+
+    def _merge_key(self, value) -> Tuple:
+        # Missing keys sort last: below every value when merging in reverse
+        missing = value is None or value != value
+        if self.reverse:
+            return (0, 0) if missing else (1, value)
+        return (1, 0) if missing else (0, value)
+
+    def _write_runs(self, chunks: Iterable[pd.DataFrame], workdir: str
+                    ) -> Tuple[List[str], List[str]]:
+        columns, runs = None, []
+        pending, pending_bytes = [], 0
+
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+            pending.append(chunk)
+            pending_bytes += int(chunk.memory_usage(deep=True).sum())
+            # Concatenating briefly holds the run twice, so a run is half the budget
+            if 2 * pending_bytes >= self.memory_budget:
+                frame, pending = pd.concat(pending), []
+                runs.append(self._spill_run(frame, pending_bytes, workdir))
+                frame, pending_bytes = None, 0
+
+        if pending:
+            frame, pending = pd.concat(pending), []
+            runs.append(self._spill_run(frame, pending_bytes, workdir))
+        return columns or [], runs
+
+    def _spill_run(self, frame: pd.DataFrame, frame_bytes: int, workdir: str) -> str:
+        if not self.stats['runs'] and len(frame):
+            # Size merge blocks so fan_in read buffers plus one output
+            # buffer fit the budget, judging row size from the first run as
+            # the larger of its frame size and its size as Python rows
+            row_bytes = max(1, frame_bytes // len(frame), self._record_bytes(frame))
+            self.block_rows = max(MIN_BLOCK_ROWS,
+                                  self.memory_budget // (self.fan_in + 1) // row_bytes)
+
+        self.stats['rows'] += len(frame)
+        self.stats['runs'] += 1
+        return self._write_blocks(self._sorted_records(frame), workdir)
+
+    def _sorted_records(self, frame: pd.DataFrame) -> Iterator[Tuple]:
+        """(merge key, row tuple) pairs of a run in sorted order, built one block at a time."""
+        keys = frame[self.key].reset_index(drop=True)
+        order = keys.sort_values(ascending=not self.reverse, kind='stable',
+                                 na_position='last').index.to_numpy()
+        for start in range(0, len(order), self.block_rows):
+            yield from self._records(frame.take(order[start:start + self.block_rows]))
+
+    def _records(self, frame: pd.DataFrame) -> Iterator[Tuple]:
+        keys = [self._merge_key(value) for value in frame[self.key].tolist()]
+        return zip(keys, frame.itertuples(index=False, name=None))
+
+    def _record_bytes(self, frame: pd.DataFrame) -> int:
+        """Average size of a spilled record as Python objects, from a sample of rows."""
+        def size(value) -> int:
+            if isinstance(value, tuple):
+                return sys.getsizeof(value) + sum(size(item) for item in value)
+            return sys.getsizeof(value)
+
+        sample = frame.iloc[:SAMPLE_ROWS]
+        return sum(size(record) for record in self._records(sample)) // max(1, len(sample))
+
+    def _write_blocks(self, records: Iterable[Tuple], workdir: str) -> str:
+        handle, path = tempfile.mkstemp(prefix='run_', suffix='.bin', dir=workdir)
+        with os.fdopen(handle, 'wb') as spill:
+            block = []
+            for record in records:
+                block.append(record)
+                if len(block) >= self.block_rows:
+                    pickle.dump(block, spill, protocol=pickle.HIGHEST_PROTOCOL)
+                    block = []
+            if block:
+                pickle.dump(block, spill, protocol=pickle.HIGHEST_PROTOCOL)
+        self.stats['spilled_bytes'] += os.path.getsize(path)
+        return path
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Tuple]:
+        with open(path, 'rb') as spill:
+            while True:
+                try:
+                    block = pickle.load(spill)
+                except EOFError:
+                    return
+                yield from block
+
+    def _merged(self, runs: List[str]) -> Iterator[Tuple]:
+        # heapq.merge takes equal keys from earlier runs first, and runs are
+        # in input order, so the merge keeps the sort stable
+        return heapq.merge(*(self._read_run(path) for path in runs),
+                           key=itemgetter(0), reverse=self.reverse)
+
+    def _merge_pass(self, runs: List[str], workdir: str) -> List[str]:
+        merged = []
+        for start in range(0, len(runs), self.fan_in):
+            group = runs[start:start + self.fan_in]
+            merged.append(self._write_blocks(self._merged(group), workdir))
+            for path in group:
+                os.remove(path)
+        self.stats['merge_passes'] += 1
+        return merged
+
+    def _emit(self, columns: List[str], runs: List[str]) -> Iterator[pd.DataFrame]:
+        block = []
+        for _, row in self._merged(runs):
+            block.append(row)
+            if len(block) >= self.block_rows:
+                yield pd.DataFrame(block, columns=columns)
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=columns)
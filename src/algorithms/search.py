@@ -1,11 +1,17 @@
-import time
+import numpy as np
 from typing import List, Any, Optional, Callable
 
 # Handle both notebook and package imports
 try:
     from ..models.apartment import Apartment
+    from ..data.apartment_store import ApartmentStore
+    from ..data.indexes import SortedIndex, hash_index, sorted_index
+    from ..utils.benchmark import measure
 except ImportError:
     from models.apartment import Apartment
+    from data.apartment_store import ApartmentStore
+    from data.indexes import SortedIndex, hash_index, sorted_index
+    from utils.benchmark import measure
 
 
 class SearchAlgorithms:
@@ -31,6 +37,53 @@ class SearchAlgorithms:
                 matches.append(i)
         return matches
     
+    @staticmethod
+    def lower_bound(apartments: List[Apartment], 
+                    key_func: Callable[[Apartment], Any], 
+                    target_value: Any) -> int:
+        """
+        Leftmost position where target_value could be inserted into a sorted list.
+        
+        Args:
+            apartments: Sorted list of Apartment objects
+            key_func: Function to extract the search key from an apartment
+            target_value: Value to locate
+            
+        Returns:
+            Index of the first apartment whose key is >= target_value
+        """
+        left, right = 0, len(apartments)
+        
+        while left < right:
+            mid = (left + right) // 2
+            if key_func(apartments[mid]) < target_value:
+                left = mid + 1
+            else:
+                right = mid
+        
+        return left
+    
+    @staticmethod
+    def upper_bound(apartments: List[Apartment], 
+                    key_func: Callable[[Apartment], Any], 
+                    target_value: Any) -> int:
+        """
+        Rightmost position where target_value could be inserted into a sorted list.
+        
+        Returns:
+            Index just past the last apartment whose key is <= target_value
+        """
+        left, right = 0, len(apartments)
+        
+        while left < right:
+            mid = (left + right) // 2
+            if key_func(apartments[mid]) <= target_value:
+                left = mid + 1
+            else:
+                right = mid
+        
+        return left
+    
     @staticmethod
     def binary_search(apartments: List[Apartment], 
                      key_func: Callable[[Apartment], Any], 
@@ -44,26 +97,20 @@ class SearchAlgorithms:
             target_value: Value to search for
             
         Returns:
-            Index of first match found, or None if not found
+            Index of the first (leftmost) match, or None if not found
         """
-        left, right = 0, len(apartments) - 1
-        
-        while left <= right:
-            mid = (left + right) // 2
-            mid_value = key_func(apartments[mid])
-            
-            if mid_value == target_value:
-                return mid
-            elif mid_value < target_value:
-                left = mid + 1
-            else:
-                right = mid - 1
+        index = SearchAlgorithms.lower_bound(apartments, key_func, target_value)
         
+        if index < len(apartments) and key_func(apartments[index]) == target_value:
+            return index
         return None
     
     @staticmethod
     def search_by_price(apartments: List[Apartment], target_price: float) -> List[Apartment]:
         """Search for apartments with a specific price using linear search."""
+        if isinstance(apartments, ApartmentStore):
+            return apartments.take(np.flatnonzero(apartments.column('price') == target_price))
+        
         indices = SearchAlgorithms.linear_search(
             apartments, 
             lambda apt: apt.price, 
@@ -73,7 +120,17 @@ class SearchAlgorithms:
     
     @staticmethod
     def search_by_city(apartments: List[Apartment], city_name: str) -> List[Apartment]:
-        """Search for apartments in a specific city using linear search."""
+        """
+        Search for apartments in a specific city using linear search.
+        
+        An empty city name matches nothing, for a store or a list alike.
+        """
+        if not city_name:
+            return []
+        
+        if isinstance(apartments, ApartmentStore):
+            return apartments.take(hash_index(apartments, 'cityname').lookup(city_name))
+        
         indices = SearchAlgorithms.linear_search(
             apartments, 
             lambda apt: apt.cityname.lower() if apt.cityname else "", 
@@ -83,7 +140,16 @@ class SearchAlgorithms:
     
     @staticmethod
     def binary_search_by_price(sorted_apartments: List[Apartment], target_price: float) -> Optional[Apartment]:
-        """Binary search for apartment with specific price (requires sorted list)."""
+        """
+        Binary search for apartment with specific price (requires sorted list).
+        
+        An ApartmentStore may be passed instead; its persistent price index
+        is used, so no re-sorting is needed between searches.
+        """
+        if isinstance(sorted_apartments, ApartmentStore):
+            row = sorted_index(sorted_apartments, 'price').first_equal(target_price)
+            return sorted_apartments.get_apartment(row) if row is not None else None
+        
         index = SearchAlgorithms.binary_search(
             sorted_apartments,
             lambda apt: apt.price,
@@ -91,38 +157,69 @@ class SearchAlgorithms:
         )
         return sorted_apartments[index] if index is not None else None
     
+    @staticmethod
+    def range_search_by_price(sorted_apartments: List[Apartment], 
+                              min_price: float, max_price: float) -> List[Apartment]:
+        """
+        All apartments priced within [min_price, max_price].
+        
+        With a list sorted by price, the range is located with two binary
+        searches; with an ApartmentStore, its persistent price index is used.
+        Either way the cost is O(log n + k) for k matches.
+        """
+        if isinstance(sorted_apartments, ApartmentStore):
+            rows = sorted_index(sorted_apartments, 'price').range(min_price, max_price)
+            return sorted_apartments.take(rows)
+        
+        key = lambda apt: apt.price
+        start = SearchAlgorithms.lower_bound(sorted_apartments, key, min_price)
+        stop = SearchAlgorithms.upper_bound(sorted_apartments, key, max_price)
+        return sorted_apartments[start:stop]
+    
     @staticmethod
     def time_search_comparison(apartments: List[Apartment], 
-                              target_price: float) -> dict:
+                              target_price: float,
+                              repeat: int = 5) -> dict:
         """
         Compare performance of linear vs binary search for price.
-        Note: Binary search requires sorting first.
+        
+        Binary search needs the apartments sorted by price first; that cost
+        is reported separately as 'sort_time' ('search_time' covers only the
+        search, 'total_time' both). Every figure is the median of `repeat`
+        time.perf_counter runs after a warmup run, and only the number of
+        linear matches is returned, not the matches themselves.
         """
-        # Linear search timing
-        start_time = time.time()
-        linear_results = SearchAlgorithms.search_by_price(apartments, target_price)
-        linear_time = time.time() - start_time
+        linear_count = len(SearchAlgorithms.search_by_price(apartments, target_price))
+        linear = measure(SearchAlgorithms.search_by_price, apartments, target_price,
+                         repeat=repeat, warmup=0, trace_memory=False)
         
-        # Sort apartments by price for binary search
-        start_time = time.time()
-        sorted_apartments = sorted(apartments, key=lambda apt: apt.price if apt.price else 0)
-        sort_time = time.time() - start_time
+        # A store keeps a persistent price index, so its sort cost is the
+        # one-off index build; a list has to be sorted
+        if isinstance(apartments, ApartmentStore):
+            sort = measure(lambda: SortedIndex(apartments.column('price')),
+                           repeat=repeat, trace_memory=False)
+            sorted_index(apartments, 'price')
+            sorted_apartments = apartments
+        else:
+            sort_key = lambda apt: apt.price if apt.price else 0
+            sort = measure(sorted, apartments, key=sort_key, repeat=repeat, trace_memory=False)
+            sorted_apartments = sorted(apartments, key=sort_key)
         
-        # Binary search timing
-        start_time = time.time()
+        binary = measure(SearchAlgorithms.binary_search_by_price, sorted_apartments, target_price,
+                         repeat=repeat, trace_memory=False)
         binary_result = SearchAlgorithms.binary_search_by_price(sorted_apartments, target_price)
-        binary_time = time.time() - start_time
         
         return {
             'linear_search': {
-                'time': linear_time,
-                'results_count': len(linear_results),
-                'results': linear_results
+                'time': linear.median,
+                'p95': linear.p95,
+                'results_count': linear_count
             },
             'binary_search': {
-                'sort_time': sort_time,
-                'search_time': binary_time,
-                'total_time': sort_time + binary_time,
+                'sort_time': sort.median,
+                'search_time': binary.median,
+                'total_time': sort.median + binary.median,
+                'p95': binary.p95,
                 'result': binary_result
             }
-        }
\ No newline at end of file
+        }
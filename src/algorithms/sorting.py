@@ -1,14 +1,197 @@
-import time
-from typing import List, Callable, Any
+import heapq
+import numpy as np
+from operator import attrgetter
+from typing import List, Callable, Any, Dict, Optional, Sequence, Tuple, Union
 
 # Handle both notebook and package imports
 try:
     from ..models.apartment import Apartment
+    from ..data.apartment_store import ApartmentStore
+    from ..data.groupby import group_rows
+    from ..data.indexes import hash_index
+    from ..utils.benchmark import measure
 except ImportError:
     from models.apartment import Apartment
+    from data.apartment_store import ApartmentStore
+    from data.groupby import group_rows
+    from data.indexes import hash_index
+    from utils.benchmark import measure
+
+
+# Names accepted by the `algorithm=` parameter of the sort_by_* methods
+SORT_ALGORITHMS = ('bubble', 'insertion', 'merge', 'heap', 'radix', 'numpy')
+
+
+def _is_missing(value) -> bool:
+    # NaN (how the columnar store reports a missing number) counts as None
+    return value is None or (isinstance(value, float) and value != value)
+
+
+# A sort spec: 'field', (field, direction) or (field, direction, nulls),
+# with direction 'asc'/'desc' and nulls 'first'/'last' (default 'last')
+SortSpec = Union[str, Tuple[str, str], Tuple[str, str, str]]
+
+
+def _parse_spec(spec: SortSpec) -> Tuple[str, bool, bool]:
+    """(field, descending, nulls_first) for one sort spec."""
+    if isinstance(spec, str):
+        spec = (spec,)
+    field, direction, nulls = (tuple(spec) + ('asc', 'last')[len(spec) - 1:])[:3]
+    if direction not in ('asc', 'desc') or nulls not in ('first', 'last'):
+        raise ValueError(f"Bad sort spec {spec!r}: expected (field, 'asc'|'desc', 'first'|'last')")
+    return field, direction == 'desc', nulls == 'first'
+
+
+def _sort_key_columns(values: np.ndarray, missing: np.ndarray, descending: bool,
+                      nulls_first: bool) -> List[np.ndarray]:
+    """
+    Integer/float lexsort keys for one spec: the value rank, then a flag that
+    places missing values (more significant, so it comes last in the list).
+    """
+    if values.dtype.kind in 'biuf':
+        key = np.where(missing, 0, values).astype(float)
+    else:
+        # Dictionary-encode strings (or any orderable objects) to their rank
+        key = np.zeros(len(values), dtype=np.int64)
+        if (~missing).any():
+            _, key[~missing] = np.unique(values[~missing], return_inverse=True)
+    if descending:
+        key = -key
+    flag = ~missing if nulls_first else missing
+    return [key, flag]
+
+
+def _column_for(apartments, field: str) -> Tuple[np.ndarray, np.ndarray]:
+    """A field's values and missing-value mask, from a store or an Apartment list."""
+    if isinstance(apartments, ApartmentStore):
+        if field in apartments.codes:
+            # Already dictionary-encoded: rank the distinct values, not the rows
+            codes = apartments.codes[field]
+            categories = apartments.categories[field]
+            rank = np.empty(len(categories), dtype=np.int64)
+            rank[np.argsort(categories, kind='stable')] = np.arange(len(categories))
+            return np.append(rank, -1)[codes], codes < 0
+        values = apartments.column(field)
+        values = values.to_numpy() if hasattr(values, 'to_numpy') else values
+        return values, ~apartments.valid_mask(field)
+
+    raw = [getattr(apt, field) for apt in apartments]
+    missing = np.array([_is_missing(value) for value in raw], dtype=bool)
+    try:
+        values = np.array([np.nan if m else value for value, m in zip(raw, missing)], dtype=float)
+    except (TypeError, ValueError):
+        values = np.array(raw, dtype=object)
+    return values, missing
+
+
+def _smallest_rows(values: np.ndarray, rows: np.ndarray, k: int) -> np.ndarray:
+    """
+    Rows holding the k smallest values, smallest first and ties by position.
+
+    np.partition finds the k-th value in O(n); only the k survivors are
+    sorted, so the cost is O(n + k log k) rather than a full sort.
+    """
+    if k <= 0 or not len(values):
+        return rows[:0]
+    if k < len(values):
+        kth = np.partition(values, k - 1)[k - 1]
+        below = np.flatnonzero(values < kth)
+        # Fill up with the earliest rows equal to the k-th value
+        tied = np.flatnonzero(values == kth)[:k - len(below)]
+        keep = np.concatenate([below, tied])
+        values, rows = values[keep], rows[keep]
+    return rows[np.lexsort((rows, values))]
+
+
+def _store_top_k(store: ApartmentStore, field: str, k: int, largest: bool,
+                 group_by: Optional[Sequence[str]], rows: Optional[np.ndarray]):
+    if field not in store.numeric:
+        raise ValueError(f"Top-k over a store needs a numeric field, got {field!r}")
+    values = store.numeric[field]
+    if largest:
+        values = -values.astype(float)
+
+    def select(group: np.ndarray) -> np.ndarray:
+        group_values = values[group]
+        if group_values.dtype.kind == 'f':
+            present = ~np.isnan(group_values)
+            group, group_values = group[present], group_values[present]
+        return _smallest_rows(group_values, group, k)
+
+    if group_by is None:
+        if rows is None:
+            rows = np.arange(len(store))
+        rows = np.asarray(rows)
+        return select(np.flatnonzero(rows) if rows.dtype == bool else rows)
+
+    if not all(field in store.codes for field in group_by):
+        keys, members = group_rows(store, group_by, rows)
+        return {key: select(group) for key, group in zip(keys, members)}
+
+    # Categorical groups are already laid out by the store's hash index
+    keys, members = hash_index(store, *group_by).partitions()
+    if rows is not None:
+        rows = np.asarray(rows)
+        allowed = rows if rows.dtype == bool else np.isin(np.arange(len(store)), rows)
+        members = [group[allowed[group]] for group in members]
+        kept = sorted((group[0], i) for i, group in enumerate(members) if len(group))
+        keys, members = [keys[i] for _, i in kept], [members[i] for _, i in kept]
+    return {key: select(group) for key, group in zip(keys, members)}
+
+
+def _missing_group(group) -> bool:
+    # Same rule as the group-by engine: missing or empty key parts drop the row
+    parts = group if isinstance(group, tuple) else (group,)
+    return any(_is_missing(part) or part == '' for part in parts)
+
+
+def _list_top_k(apartments: List[Apartment], key_func: Callable[[Apartment], Any], k: int,
+                largest: bool, group_func: Optional[Callable[[Apartment], Any]]):
+    # Decorate once; (key, position) pairs break ties by original position
+    decorated: Dict[Any, list] = {}
+    for i, apt in enumerate(apartments):
+        value = key_func(apt)
+        if _is_missing(value):
+            continue
+        group = group_func(apt) if group_func is not None else None
+        if group_func is not None and _missing_group(group):
+            continue
+        decorated.setdefault(group, []).append((value, -i) if largest else (value, i))
+
+    # Heap selection: O(n log k) per group
+    select = heapq.nlargest if largest else heapq.nsmallest
+    chosen = {group: [abs(i) for _, i in select(k, pairs)] for group, pairs in decorated.items()}
+    return chosen if group_func is not None else chosen.get(None, [])
 
 
 class SortingAlgorithms:
+    """
+    Sorting algorithms for apartment lists.
+    
+    Every algorithm evaluates `key_func` once per apartment (decorate-sort-
+    undecorate), sorts stably, and places apartments whose key is None (or
+    NaN) after all others in their original order, in either direction.
+    """
+    
+    @staticmethod
+    def _decorate(apartments: List[Apartment], 
+                  key_func: Callable[[Apartment], Any]) -> Tuple[List[Any], List[int], List[int]]:
+        """
+        Evaluate every key once.
+        
+        Returns:
+            (keys, positions with a key, positions without one)
+        """
+        keys = [key_func(apt) for apt in apartments]
+        present, missing = [], []
+        for i, key in enumerate(keys):
+            (missing if _is_missing(key) else present).append(i)
+        return keys, present, missing
+    
+    @staticmethod
+    def _undecorate(apartments: List[Apartment], order: List[int], 
+                    missing: List[int]) -> List[Apartment]:
+        return [apartments[i] for i in order] + [apartments[i] for i in missing]
     
     @staticmethod
     def bubble_sort(apartments: List[Apartment], 
@@ -25,31 +208,25 @@ class SortingAlgorithms:
         Returns:
             Sorted list of apartments
         """
-        sorted_apartments = apartments.copy()
-        n = len(sorted_apartments)
+        keys, order, missing = SortingAlgorithms._decorate(apartments, key_func)
+        n = len(order)
         
         for i in range(n):
             swapped = False
             for j in range(0, n - i - 1):
-                value1 = key_func(sorted_apartments[j])
-                value2 = key_func(sorted_apartments[j + 1])
-                
-                # Handle None values by treating them as very large or very small
-                if value1 is None:
-                    value1 = float('inf') if not reverse else float('-inf')
-                if value2 is None:
-                    value2 = float('inf') if not reverse else float('-inf')
+                value1 = keys[order[j]]
+                value2 = keys[order[j + 1]]
                 
                 should_swap = value1 > value2 if not reverse else value1 < value2
                 
                 if should_swap:
-                    sorted_apartments[j], sorted_apartments[j + 1] = sorted_apartments[j + 1], sorted_apartments[j]
+                    order[j], order[j + 1] = order[j + 1], order[j]
                     swapped = True
             
             if not swapped:
                 break
         
-        return sorted_apartments
+        return SortingAlgorithms._undecorate(apartments, order, missing)
     
     @staticmethod
     def insertion_sort(apartments: List[Apartment], 
@@ -66,128 +243,378 @@ class SortingAlgorithms:
         Returns:
             Sorted list of apartments
         """
-        sorted_apartments = apartments.copy()
+        keys, order, missing = SortingAlgorithms._decorate(apartments, key_func)
         
-        for i in range(1, len(sorted_apartments)):
-            current_apartment = sorted_apartments[i]
-            current_value = key_func(current_apartment)
-            
-            # Handle None values
-            if current_value is None:
-                current_value = float('inf') if not reverse else float('-inf')
-            
+        for i in range(1, len(order)):
+            current = order[i]
+            current_value = keys[current]
             j = i - 1
             
             while j >= 0:
-                compare_value = key_func(sorted_apartments[j])
-                if compare_value is None:
-                    compare_value = float('inf') if not reverse else float('-inf')
-                
+                compare_value = keys[order[j]]
                 should_move = compare_value > current_value if not reverse else compare_value < current_value
                 
                 if should_move:
-                    sorted_apartments[j + 1] = sorted_apartments[j]
+                    order[j + 1] = order[j]
                     j -= 1
                 else:
                     break
             
-            sorted_apartments[j + 1] = current_apartment
+            order[j + 1] = current
+        
+        return SortingAlgorithms._undecorate(apartments, order, missing)
+    
+    @staticmethod
+    def merge_sort(apartments: List[Apartment], 
+                   key_func: Callable[[Apartment], Any], 
+                   reverse: bool = False) -> List[Apartment]:
+        """
+        Bottom-up merge sort: O(n log n) comparisons, stable.
+        
+        Args:
+            apartments: List of Apartment objects to sort
+            key_func: Function to extract sort key from apartment
+            reverse: If True, sort in descending order
+            
+        Returns:
+            Sorted list of apartments
+        """
+        keys, order, missing = SortingAlgorithms._decorate(apartments, key_func)
+        n = len(order)
+        buffer = order[:]
+        width = 1
+        
+        while width < n:
+            for low in range(0, n, 2 * width):
+                mid = min(low + width, n)
+                high = min(low + 2 * width, n)
+                i, j, k = low, mid, low
+                while i < mid and j < high:
+                    left, right = keys[order[i]], keys[order[j]]
+                    # Taking from the left run on ties keeps the sort stable
+                    take_right = right < left if not reverse else right > left
+                    if take_right:
+                        buffer[k] = order[j]
+                        j += 1
+                    else:
+                        buffer[k] = order[i]
+                        i += 1
+                    k += 1
+                buffer[k:high] = order[i:mid] if i < mid else order[j:high]
+            order, buffer = buffer, order
+            width *= 2
         
-        return sorted_apartments
+        return SortingAlgorithms._undecorate(apartments, order, missing)
+    
+    @staticmethod
+    def heap_sort(apartments: List[Apartment], 
+                  key_func: Callable[[Apartment], Any], 
+                  reverse: bool = False) -> List[Apartment]:
+        """
+        In-place heap sort: O(n log n) worst case, O(1) extra space.
+        
+        Heap sort is not naturally stable, so equal keys are ordered by
+        original position to give the same result as the stable sorts.
+        
+        Args:
+            apartments: List of Apartment objects to sort
+            key_func: Function to extract sort key from apartment
+            reverse: If True, sort in descending order
+            
+        Returns:
+            Sorted list of apartments
+        """
+        keys, order, missing = SortingAlgorithms._decorate(apartments, key_func)
+        
+        def after(a: int, b: int) -> bool:
+            # True if position a belongs after position b in the output
+            ka, kb = keys[a], keys[b]
+            if ka == kb:
+                return a > b
+            return ka > kb if not reverse else ka < kb
+        
+        def sift_down(start: int, end: int) -> None:
+            root = start
+            while True:
+                child = 2 * root + 1
+                if child >= end:
+                    return
+                if child + 1 < end and after(order[child + 1], order[child]):
+                    child += 1
+                if not after(order[child], order[root]):
+                    return
+                order[root], order[child] = order[child], order[root]
+                root = child
+        
+        n = len(order)
+        # Max-heap on "belongs later", then move the latest to the end repeatedly
+        for start in range(n // 2 - 1, -1, -1):
+            sift_down(start, n)
+        for end in range(n - 1, 0, -1):
+            order[0], order[end] = order[end], order[0]
+            sift_down(0, end)
+        
+        return SortingAlgorithms._undecorate(apartments, order, missing)
+    
+    @staticmethod
+    def radix_sort(apartments: List[Apartment], 
+                   key_func: Callable[[Apartment], Any], 
+                   reverse: bool = False) -> List[Apartment]:
+        """
+        LSD radix sort for integer-valued keys (e.g. price, bedrooms).
+        
+        Keys are offset to be non-negative and sorted one byte at a time,
+        least significant first, with a stable counting pass per byte:
+        O(n * bytes) with no comparisons.
+        
+        Raises:
+            ValueError: if a key is not an integer value
+        """
+        keys, present, missing = SortingAlgorithms._decorate(apartments, key_func)
+        if not all(isinstance(keys[i], (int, np.integer)) or float(keys[i]).is_integer()
+                   for i in present):
+            raise ValueError("Radix sort needs integer-valued keys")
+        
+        order = np.asarray(present, dtype=np.int64)
+        if len(order):
+            values = [int(keys[i]) for i in present]
+            low, high = min(values), max(values)
+            if high - low >= 2**64:
+                raise ValueError("Radix sort keys span more than 64 bits")
+            # Descending is an ascending sort on (high - key); ties keep their order
+            digits = np.array([high - v for v in values] if reverse else
+                              [v - low for v in values], dtype=np.uint64)
+            
+            shift = np.uint64(0)
+            while shift == 0 or (shift < 64 and (digits >> shift).any()):
+                byte = ((digits >> shift) & np.uint64(0xFF)).astype(np.uint8)
+                # One stable counting pass per byte (NumPy's stable sort of
+                # 8-bit values is a counting sort)
+                permutation = np.argsort(byte, kind='stable')
+                order, digits = order[permutation], digits[permutation]
+                shift += np.uint64(8)
+        
+        return SortingAlgorithms._undecorate(apartments, order.tolist(), missing)
+    
+    @staticmethod
+    def numpy_sort(apartments: List[Apartment], 
+                   key_func: Callable[[Apartment], Any], 
+                   reverse: bool = False) -> List[Apartment]:
+        """
+        Stable argsort of the decorated keys in NumPy.
+        
+        Non-numeric keys (e.g. strings) are dictionary-encoded to their rank
+        among the distinct keys first, so descending order stays stable too.
+        """
+        keys, present, missing = SortingAlgorithms._decorate(apartments, key_func)
+        values = [keys[i] for i in present]
+        
+        try:
+            array = np.asarray(values, dtype=float)
+        except (TypeError, ValueError):
+            _, array = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+        if reverse:
+            array = -array.astype(float)
+        
+        order = np.asarray(present, dtype=np.int64)[np.argsort(array, kind='stable')]
+        return SortingAlgorithms._undecorate(apartments, order.tolist(), missing)
+    
+    @staticmethod
+    def sort_by(apartments: List[Apartment], 
+                key_func: Callable[[Apartment], Any], 
+                algorithm: str = "bubble", 
+                reverse: bool = False) -> List[Apartment]:
+        """Sort apartments by any key using one of SORT_ALGORITHMS."""
+        algorithms = {
+            'bubble': SortingAlgorithms.bubble_sort,
+            'insertion': SortingAlgorithms.insertion_sort,
+            'merge': SortingAlgorithms.merge_sort,
+            'heap': SortingAlgorithms.heap_sort,
+            'radix': SortingAlgorithms.radix_sort,
+            'numpy': SortingAlgorithms.numpy_sort
+        }
+        sort = algorithms.get(algorithm.lower())
+        if sort is None:
+            raise ValueError(f"Algorithm must be one of: {', '.join(SORT_ALGORITHMS)}")
+        return sort(apartments, key_func, reverse)
+    
+    @staticmethod
+    def multi_key_order(apartments: Union[List[Apartment], ApartmentStore], 
+                        specs: Sequence[SortSpec]) -> np.ndarray:
+        """
+        Permutation that sorts apartments by several keys at once.
+        
+        Each field becomes a column of numeric sort keys (strings are
+        dictionary-encoded to their rank), and a single stable np.lexsort
+        orders all of them; ties on every key keep the original order.
+        
+        Args:
+            apartments: List of Apartment objects, or an ApartmentStore
+            specs: Sort specs, most significant first, e.g.
+                [('state', 'asc'), 'price', ('square_feet', 'desc', 'first')]
+            
+        Returns:
+            Array of positions (list indices or store rows) in sorted order
+        """
+        n = len(apartments)
+        # np.lexsort treats its last key as most significant
+        keys = [np.arange(n)]
+        for spec in reversed([_parse_spec(spec) for spec in specs]):
+            field, descending, nulls_first = spec
+            values, missing = _column_for(apartments, field)
+            keys.extend(_sort_key_columns(values, missing, descending, nulls_first))
+        return np.lexsort(keys)
+    
+    @staticmethod
+    def multi_key_sort(apartments: Union[List[Apartment], ApartmentStore], 
+                       specs: Sequence[SortSpec], 
+                       return_permutation: bool = False):
+        """
+        Sort apartments by several keys, e.g. state asc, price asc,
+        square_feet desc. See multi_key_order for the spec format.
+        
+        Returns:
+            The reordered apartments (materialized from the store if one was
+            given), or the permutation itself if return_permutation is set
+        """
+        order = SortingAlgorithms.multi_key_order(apartments, specs)
+        if return_permutation:
+            return order
+        if isinstance(apartments, ApartmentStore):
+            return apartments.take(order)
+        return [apartments[i] for i in order.tolist()]
+    
+    @staticmethod
+    def top_k(apartments: Union[List[Apartment], ApartmentStore], 
+              key: Union[str, Callable[[Apartment], Any]], 
+              k: int, 
+              largest: bool = False, 
+              group_by: Union[None, str, Sequence[str], Callable[[Apartment], Any]] = None, 
+              rows: Optional[np.ndarray] = None, 
+              return_rows: bool = False):
+        """
+        The k apartments with the smallest (or largest) key, best first,
+        without sorting everything.
+        
+        Lists use heap selection (O(n log k)); stores use np.partition on the
+        column (O(n + k log k)). Apartments without a key value are skipped
+        and ties go to the apartment that comes first.
+        
+        Args:
+            apartments: List of Apartment objects, or an ApartmentStore
+            key: Field name, or for lists a key function like those the sort
+                methods take (e.g. lambda apt: apt.price)
+            k: Number of apartments to return (per group)
+            largest: Rank by largest key instead of smallest
+            group_by: Field name(s) to rank within, like the group_by keys
+                (e.g. 'cityname' or ['state', 'bedrooms']); for lists also
+                a function of the apartment
+            rows: Store only: restrict to these rows (positions or a mask),
+                e.g. from DatasetManager.query_rows(bedrooms=2)
+            return_rows: Return positions instead of Apartment objects
+            
+        Returns:
+            List of apartments, or {group: list} when grouping, with groups
+            in order of first appearance
+        
+        Example:
+            # Cheapest 50 two-bedroom listings in each city
+            SortingAlgorithms.top_k(store, 'price', 50, group_by='cityname',
+                                    rows=manager.query_rows(bedrooms=2))
+        """
+        if isinstance(group_by, str):
+            group_by = [group_by]
+        
+        if isinstance(apartments, ApartmentStore):
+            if not isinstance(key, str) or callable(group_by):
+                raise ValueError("Top-k over a store takes field names for key and group_by")
+            result = _store_top_k(apartments, key, k, largest, group_by, rows)
+            if return_rows:
+                return result
+            if isinstance(result, dict):
+                return {group: apartments.take(found) for group, found in result.items()}
+            return apartments.take(result)
+        
+        key_func = attrgetter(key) if isinstance(key, str) else key
+        group_func = group_by
+        if group_by is not None and not callable(group_by):
+            group_func = attrgetter(*group_by)
+        result = _list_top_k(apartments, key_func, k, largest, group_func)
+        if return_rows:
+            return result
+        if isinstance(result, dict):
+            return {group: [apartments[i] for i in found] for group, found in result.items()}
+        return [apartments[i] for i in result]
     
     @staticmethod
     def sort_by_price(apartments: List[Apartment], 
                      algorithm: str = "bubble", 
                      reverse: bool = False) -> List[Apartment]:
         """Sort apartments by price using specified algorithm."""
-        if algorithm.lower() == "bubble":
-            return SortingAlgorithms.bubble_sort(apartments, lambda apt: apt.price, reverse)
-        elif algorithm.lower() == "insertion":
-            return SortingAlgorithms.insertion_sort(apartments, lambda apt: apt.price, reverse)
-        else:
-            raise ValueError("Algorithm must be 'bubble' or 'insertion'")
+        return SortingAlgorithms.sort_by(apartments, lambda apt: apt.price, algorithm, reverse)
     
     @staticmethod
     def sort_by_square_feet(apartments: List[Apartment], 
                            algorithm: str = "bubble", 
                            reverse: bool = False) -> List[Apartment]:
         """Sort apartments by square feet using specified algorithm."""
-        if algorithm.lower() == "bubble":
-            return SortingAlgorithms.bubble_sort(apartments, lambda apt: apt.square_feet, reverse)
-        elif algorithm.lower() == "insertion":
-            return SortingAlgorithms.insertion_sort(apartments, lambda apt: apt.square_feet, reverse)
-        else:
-            raise ValueError("Algorithm must be 'bubble' or 'insertion'")
+        return SortingAlgorithms.sort_by(apartments, lambda apt: apt.square_feet, algorithm, reverse)
     
     @staticmethod
     def sort_by_bathrooms(apartments: List[Apartment], 
                          algorithm: str = "bubble", 
                          reverse: bool = False) -> List[Apartment]:
         """Sort apartments by number of bathrooms using specified algorithm."""
-        if algorithm.lower() == "bubble":
-            return SortingAlgorithms.bubble_sort(apartments, lambda apt: apt.bathrooms, reverse)
-        elif algorithm.lower() == "insertion":
-            return SortingAlgorithms.insertion_sort(apartments, lambda apt: apt.bathrooms, reverse)
-        else:
-            raise ValueError("Algorithm must be 'bubble' or 'insertion'")
+        return SortingAlgorithms.sort_by(apartments, lambda apt: apt.bathrooms, algorithm, reverse)
     
     @staticmethod
     def compare_sorting_performance(apartments: List[Apartment], 
                                   key_func: Callable[[Apartment], Any],
-                                  sample_size: int = 1000) -> dict:
+                                  sample_size: int = 1000,
+                                  repeat: int = 3) -> dict:
         """
         Compare performance of different sorting algorithms.
         
+        Each algorithm is timed with time.perf_counter after one warmup
+        run; 'time' is the median of `repeat` runs and 'p95' their
+        95th-percentile run time (np.percentile, as utils.benchmark reports
+        it). The sorted lists themselves are not kept.
+        
         Args:
             apartments: List of apartments to sort
             key_func: Function to extract sort key
             sample_size: Number of apartments to use for comparison
+            repeat: Timed runs per algorithm
             
         Returns:
             Dictionary with timing results
         """
         # Use a sample for performance comparison to avoid long wait times
         sample_apartments = apartments[:sample_size]
+        builtin_key = lambda apt: key_func(apt) if key_func(apt) is not None else float('inf')
         
-        results = {}
-        
-        # Bubble sort timing
-        start_time = time.time()
-        bubble_sorted = SortingAlgorithms.bubble_sort(sample_apartments, key_func)
-        bubble_time = time.time() - start_time
-        
-        # Insertion sort timing
-        start_time = time.time()
-        insertion_sorted = SortingAlgorithms.insertion_sort(sample_apartments, key_func)
-        insertion_time = time.time() - start_time
-        
-        # Built-in sort timing
-        start_time = time.time()
-        builtin_sorted = sorted(sample_apartments, key=lambda apt: key_func(apt) if key_func(apt) is not None else float('inf'))
-        builtin_time = time.time() - start_time
-        
-        results = {
-            'sample_size': len(sample_apartments),
-            'bubble_sort': {
-                'time': bubble_time,
-                'time_per_item': bubble_time / len(sample_apartments) if sample_apartments else 0
-            },
-            'insertion_sort': {
-                'time': insertion_time,
-                'time_per_item': insertion_time / len(sample_apartments) if sample_apartments else 0
-            },
-            'builtin_sort': {
-                'time': builtin_time,
-                'time_per_item': builtin_time / len(sample_apartments) if sample_apartments else 0
-            }
+        timings = {
+            'bubble_sort': measure(SortingAlgorithms.bubble_sort, sample_apartments, key_func,
+                                   repeat=repeat, trace_memory=False),
+            'insertion_sort': measure(SortingAlgorithms.insertion_sort, sample_apartments, key_func,
+                                      repeat=repeat, trace_memory=False),
+            'builtin_sort': measure(sorted, sample_apartments, key=builtin_key,
+                                    repeat=repeat, trace_memory=False)
         }
         
+        results = {'sample_size': len(sample_apartments)}
+        for name, timing in timings.items():
+            results[name] = {
+                'time': timing.median,
+                'p95': timing.p95,
+                'time_per_item': timing.median / len(sample_apartments) if sample_apartments else 0
+            }
+        
         # Calculate relative performance
-        fastest_time = min(bubble_time, insertion_time, builtin_time)
+        fastest_time = min(timing.median for timing in timings.values())
         results['relative_performance'] = {
-            'bubble_sort': bubble_time / fastest_time,
-            'insertion_sort': insertion_time / fastest_time,
-            'builtin_sort': builtin_time / fastest_time
+            name: timing.median / fastest_time if fastest_time else 1.0
+            for name, timing in timings.items()
         }
         
         return results
\ No newline at end of file
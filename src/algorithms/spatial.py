@@ -0,0 +1,416 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple, Union
+
+
+EARTH_RADIUS_KM = 6371.0
+
+# Default grid cell edge in degrees (~28 km of latitude)
+DEFAULT_CELL_DEGREES = 0.25
+
+# Batches with at least this many targets use a process pool by default
+PARALLEL_MIN_TARGETS = 20_000
+
+# (target, cell) or (target, point) pairs handled per vectorized step of a
+# batch query; bounds its temporary memory for large radii
+BATCH_PAIR_BUDGET = 1 << 20
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Vectorized great-circle distance in kilometres.
+
+    Uses the same formulation as LocationAnalysis.calculate_distance so that
+    results agree with the scalar version; any argument may be an array.
+    """
+    lat1_rad = np.radians(lat1)
+    lon1_rad = np.radians(lon1)
+    lat2_rad = np.radians(lat2)
+    lon2_rad = np.radians(lon2)
+
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+
+    a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def _expand_ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, start + length) for each range, without a Python loop."""
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def _budget_blocks(costs: np.ndarray, budget: int) -> List[Tuple[int, int]]:
+    """
+    Split positions 0..len(costs) into consecutive [start, end) blocks whose
+    summed cost stays within `budget` (a single costlier item gets its own block).
+    """
+    bounds = []
+    cumulative = np.cumsum(costs)
+    start, done = 0, 0
+    while start < len(costs):
+        end = max(int(np.searchsorted(cumulative, done + budget, side='right')), start + 1)
+        bounds.append((start, end))
+        done = cumulative[end - 1]
+        start = end
+    return bounds
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Latitude/longitude box that fully contains a circle of `radius_km`.
+
+    Returns:
+        (min_lat, max_lat, min_lon, max_lon); longitudes may extend past
+        +/-180 when the circle crosses the antimeridian, and span the full
+        range when it covers a pole.
+    """
+    # Slightly inflate the angle so rounding never trims a point on the edge
+    angle = radius_km / EARTH_RADIUS_KM * (1 + 1e-9) + 1e-12
+    dlat = np.degrees(angle)
+    min_lat, max_lat = lat - dlat, lat + dlat
+
+    if min_lat <= -90 or max_lat >= 90 or angle >= np.pi / 2:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    # Widest longitude offset reached by the circle (at its tangent points)
+    dlon = np.degrees(np.arcsin(min(1.0, np.sin(angle) / np.cos(np.radians(lat)))))
+    return min_lat, max_lat, lon - dlon, lon + dlon
+
+
+class GridIndex:
+    """
+    Uniform latitude/longitude grid over point coordinates.
+
+    Points are sorted by grid cell and each occupied cell records the range
+    of positions it owns, so a radius query only computes exact distances
+    for points in cells that overlap the query's bounding box.
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray,
+                 cell_degrees: float = DEFAULT_CELL_DEGREES):
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        valid = ~(np.isnan(latitudes) | np.isnan(longitudes))
+
+        self.cell_degrees = cell_degrees
+        self.n_cols = int(np.ceil(360.0 / cell_degrees))
+        self.size = len(latitudes)
+
+        rows = np.flatnonzero(valid)
+        cells = self._cell_ids(latitudes[rows], longitudes[rows])
+        order = np.argsort(cells, kind='stable')
+
+        # Point data laid out cell by cell
+        self.rows = rows[order]
+        self.lats = latitudes[self.rows]
+        self.lons = longitudes[self.rows]
+
+        sorted_cells = cells[order]
+        self.cell_ids, self.cell_starts = np.unique(sorted_cells, return_index=True)
+        self.cell_ends = np.append(self.cell_starts[1:], len(sorted_cells))
+
+    def _cell_row(self, lat):
+        return np.floor((np.asarray(lat) + 90.0) / self.cell_degrees).astype(np.int64)
+
+    def _cell_col(self, lon):
+        return np.floor((np.asarray(lon) + 180.0) / self.cell_degrees).astype(np.int64) % self.n_cols
+
+    def _cell_ids(self, lats, lons) -> np.ndarray:
+        return self._cell_row(lats) * self.n_cols + self._cell_col(lons)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _hit_cells(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Indexes into cell_ids of occupied cells overlapping the query's bounding box."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        cell_rows = np.arange(self._cell_row(min_lat), self._cell_row(max_lat) + 1)
+
+        if max_lon - min_lon >= 360.0:
+            cell_cols = np.arange(self.n_cols)
+        else:
+            first = int(np.floor((min_lon + 180.0) / self.cell_degrees))
+            last = int(np.floor((max_lon + 180.0) / self.cell_degrees))
+            cell_cols = np.unique(np.arange(first, last + 1) % self.n_cols)
+
+        if len(cell_rows) * len(cell_cols) > len(self.cell_ids):
+            # Large radius: cheaper to test every occupied cell
+            occupied = self.cell_ids
+            row_of = occupied // self.n_cols
+            col_of = occupied % self.n_cols
+            hit = np.flatnonzero(np.isin(row_of, cell_rows) & np.isin(col_of, cell_cols))
+        else:
+            wanted = (cell_rows[:, None] * self.n_cols + cell_cols[None, :]).ravel()
+            pos = np.searchsorted(self.cell_ids, wanted)
+            found = pos < len(self.cell_ids)
+            found[found] = self.cell_ids[pos[found]] == wanted[found]
+            hit = pos[found]
+        return hit
+
+    def candidate_slices(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """
+        Positions (into the cell-ordered arrays) of points whose cells overlap
+        the query's bounding box.
+        """
+        hit = self._hit_cells(lat, lon, radius_km)
+        if not len(hit):
+            return np.empty(0, dtype=np.int64)
+        starts = self.cell_starts[hit]
+        return _expand_ranges(starts, self.cell_ends[hit] - starts)
+
+    def estimate_radius(self, lat: float, lon: float, radius_km: float) -> int:
+        """
+        Upper bound on the matches of a radius query: the number of points in
+        the overlapping cells. No positions or distances are computed.
+        """
+        hit = self._hit_cells(lat, lon, radius_km)
+        return int((self.cell_ends[hit] - self.cell_starts[hit]).sum())
+
+    def query_radius(self, lat: float, lon: float, radius_km: float,
+                     return_distances: bool = False):
+        """
+        Rows within `radius_km` of (lat, lon), in ascending row order.
+
+        Args:
+            lat, lon: Query point in degrees
+            radius_km: Inclusive search radius
+            return_distances: Also return the distance of each match
+
+        Returns:
+            Array of row positions, or (rows, distances) when requested
+        """
+        positions = self.candidate_slices(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self.lats[positions], self.lons[positions])
+        keep = distances <= radius_km
+
+        rows = self.rows[positions[keep]]
+        order = np.argsort(rows)
+        if return_distances:
+            return rows[order], distances[keep][order]
+        return rows[order]
+
+    def count_radius(self, lat: float, lon: float, radius_km: float) -> int:
+        """Number of points within `radius_km` of (lat, lon)."""
+        positions = self.candidate_slices(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self.lats[positions], self.lons[positions])
+        return int(np.count_nonzero(distances <= radius_km))
+
+    def nearest(self, lat: float, lon: float, k: int,
+                row_filter: Optional[Callable[[np.ndarray], np.ndarray]] = None
+                ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The `k` rows closest to (lat, lon) by great-circle distance.
+
+        Searches a growing radius, starting at one grid cell and doubling,
+        until at least `k` accepted points lie inside it; every point within
+        that radius is a candidate, so the k closest among them are exact.
+
+        Args:
+            lat, lon: Query point in degrees
+            k: Number of neighbours to return
+            row_filter: Optional function mapping row positions to a boolean
+                mask; only accepted rows are returned. It is only evaluated
+                on rows near the query point.
+
+        Returns:
+            (rows, distances) sorted by distance, ties broken by row
+        """
+        if k <= 0 or not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        max_radius = np.pi * EARTH_RADIUS_KM
+        radius = np.radians(self.cell_degrees) * EARTH_RADIUS_KM
+        while True:
+            positions = self.candidate_slices(lat, lon, radius)
+            rows = self.rows[positions]
+            if row_filter is not None and len(rows):
+                keep = row_filter(rows)
+                positions, rows = positions[keep], rows[keep]
+
+            distances = haversine_km(lat, lon, self.lats[positions], self.lons[positions])
+            inside = distances <= radius
+            if np.count_nonzero(inside) >= k or radius >= max_radius:
+                rows, distances = rows[inside], distances[inside]
+                order = np.lexsort((rows, distances))[:k]
+                return rows[order], distances[order]
+            radius *= 2
+
+    def _cell_spans(self, lats: np.ndarray, lons: np.ndarray, radii: np.ndarray
+                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Grid rows and columns covered by each target's bounding box, as
+        (first row, row count, first column, column count); the columns wrap
+        around the antimeridian. Matches bounding_box and _hit_cells.
+        """
+        angle = radii / EARTH_RADIUS_KM * (1 + 1e-9) + 1e-12
+        dlat = np.degrees(angle)
+        min_lat, max_lat = lats - dlat, lats + dlat
+        full = (min_lat <= -90) | (max_lat >= 90) | (angle >= np.pi / 2)
+        min_lat = np.where(full, np.maximum(min_lat, -90.0), min_lat)
+        max_lat = np.where(full, np.minimum(max_lat, 90.0), max_lat)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dlon = np.degrees(np.arcsin(np.minimum(1.0, np.sin(angle) / np.cos(np.radians(lats)))))
+        bad = ~(np.isfinite(lats) & np.isfinite(lons) & np.isfinite(radii) & np.isfinite(dlon))
+        safe = lambda values: np.where(bad, 0.0, values)
+
+        first_row = self._cell_row(safe(min_lat))
+        row_count = self._cell_row(safe(max_lat)) - first_row + 1
+        first_col = np.floor((safe(lons - dlon) + 180.0) / self.cell_degrees).astype(np.int64)
+        col_count = np.floor((safe(lons + dlon) + 180.0) / self.cell_degrees).astype(np.int64) - first_col + 1
+
+        wide = full | (col_count >= self.n_cols)
+        first_col = np.where(wide, 0, first_col % self.n_cols)
+        col_count = np.where(wide, self.n_cols, col_count)
+        row_count = np.where(bad, 0, np.maximum(row_count, 0))
+        col_count = np.where(bad, 0, np.maximum(col_count, 0))
+        return first_row, row_count, first_col, col_count
+
+    def _batch_hit_cells(self, targets: np.ndarray, first_row: np.ndarray, row_count: np.ndarray,
+                         first_col: np.ndarray, col_count: np.ndarray
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (target, index into cell_ids) pairs of occupied cells inside each
+        target's cell span, grouped by target.
+
+        Small spans list their cells and look them up; spans larger than the
+        number of occupied cells test every occupied cell instead, as
+        _hit_cells does for a single query.
+        """
+        n_occupied = len(self.cell_ids)
+        spans = row_count * col_count
+        listed = (spans > 0) & (spans <= n_occupied)
+        scanned = spans > n_occupied
+
+        # Listed spans: enumerate every cell of the span and binary search it
+        owner = np.repeat(np.flatnonzero(listed), spans[listed])
+        k = np.arange(len(owner)) - np.repeat(np.cumsum(spans[listed]) - spans[listed], spans[listed])
+        wanted = ((first_row[owner] + k // col_count[owner]) * self.n_cols
+                  + (first_col[owner] + k % col_count[owner]) % self.n_cols)
+        pos = np.minimum(np.searchsorted(self.cell_ids, wanted), max(n_occupied - 1, 0))
+        found = self.cell_ids[pos] == wanted if n_occupied else np.zeros(len(wanted), dtype=bool)
+        listed_owner, listed_cells = owner[found], pos[found]
+
+        # Scanned spans: test each occupied cell's row and column against the span
+        owner = np.repeat(np.flatnonzero(scanned), n_occupied)
+        cells = np.tile(np.arange(n_occupied), np.count_nonzero(scanned))
+        cell_rows = self.cell_ids[cells] // self.n_cols - first_row[owner]
+        cell_cols = (self.cell_ids[cells] % self.n_cols - first_col[owner]) % self.n_cols
+        inside = (cell_rows >= 0) & (cell_rows < row_count[owner]) & (cell_cols < col_count[owner])
+
+        owner = np.concatenate([listed_owner, owner[inside]])
+        cells = np.concatenate([listed_cells, cells[inside]])
+        order = np.argsort(owner, kind='stable')
+        return targets[owner[order]], cells[order]
+
+    def query_radius_batch(self, lats, lons, radii, counts_only: bool = False
+                           ) -> Union[List[np.ndarray], np.ndarray]:
+        """
+        Radius queries for many target points against the same index.
+
+        Every target's candidate cells are found together, the candidate
+        points of all targets are concatenated with their target ids, and
+        one vectorized haversine pass decides every (target, point) pair.
+        Work is split into blocks of at most BATCH_PAIR_BUDGET pairs.
+
+        Args:
+            lats, lons: Target coordinates (arrays of equal length)
+            radii: One radius for all targets, or one per target
+            counts_only: Return match counts instead of row arrays
+
+        Returns:
+            List of row arrays (ascending) per target, or an array of counts
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), lats.shape)
+        n = len(lats)
+
+        first_row, row_count, first_col, col_count = self._cell_spans(lats, lons, radii)
+        cell_costs = np.minimum(row_count * col_count, len(self.cell_ids))
+        owners, rows = [], []
+        for start, end in _budget_blocks(cell_costs, BATCH_PAIR_BUDGET):
+            span = slice(start, end)
+            targets, cells = self._batch_hit_cells(np.arange(start, end), first_row[span],
+                                                   row_count[span], first_col[span], col_count[span])
+            lengths = self.cell_ends[cells] - self.cell_starts[cells]
+            point_costs = np.bincount(targets - start, weights=lengths, minlength=end - start)
+
+            # Pairs are grouped by target, so each sub-block is a contiguous slice
+            bounds = np.searchsorted(targets, np.arange(start, end + 1))
+            for a, b in _budget_blocks(point_costs, BATCH_PAIR_BUDGET):
+                part = slice(bounds[a], bounds[b])
+                owner = np.repeat(targets[part], lengths[part])
+                positions = _expand_ranges(self.cell_starts[cells[part]], lengths[part])
+                distances = haversine_km(lats[owner], lons[owner],
+                                         self.lats[positions], self.lons[positions])
+                keep = distances <= radii[owner]
+                owners.append(owner[keep])
+                rows.append(self.rows[positions[keep]])
+
+        owners = np.concatenate(owners) if owners else np.empty(0, dtype=np.int64)
+        counts = np.bincount(owners, minlength=n).astype(np.int64)
+        if counts_only:
+            return counts
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        rows = rows[np.lexsort((rows, owners))]
+        return np.split(rows, np.cumsum(counts)[:-1]) if n else []
+
+
+# Index shared with pool workers, set once per worker by _init_worker
+_worker_index = None
+
+
+def _init_worker(index: GridIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+
+def _query_block(block):
+    lats, lons, radii, counts_only = block
+    return _worker_index.query_radius_batch(lats, lons, radii, counts_only)
+
+
+def batch_query_radius(index: GridIndex, lats, lons, radii, counts_only: bool = False,
+                       workers: Optional[int] = None):
+    """
+    Run query_radius_batch, splitting large target sets across processes.
+
+    Args:
+        index: Spatial index to query
+        lats, lons: Target coordinates
+        radii: One radius for all targets, or one per target
+        counts_only: Return match counts instead of row arrays
+        workers: Process count; None picks the CPU count for batches of at
+            least PARALLEL_MIN_TARGETS targets and runs serially otherwise
+
+    Returns:
+        Same as GridIndex.query_radius_batch, in target order
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), lats.shape)
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(lats) >= PARALLEL_MIN_TARGETS else 1
+    workers = max(1, min(workers, len(lats)))
+    if workers == 1:
+        return index.query_radius_batch(lats, lons, radii, counts_only)
+
+    # A few blocks per worker keeps the pool busy when query costs vary
+    bounds = np.linspace(0, len(lats), workers * 4 + 1).astype(int)
+    blocks = [(lats[a:b], lons[a:b], radii[a:b], counts_only)
+              for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(index,)) as pool:
+        parts = list(pool.map(_query_block, blocks))
+
+    if counts_only:
+        return np.concatenate(parts)
+    return [rows for part in parts for rows in part]
@@ -0,0 +1,326 @@
+import numpy as np
+import pandas as pd
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Handle both notebook and package imports
+try:
+    from ..models.apartment import Apartment, LAZY_NUMERIC_FIELDS, LAZY_TEXT_FIELDS
+except ImportError:
+    from models.apartment import Apartment, LAZY_NUMERIC_FIELDS, LAZY_TEXT_FIELDS
+
+
+# Column layout of the apartment feed, grouped by how each field is stored
+NUMERIC_FIELDS = ('id', 'bathrooms', 'bedrooms', 'price', 'square_feet',
+                  'latitude', 'longitude', 'time')
+CATEGORICAL_FIELDS = ('category', 'currency', 'fee', 'has_photo', 'pets_allowed',
+                      'price_type', 'cityname', 'state', 'source')
+TEXT_FIELDS = ('title', 'body', 'amenities', 'price_display', 'address')
+
+APARTMENT_FIELDS = ('id', 'category', 'title', 'body', 'amenities', 'bathrooms',
+                    'bedrooms', 'currency', 'fee', 'has_photo', 'pets_allowed',
+                    'price', 'price_display', 'price_type', 'square_feet',
+                    'address', 'cityname', 'state', 'latitude', 'longitude',
+                    'source', 'time')
+
+
+class ApartmentStore:
+    """
+    Columnar storage for the cleaned apartment dataset.
+
+    Numeric fields are kept as one NumPy array each, categorical fields as
+    integer codes into a small table of distinct values, and free text as
+    object arrays. Analysis code reads the columns directly; Apartment
+    objects are only built for the rows a caller asks for.
+    """
+
+    def __init__(self, numeric: Dict[str, np.ndarray],
+                 codes: Dict[str, np.ndarray],
+                 categories: Dict[str, np.ndarray],
+                 text: Dict[str, np.ndarray],
+                 length: int,
+                 column_order: Optional[List[str]] = None):
+        self.numeric = numeric
+        self.codes = codes
+        self.categories = categories
+        self.text = text
+        self._length = length
+        self.column_order = column_order or [field for field in APARTMENT_FIELDS
+                                             if self.has_field(field)]
+        self._indexes = {}
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'ApartmentStore':
+        """
+        Build a store from a cleaned DataFrame.
+
+        Numeric schema fields that did not parse as numbers are kept as text
+        so that no value is altered on the way in.
+        """
+        numeric, codes, categories, text = {}, {}, {}, {}
+
+        for col in APARTMENT_FIELDS:
+            if col not in df.columns:
+                continue
+            series = df[col]
+
+            if col in NUMERIC_FIELDS and pd.api.types.is_numeric_dtype(series):
+                numeric[col] = series.to_numpy()
+            elif col in CATEGORICAL_FIELDS:
+                col_codes, uniques = pd.factorize(series)
+                codes[col] = col_codes.astype(np.int32)
+                categories[col] = np.asarray(uniques, dtype=object)
+            else:
+                text[col] = series.to_numpy(dtype=object)
+
+        column_order = [col for col in df.columns if col in APARTMENT_FIELDS]
+        return cls(numeric, codes, categories, text, len(df), column_order)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def has_field(self, name: str) -> bool:
+        return name in self.numeric or name in self.codes or name in self.text
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Return a field as a NumPy array.
+
+        Categorical fields are decoded to an object array, with NaN for
+        missing values (matching what the cleaned DataFrame holds). Text
+        columns served from the binary cache are decoded the same way.
+        """
+        if name in self.numeric:
+            return self.numeric[name]
+        if name in self.codes:
+            lookup = np.append(self.categories[name], np.nan)
+            return lookup[self.codes[name]]
+        if name in self.text:
+            values = self.text[name]
+            return values if isinstance(values, np.ndarray) else values.to_numpy()
+        raise KeyError(f"Unknown field: {name}")
+
+    def valid_mask(self, name: str) -> np.ndarray:
+        """Boolean mask of rows where the field has a value."""
+        if name in self.numeric:
+            values = self.numeric[name]
+            if values.dtype.kind == 'f':
+                return ~np.isnan(values)
+            return np.ones(len(self), dtype=bool)
+        if name in self.codes:
+            return self.codes[name] >= 0
+        if name in self.text:
+            values = self.text[name]
+            return values.notna() if hasattr(values, 'notna') else pd.notna(values)
+        return np.zeros(len(self), dtype=bool)
+
+    def valid_values(self, name: str) -> np.ndarray:
+        """Values of a numeric field with missing entries removed."""
+        values = self.numeric[name]
+        if values.dtype.kind == 'f':
+            return values[~np.isnan(values)]
+        return values
+
+    def get_index(self, key, builder: Callable[['ApartmentStore'], Any]):
+        """
+        Return a cached index over this store, building it on first use.
+
+        Indexes live on the store, so every analyzer sharing a store (for
+        example through a DatasetSession) shares its indexes as well.
+        """
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = builder(self)
+        return index
+
+    def matches(self, name: str, condition, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate a filter condition on one field, optionally for a subset of rows.
+
+        `condition` may be:
+            - a scalar: equality (case-insensitive for categorical strings)
+            - a (low, high) tuple: inclusive range, either bound may be None
+            - a list or set: membership
+            - a callable: applied to the field's values, returning a mask
+
+        Returns:
+            Boolean mask aligned with `rows` (or with every row if omitted)
+        """
+        if name in self.codes:
+            return self._match_codes(name, condition, rows)
+
+        values = self.column(name)
+        if rows is not None:
+            values = values[rows]
+
+        if callable(condition):
+            return np.asarray(condition(values), dtype=bool)
+        if isinstance(condition, tuple):
+            low, high = condition
+            mask = np.ones(len(values), dtype=bool)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            return mask
+        if isinstance(condition, (list, set, frozenset)):
+            return np.isin(values, list(condition))
+        return values == condition
+
+    def _match_codes(self, name: str, condition, rows: Optional[np.ndarray]) -> np.ndarray:
+        # Decide per distinct category, then broadcast through the codes
+        categories = self.categories[name]
+        if callable(condition):
+            accepted = np.asarray(condition(categories), dtype=bool)
+        else:
+            wanted = condition if isinstance(condition, (list, set, frozenset)) else [condition]
+            folded = {_fold(value) for value in wanted}
+            accepted = np.array([_fold(value) in folded for value in categories], dtype=bool)
+        codes = self.codes[name] if rows is None else self.codes[name][rows]
+        return np.append(accepted, False)[codes]
+
+    def get_value(self, name: str, index: int):
+        """Return a single field value as a plain Python object."""
+        if name in self.numeric:
+            return self.numeric[name][index].item()
+        if name in self.codes:
+            code = self.codes[name][index]
+            return self.categories[name][code] if code >= 0 else np.nan
+        if name in self.text:
+            return self.text[name][index]
+        return None
+
+    def get_apartment(self, index: int) -> Apartment:
+        """Materialize the Apartment at a row position."""
+        return self.take([index])[0]
+
+    def _field_values(self, name: str, indices: np.ndarray) -> list:
+        """Plain Python values of one field for the given row positions."""
+        if name in self.numeric:
+            return self.numeric[name][indices].tolist()
+        if name in self.codes:
+            lookup = np.append(self.categories[name], np.nan)
+            return lookup[self.codes[name][indices]].tolist()
+        if name in self.text:
+            return self.text[name][indices].tolist()
+        return [None] * len(indices)
+
+    def take(self, indices: Sequence[int]) -> List[Apartment]:
+        """
+        Materialize Apartments for the given row positions, in order.
+
+        Values are converted column by column and zipped straight into the
+        constructor, which is far cheaper than building each row separately.
+        Large text fields are left in the store and read on access, and
+        numeric fields stay unboxed in their arrays until first read.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        # APARTMENT_FIELDS follows the positional order of Apartment.__init__
+        columns = [repeat(None) if (field in LAZY_TEXT_FIELDS and field in self.text
+                                    or field in LAZY_NUMERIC_FIELDS and self.has_field(field))
+                   else self._field_values(field, indices)
+                   for field in APARTMENT_FIELDS]
+        columns.append(repeat(self))
+        columns.append(indices.tolist())
+        return [Apartment(*values) for values in zip(*columns)]
+
+    def to_apartments(self) -> List[Apartment]:
+        """Materialize every row."""
+        return self.take(np.arange(len(self)))
+
+    def subset(self, indices: Sequence[int]) -> 'ApartmentStore':
+        """Return a new store holding only the given row positions."""
+        indices = np.asarray(indices, dtype=np.int64)
+        return ApartmentStore(
+            {name: values[indices] for name, values in self.numeric.items()},
+            {name: values[indices] for name, values in self.codes.items()},
+            dict(self.categories),
+            {name: values[indices] for name, values in self.text.items()},
+            len(indices),
+            self.column_order
+        )
+
+    def append(self, other: 'ApartmentStore') -> 'ApartmentStore':
+        """
+        Return a new store with `other`'s rows after this store's rows.
+
+        Categorical codes of `other` are remapped onto this store's category
+        table (new values are added at the end), so existing codes keep
+        their meaning. Indexes are not carried over.
+        """
+        n, m = len(self), len(other)
+        numeric, codes, categories, text = {}, {}, {}, {}
+
+        for name in dict.fromkeys(self.column_order + other.column_order):
+            if all(name in store.numeric or not store.has_field(name) for store in (self, other)):
+                numeric[name] = np.concatenate([self._numeric_column(name, n),
+                                                other._numeric_column(name, m)])
+            elif name in CATEGORICAL_FIELDS:
+                codes[name], categories[name] = self._append_codes(other, name, n, m)
+            else:
+                # Text, or a numeric field that only one side parsed as numbers
+                text[name] = np.concatenate([self._object_column(name, n),
+                                             other._object_column(name, m)])
+
+        column_order = self.column_order + [name for name in other.column_order
+                                            if name not in self.column_order]
+        return ApartmentStore(numeric, codes, categories, text, n + m, column_order)
+
+    def _numeric_column(self, name: str, length: int) -> np.ndarray:
+        return self.numeric[name] if name in self.numeric else np.full(length, np.nan)
+
+    def _object_column(self, name: str, length: int) -> np.ndarray:
+        if not self.has_field(name):
+            return np.full(length, np.nan, dtype=object)
+        return self.column(name).astype(object)
+
+    def _append_codes(self, other: 'ApartmentStore', name: str, n: int, m: int):
+        own = list(self.categories.get(name, []))
+        own_codes = self.codes.get(name, np.full(n, -1, dtype=np.int32))
+        if name not in other.codes:
+            return (np.concatenate([own_codes, np.full(m, -1, dtype=np.int32)]),
+                    np.asarray(own, dtype=object))
+
+        position = {value: code for code, value in enumerate(own)}
+        remap = []
+        for value in other.categories[name]:
+            if value not in position:
+                position[value] = len(own)
+                own.append(value)
+            remap.append(position[value])
+        other_codes = np.append(np.asarray(remap, dtype=np.int32), -1)[other.codes[name]]
+        return np.concatenate([own_codes, other_codes]), np.asarray(own, dtype=object)
+
+    def nbytes(self, include_text: bool = True) -> int:
+        """Approximate resident size of the stored columns in bytes."""
+        total = sum(values.nbytes for values in self.numeric.values())
+        total += sum(values.nbytes for values in self.codes.values())
+        if include_text:
+            for values in self.text.values():
+                total += values.nbytes
+                if isinstance(values, np.ndarray):
+                    total += sum(len(v) for v in values if isinstance(v, str))
+        return total
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Rebuild a DataFrame with the stored fields in their original order."""
+        columns = {}
+        for name in self.column_order:
+            values = self.column(name)
+            columns[name] = values if isinstance(values, np.ndarray) else values.to_numpy()
+        return pd.DataFrame(columns)
+
+    @classmethod
+    def from_apartments(cls, apartments: Sequence[Apartment]) -> 'ApartmentStore':
+        """Build a store from an existing list of Apartment objects."""
+        frame = pd.DataFrame({field: [getattr(apt, field) for apt in apartments]
+                              for field in APARTMENT_FIELDS})
+        return cls.from_dataframe(frame)
+
+    def __repr__(self):
+        return f"ApartmentStore(rows={len(self)}, fields={len(self.numeric) + len(self.codes) + len(self.text)})"
+
+
+def _fold(value):
+    """Lower-case strings so categorical filters ignore case."""
+    return value.lower() if isinstance(value, str) else value
@@ -0,0 +1,352 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Handle both notebook and package imports
+try:
+    from .apartment_store import ApartmentStore
+    from .cleaning import CLEANING_VERSION
+except ImportError:
+    from data.apartment_store import ApartmentStore
+    from data.cleaning import CLEANING_VERSION
+
+
+# Bump when the on-disk layout below changes
+CACHE_FORMAT = 1
+
+MANIFEST_NAME = 'manifest.json'
+
+_HASH_BLOCK = 1 << 20
+
+
+def default_cache_dir(data_path: str) -> Path:
+    """Cache location next to the source file: .apartment_cache/<file stem>/"""
+    source = Path(data_path)
+    return source.parent / '.apartment_cache' / source.stem
+
+
+def source_fingerprint(data_path: str, hash_content: bool = True) -> Dict[str, Any]:
+    """
+    Identify a source file by size, modification time and content hash,
+    together with the cleaning rules and cache layout it was processed with.
+    """
+    stat = os.stat(data_path)
+    fingerprint = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'cleaning_version': CLEANING_VERSION,
+        'cache_format': CACHE_FORMAT,
+    }
+    if hash_content:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(data_path, 'rb') as handle:
+            for block in iter(lambda: handle.read(_HASH_BLOCK), b''):
+                digest.update(block)
+        fingerprint['content_hash'] = digest.hexdigest()
+    return fingerprint
+
+
+class MappedTextColumn:
+    """
+    A text column stored as one UTF-8 byte buffer plus row offsets.
+
+    Strings are decoded only for the rows that are read, so a memory-mapped
+    cache can serve text without building a Python object per row.
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray, nulls: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+        self.nulls = nulls
+
+    @classmethod
+    def encode(cls, values) -> 'MappedTextColumn':
+        nulls = np.array([not isinstance(v, str) and (v is None or v != v) for v in values],
+                         dtype=bool)
+        encoded = [b'' if null else str(v).encode('utf-8') for v, null in zip(values, nulls)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(offsets, data, nulls)
+
+    def __len__(self) -> int:
+        return len(self.nulls)
+
+    def _decode(self, i: int):
+        if self.nulls[i]:
+            return np.nan
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._decode(int(key))
+        rows = np.arange(len(self))[key]
+        out = np.empty(len(rows), dtype=object)
+        for j, i in enumerate(rows.tolist()):
+            out[j] = self._decode(i)
+        return out
+
+    def notna(self) -> np.ndarray:
+        return ~self.nulls
+
+    def to_numpy(self) -> np.ndarray:
+        return self[np.arange(len(self))]
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.data.nbytes + self.nulls.nbytes
+
+
+def write_cache(store: ApartmentStore, cache_dir: Path, fingerprint: Dict[str, Any]) -> None:
+    """
+    Write a store to `cache_dir` as .npy columns plus a JSON manifest.
+
+    Files are written to a temporary directory first and moved into place,
+    so a crash never leaves a half-written cache behind.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix='.staging-', dir=cache_dir.parent))
+
+    try:
+        manifest = {
+            'fingerprint': fingerprint,
+            'rows': len(store),
+            'columns': store.column_order,
+            'numeric': sorted(store.numeric),
+            'categorical': {},
+            'text': sorted(store.text),
+        }
+        for name, values in store.numeric.items():
+            np.save(staging / f"{name}.npy", np.asarray(values))
+        for name, codes in store.codes.items():
+            np.save(staging / f"{name}.codes.npy", np.asarray(codes))
+            manifest['categorical'][name] = [_json_scalar(v) for v in store.categories[name]]
+        for name, values in store.text.items():
+            column = values if isinstance(values, MappedTextColumn) else MappedTextColumn.encode(values)
+            np.save(staging / f"{name}.offsets.npy", np.asarray(column.offsets))
+            np.save(staging / f"{name}.data.npy", np.asarray(column.data))
+            np.save(staging / f"{name}.nulls.npy", np.asarray(column.nulls))
+
+        _commit(staging, cache_dir, manifest)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _commit(staging: Path, cache_dir: Path, manifest: Dict[str, Any]) -> None:
+    with open(staging / MANIFEST_NAME, 'w') as handle:
+        json.dump(manifest, handle)
+
+    if cache_dir.exists():
+        shutil.rmtree(cache_dir)
+    os.replace(staging, cache_dir)
+
+
+class CacheWriter:
+    """
+    Builds a cache from a stream of cleaned chunks in bounded memory.
+
+    Each chunk's columns are appended to raw files as it arrives, with
+    categorical codes remapped onto one growing category table (in order
+    of first appearance, as a single factorize would give). commit() then
+    writes the .npy files, promoting numeric columns to the widest dtype any
+    chunk used, the way reading the whole file at once would infer it. The
+    result is laid out exactly like write_cache's.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        self.staging = Path(tempfile.mkdtemp(prefix='.staging-', dir=self.cache_dir.parent))
+        self.rows = 0
+        self.column_order: Optional[List[str]] = None
+        self.kinds: Dict[str, str] = {}
+        self.categories: Dict[str, Dict[Any, int]] = {}
+        self._text_bytes: Dict[str, int] = {}
+        # Raw file name -> [(dtype, count)] for every chunk appended to it
+        self._segments: Dict[str, List[Tuple[np.dtype, int]]] = {}
+
+    def __enter__(self) -> 'CacheWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is not None:
+            self.abort()
+
+    def append(self, chunk: pd.DataFrame) -> None:
+        """Add one cleaned chunk."""
+        store = ApartmentStore.from_dataframe(chunk)
+        if self.column_order is None:
+            self.column_order = store.column_order
+            for name in store.column_order:
+                self.kinds[name] = _kind(store, name)
+                if self.kinds[name] == 'text':
+                    self._text_bytes[name] = 0
+                    # The leading offset of the whole column
+                    self._write(f"{name}.offsets", np.zeros(1, dtype=np.int64))
+        elif store.column_order != self.column_order:
+            raise ValueError("Chunks must all have the same columns")
+
+        for name in self.column_order:
+            kind = _kind(store, name)
+            if kind != self.kinds[name]:
+                raise ValueError(f"Column {name!r} parsed as {kind} in one chunk and as "
+                                 f"{self.kinds[name]} in another; build the cache with write_cache")
+            if kind == 'numeric':
+                self._write(name, np.asarray(store.numeric[name]))
+            elif kind == 'categorical':
+                self._write(f"{name}.codes", self._global_codes(store, name))
+            else:
+                column = MappedTextColumn.encode(store.text[name])
+                self._write(f"{name}.offsets", column.offsets[1:] + self._text_bytes[name])
+                self._write(f"{name}.data", column.data)
+                self._write(f"{name}.nulls", column.nulls)
+                self._text_bytes[name] += len(column.data)
+        self.rows += len(store)
+
+    def _global_codes(self, store: ApartmentStore, name: str) -> np.ndarray:
+        position = self.categories.setdefault(name, {})
+        remap = [position.setdefault(value, len(position)) for value in store.categories[name]]
+        return np.append(np.asarray(remap, dtype=np.int32), np.int32(-1))[store.codes[name]]
+
+    def _write(self, part: str, values: np.ndarray) -> None:
+        with open(self.staging / f"{part}.part", 'ab') as handle:
+            handle.write(np.ascontiguousarray(values).tobytes())
+        self._segments.setdefault(part, []).append((values.dtype, len(values)))
+
+    def commit(self, fingerprint: Dict[str, Any]) -> int:
+        """
+        Finish the cache and move it into place.
+
+        Returns:
+            Number of rows cached
+        """
+        if self.column_order is None:
+            raise ValueError("No chunks were appended")
+        try:
+            for part in self._segments:
+                self._finish_part(part)
+            manifest = {
+                'fingerprint': fingerprint,
+                'rows': self.rows,
+                'columns': self.column_order,
+                'numeric': sorted(name for name, kind in self.kinds.items() if kind == 'numeric'),
+                'categorical': {name: [_json_scalar(v) for v in self.categories.get(name, {})]
+                                for name, kind in self.kinds.items() if kind == 'categorical'},
+                'text': sorted(name for name, kind in self.kinds.items() if kind == 'text'),
+            }
+            _commit(self.staging, self.cache_dir, manifest)
+        except BaseException:
+            self.abort()
+            raise
+        return self.rows
+
+    def _finish_part(self, part: str) -> None:
+        segments = self._segments[part]
+        dtype = np.result_type(*(segment_dtype for segment_dtype, _ in segments))
+        total = sum(count for _, count in segments)
+        raw = self.staging / f"{part}.part"
+        target = np.lib.format.open_memmap(self.staging / f"{part}.npy", mode='w+',
+                                           dtype=dtype, shape=(total,))
+        position = 0
+        with open(raw, 'rb') as handle:
+            for segment_dtype, count in segments:
+                target[position:position + count] = np.fromfile(handle, segment_dtype, count)
+                position += count
+        target.flush()
+        del target
+        os.remove(raw)
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+def write_cache_chunks(chunks: Iterable[pd.DataFrame], cache_dir: Path,
+                       fingerprint: Dict[str, Any]) -> int:
+    """
+    Cache a stream of cleaned chunks (see CacheWriter) without holding the
+    whole dataset in memory.
+
+    Returns:
+        Number of rows cached
+    """
+    with CacheWriter(cache_dir) as writer:
+        for chunk in chunks:
+            writer.append(chunk)
+        return writer.commit(fingerprint)
+
+
+def _kind(store: ApartmentStore, name: str) -> str:
+    if name in store.numeric:
+        return 'numeric'
+    return 'categorical' if name in store.codes else 'text'
+
+
+def read_manifest(cache_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(Path(cache_dir) / MANIFEST_NAME) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def is_cache_valid(cache_dir: Path, fingerprint: Dict[str, Any]) -> bool:
+    """
+    Whether the cache was built from the source `fingerprint` describes.
+
+    Only the keys present in `fingerprint` are compared, so a check made
+    without a content hash accepts a cache written with one (size, mtime
+    and versions must still match), while a hashed check rejects a cache
+    written without a hash.
+    """
+    manifest = read_manifest(cache_dir)
+    if manifest is None:
+        return False
+    stored = manifest.get('fingerprint') or {}
+    return all(key in stored and stored[key] == value for key, value in fingerprint.items())
+
+
+def read_cache(cache_dir: Path, mmap: bool = True) -> ApartmentStore:
+    """
+    Load a cached store. With `mmap`, columns are memory-mapped read-only so
+    several processes reading the same cache share the page cache.
+    """
+    cache_dir = Path(cache_dir)
+    manifest = read_manifest(cache_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No dataset cache at {cache_dir}")
+
+    def load(filename):
+        try:
+            return np.load(cache_dir / filename, mmap_mode='r' if mmap else None)
+        except ValueError:
+            # Zero-length arrays cannot be memory-mapped
+            return np.load(cache_dir / filename)
+
+    numeric = {name: load(f"{name}.npy") for name in manifest['numeric']}
+    codes = {name: load(f"{name}.codes.npy") for name in manifest['categorical']}
+    categories = {name: _object_array(values) for name, values in manifest['categorical'].items()}
+    text = {name: MappedTextColumn(load(f"{name}.offsets.npy"), load(f"{name}.data.npy"),
+                                   load(f"{name}.nulls.npy"))
+            for name in manifest['text']}
+
+    return ApartmentStore(numeric, codes, categories, text, manifest['rows'],
+                          column_order=manifest['columns'])
+
+
+def _object_array(values: list) -> np.ndarray:
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def _json_scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,30 @@
+import pandas as pd
+
+
+# Bump whenever the rules below change so cached cleaned data is rebuilt
+CLEANING_VERSION = 1
+
+NUMERIC_COLUMNS = ['price', 'square_feet', 'bathrooms', 'bedrooms', 'latitude', 'longitude']
+CATEGORICAL_COLUMNS = ['cityname', 'state', 'category', 'currency', 'pets_allowed']
+CRITICAL_COLUMNS = ['price', 'cityname', 'state']
+
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the cleaning rules to a frame (or one chunk of a larger file).
+
+    Every rule is row-local, so cleaning a file chunk by chunk gives the same
+    rows as cleaning it in one piece. The input frame is modified in place.
+    """
+    # Handle missing values and data type conversions
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Convert categorical variables to consistent string formats
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip()
+    
+    # Remove rows with missing critical information
+    return df.dropna(subset=CRITICAL_COLUMNS)
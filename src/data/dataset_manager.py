@@ -1,21 +1,106 @@
+import os
 import pandas as pd
+from pathlib import Path
 import numpy as np
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 # Handle both notebook and package imports
 try:
     from ..models.apartment import Apartment
+    from .apartment_store import ApartmentStore
+    from .cache import default_cache_dir, is_cache_valid, read_cache, source_fingerprint, write_cache
+    from .cleaning import clean_frame
+    from .streaming import DEFAULT_CHUNK_ROWS, clean_chunks, read_chunks, run_aggregations
+    from .indexes import build_indexes
+    from .query import Predicate, predicates_from_conditions, run_query
+    from .parallel import DEFAULT_PARTITION_ROWS, ParallelExecutor
+    from ..utils.memo import CacheInfo, MemoCache, memoized
+    from ..utils.instrumentation import Instrumentation, counted_rows, get_instrumentation, instrumented
+    from ..algorithms.external_sort import DEFAULT_FAN_IN, DEFAULT_MEMORY_BUDGET, ExternalSorter
+    from .encoding import (DEFAULT_SAMPLE_BYTES, REPLACE_AND_COUNT, EncodingReport,
+                           detect_encoding, replaced_count, reset_replaced_count)
 except ImportError:
     from models.apartment import Apartment
+    from data.apartment_store import ApartmentStore
+    from data.cache import default_cache_dir, is_cache_valid, read_cache, source_fingerprint, write_cache
+    from data.cleaning import clean_frame
+    from data.streaming import DEFAULT_CHUNK_ROWS, clean_chunks, read_chunks, run_aggregations
+    from data.indexes import build_indexes
+    from data.query import Predicate, predicates_from_conditions, run_query
+    from data.parallel import DEFAULT_PARTITION_ROWS, ParallelExecutor
+    from utils.memo import CacheInfo, MemoCache, memoized
+    from utils.instrumentation import Instrumentation, counted_rows, get_instrumentation, instrumented
+    from algorithms.external_sort import DEFAULT_FAN_IN, DEFAULT_MEMORY_BUDGET, ExternalSorter
+    from data.encoding import (DEFAULT_SAMPLE_BYTES, REPLACE_AND_COUNT, EncodingReport,
+                               detect_encoding, replaced_count, reset_replaced_count)
+
+
+def _rows(frame: Optional[pd.DataFrame]) -> Optional[int]:
+    return len(frame) if frame is not None else None
 
 
 class DatasetManager:
-    def __init__(self, data_path: Optional[str] = None):
+    def __init__(self, data_path: Optional[str] = None, session=None,
+                 instrumentation: Optional[Instrumentation] = None):
         self.data_path = data_path
         self.raw_data = None
-        self.cleaned_data = None
+        self.load_report = None
+        self._cleaned_data = None
+        self.store = None
         self.apartments = []
+        self.session = None
+        # Bumped on every change to the data; memoized results are keyed on it
+        self.data_version = 0
+        self.memo = MemoCache()
+        # Per-stage timings; the shared recorder is off unless enabled
+        self.instrumentation = (instrumentation if instrumentation is not None
+                                else get_instrumentation())
+        
+        if session is not None:
+            self.attach_session(session)
+    
+    @property
+    def cleaned_data(self) -> Optional[pd.DataFrame]:
+        if self._cleaned_data is None and self.session is not None:
+            return self.session.cleaned_data
+        # A store read from the cache has no DataFrame until one is asked for
+        if self._cleaned_data is None and self.store is not None:
+            self._cleaned_data = self.store.to_dataframe()
+        return self._cleaned_data
+    
+    @cleaned_data.setter
+    def cleaned_data(self, value: Optional[pd.DataFrame]):
+        self._cleaned_data = value
+    
+    def attach_session(self, session) -> None:
+        """
+        Share a DatasetSession's loaded data instead of loading a private copy.
+        
+        The session loads and cleans the dataset on first use; every manager
+        attached to it then points at the same store and cleaned frame.
+        """
+        session.load()
+        self.session = session
+        self.data_path = session.data_path
+        self.raw_data = None
+        self.load_report = session.load_report
+        self._cleaned_data = None
+        self.store = session.store
+        self._data_changed()
+    
+    def _data_changed(self) -> None:
+        """Invalidate memoized results after the data was replaced or extended."""
+        self.data_version += 1
+        self.memo.discard_stale(self.data_version)
+    
+    def cache_info(self) -> CacheInfo:
+        """Hits, misses and size of this analyzer's result cache."""
+        return self.memo.info()
+    
+    def clear_cache(self) -> None:
+        self.memo.clear()
     
+    @instrumented(rows_in=lambda manager: None)
     def load_data(self, data_path: Optional[str] = None) -> pd.DataFrame:
         if data_path:
             self.data_path = data_path
@@ -23,94 +108,278 @@ class DatasetManager:
         if not self.data_path:
             raise ValueError("Data path must be provided")
         
-        # Try different encodings to handle various character sets
-        encodings_to_try = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'utf-16']
-        
-        for encoding in encodings_to_try:
-            try:
-                print(f"Trying to load with {encoding} encoding...")
-                self.raw_data = pd.read_csv(self.data_path, sep=';', encoding=encoding)
-                print(f"✅ Successfully loaded {len(self.raw_data)} records with {encoding} encoding")
-                return self.raw_data
-            except UnicodeDecodeError:
-                print(f"❌ Failed with {encoding} encoding")
-                continue
-            except Exception as e:
-                print(f"❌ Error with {encoding} encoding: {str(e)}")
-                continue
-        
-        # If all encodings fail, try with error handling
+        # Loading a private copy detaches the manager from any shared session
+        self.session = None
+        
+        # Pick the encoding from a bounded sample, then parse the file once.
+        # Bytes that still fail to decode are replaced individually and counted.
+        encoding = detect_encoding(self.data_path)
+        reset_replaced_count()
         try:
-            print("Trying with error handling (replacing invalid characters)...")
-            self.raw_data = pd.read_csv(self.data_path, sep=';', encoding='utf-8', encoding_errors='replace')
-            print(f"✅ Successfully loaded {len(self.raw_data)} records with error replacement")
-            print("⚠️  Note: Some characters may have been replaced due to encoding issues")
-            return self.raw_data
+            self.raw_data = pd.read_csv(self.data_path, sep=';', encoding=encoding,
+                                        encoding_errors=REPLACE_AND_COUNT)
         except Exception as e:
-            raise Exception(f"Error loading data with all attempted encodings: {str(e)}")
+            raise Exception(f"Error loading data with {encoding} encoding: {str(e)}") from e
+        
+        self.load_report = EncodingReport(
+            encoding=encoding,
+            replaced_bytes=replaced_count(),
+            sample_bytes=min(os.path.getsize(self.data_path), DEFAULT_SAMPLE_BYTES),
+            rows=len(self.raw_data)
+        )
+        self._data_changed()
+        return self.raw_data
     
+    @instrumented(rows_in=lambda manager: _rows(manager.raw_data))
     def clean_data(self) -> pd.DataFrame:
         if self.raw_data is None:
             raise ValueError("No data loaded. Call load_data() first.")
         
-        self.cleaned_data = self.raw_data.copy()
+        self.cleaned_data = clean_frame(self.raw_data.copy())
+        self.store = ApartmentStore.from_dataframe(self.cleaned_data)
+        self._data_changed()
+        
+        print(f"Data cleaned. {len(self.cleaned_data)} records remaining after cleaning")
+        return self.cleaned_data
+    
+    @instrumented(rows_in=lambda manager: None)
+    def iter_cleaned_chunks(self, chunksize: int = DEFAULT_CHUNK_ROWS,
+                            data_path: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream the dataset as cleaned chunks without loading the whole file.
         
-        # Handle missing values and data type conversions
-        numeric_columns = ['price', 'square_feet', 'bathrooms', 'bedrooms', 'latitude', 'longitude']
+        Each chunk gets the same coercion, stripping and dropna rules as
+        clean_data(), so peak memory is bounded by the chunk size.
+        """
+        if data_path:
+            self.data_path = data_path
         
-        for col in numeric_columns:
-            if col in self.cleaned_data.columns:
-                self.cleaned_data[col] = pd.to_numeric(self.cleaned_data[col], errors='coerce')
+        if not self.data_path:
+            raise ValueError("Data path must be provided")
         
-        # Convert categorical variables to consistent string formats
-        categorical_columns = ['cityname', 'state', 'category', 'currency', 'pets_allowed']
-        for col in categorical_columns:
-            if col in self.cleaned_data.columns:
-                self.cleaned_data[col] = self.cleaned_data[col].astype(str).str.strip()
+        return clean_chunks(read_chunks(self.data_path, chunksize))
+    
+    @instrumented(rows_in=lambda manager: None, rows_out=lambda results: None)
+    def aggregate_stream(self, accumulators: List[Any],
+                         chunksize: int = DEFAULT_CHUNK_ROWS) -> List[Any]:
+        """Run streaming accumulators over the cleaned chunks in one pass."""
+        return run_aggregations(self.iter_cleaned_chunks(chunksize), accumulators)
+    
+    @instrumented(rows_in=lambda manager: None, rows_out=counted_rows)
+    def sort_stream(self, key: str, reverse: bool = False,
+                    output_path: Optional[str] = None,
+                    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                    fan_in: int = DEFAULT_FAN_IN,
+                    chunksize: int = DEFAULT_CHUNK_ROWS,
+                    temp_dir: Optional[str] = None):
+        """
+        Sort the cleaned dataset by one column without holding it in memory.
         
-        # Remove rows with missing critical information
-        critical_columns = ['price', 'cityname', 'state']
-        self.cleaned_data = self.cleaned_data.dropna(subset=critical_columns)
+        Uses an external merge sort over the cleaned chunks: sorted runs of
+        about `memory_budget` bytes are spilled to temporary files and
+        merged `fan_in` at a time.
         
-        print(f"Data cleaned. {len(self.cleaned_data)} records remaining after cleaning")
-        return self.cleaned_data
+        Args:
+            key: Column to sort by, e.g. 'price' or 'time'
+            reverse: Sort in descending order
+            output_path: Write the sorted rows to this semicolon CSV instead
+                of returning them
+            memory_budget: Approximate bytes of rows held in memory at once
+            fan_in: Maximum number of runs merged per pass
+            chunksize: Rows read from the source per chunk
+            temp_dir: Directory for spill files (default: system temp)
+            
+        Returns:
+            Iterator of sorted DataFrame blocks, or the number of rows
+            written when output_path is given
+        """
+        sorter = ExternalSorter(key, memory_budget, fan_in, reverse, temp_dir)
+        chunks = self.iter_cleaned_chunks(chunksize)
+        if output_path:
+            return sorter.sort_to_csv(chunks, output_path)
+        return sorter.sort(chunks)
     
+    @instrumented
+    def load_cached(self, data_path: Optional[str] = None, cache_dir: Optional[str] = None,
+                    verify_content: bool = True, mmap: bool = True) -> ApartmentStore:
+        """
+        Load the cleaned dataset from the binary cache, rebuilding it if stale.
+        
+        The cache is keyed on the source file's size, mtime and (optionally)
+        content hash plus the cleaning rules version. On a miss the CSV is
+        loaded and cleaned as usual and the result is written to the cache.
+        
+        Args:
+            data_path: Source CSV (defaults to the manager's data_path)
+            cache_dir: Where to keep the cache (defaults to next to the CSV)
+            verify_content: Also hash the file contents, not just size and mtime
+            mmap: Memory-map cached columns instead of reading them into memory
+            
+        Returns:
+            The ApartmentStore backing the cleaned data
+        """
+        if data_path:
+            self.data_path = data_path
+        
+        if not self.data_path:
+            raise ValueError("Data path must be provided")
+        
+        # Loading a private copy detaches the manager from any shared session
+        self.session = None
+        
+        cache_dir = Path(cache_dir) if cache_dir else default_cache_dir(self.data_path)
+        fingerprint = source_fingerprint(self.data_path, hash_content=verify_content)
+        
+        if not is_cache_valid(cache_dir, fingerprint):
+            self.load_data()
+            self.clean_data()
+            write_cache(self.store, cache_dir, fingerprint)
+        
+        self.raw_data = None
+        self.cleaned_data = None
+        self.store = read_cache(cache_dir, mmap=mmap)
+        self._data_changed()
+        return self.store
+    
+    @instrumented
     def create_apartments(self) -> List[Apartment]:
-        if self.cleaned_data is None:
+        # Check the fields, not the property: a cached store would be decoded
+        # into a full DataFrame just to answer the guard
+        if self.store is None and self._cleaned_data is None:
             raise ValueError("No cleaned data available. Call clean_data() first.")
         
-        self.apartments = []
+        if self.session is not None and self.store is self.session.store:
+            self.apartments = self.session.get_apartments()
+            self._data_changed()
+            print(f"Created {len(self.apartments)} apartment objects")
+            return self.apartments
         
-        for _, row in self.cleaned_data.iterrows():
-            apartment = Apartment(
-                id=row.get('id'),
-                category=row.get('category'),
-                title=row.get('title'),
-                body=row.get('body'),
-                amenities=row.get('amenities'),
-                bathrooms=row.get('bathrooms'),
-                bedrooms=row.get('bedrooms'),
-                currency=row.get('currency'),
-                fee=row.get('fee'),
-                has_photo=row.get('has_photo'),
-                pets_allowed=row.get('pets_allowed'),
-                price=row.get('price'),
-                price_display=row.get('price_display'),
-                price_type=row.get('price_type'),
-                square_feet=row.get('square_feet'),
-                address=row.get('address'),
-                cityname=row.get('cityname'),
-                state=row.get('state'),
-                latitude=row.get('latitude'),
-                longitude=row.get('longitude'),
-                source=row.get('source'),
-                time=row.get('time')
-            )
-            self.apartments.append(apartment)
+        # Build column by column from the store rather than row by row
+        if self.store is None:
+            self.store = ApartmentStore.from_dataframe(self.cleaned_data)
+        self.apartments = self.store.to_apartments()
+        self._data_changed()
         
         print(f"Created {len(self.apartments)} apartment objects")
         return self.apartments
     
+    @instrumented
+    def append_data(self, new_data: pd.DataFrame) -> ApartmentStore:
+        """
+        Clean a batch of newly arrived raw listings and add them to the dataset.
+        
+        The batch goes through the same cleaning rules as a full load and is
+        appended to the store (a new store object, so indexes built on the
+        old one are rebuilt on next use). A manager attached to a session
+        gets its own extended store; the shared one is left untouched.
+        
+        Args:
+            new_data: Raw rows with the same columns as the source CSV
+            
+        Returns:
+            Store holding only the appended rows, after cleaning
+        """
+        if self.store is None:
+            raise ValueError("No cleaned data available. Call clean_data() first.")
+        
+        added = ApartmentStore.from_dataframe(clean_frame(new_data.copy()))
+        first_row = len(self.store)
+        self.store = self.store.append(added)
+        self.session = None
+        # The cleaned frame is rebuilt from the store when next asked for
+        self._cleaned_data = None
+        if self.apartments:
+            self.apartments = self.apartments + self.store.take(np.arange(first_row, len(self.store)))
+        self._data_changed()
+        
+        print(f"Appended {len(added)} records ({len(new_data) - len(added)} dropped by cleaning)")
+        return added
+    
+    def build_indexes(self) -> None:
+        """
+        Build the city/state hash indexes and numeric sorted indexes now
+        rather than on first query (they are cached on the store either way).
+        """
+        if self.store is None:
+            raise ValueError("No cleaned data available. Call clean_data() first.")
+        build_indexes(self.store)
+    
+    @instrumented
+    def query_rows(self, *predicates: Predicate, explain: Optional[List[Dict[str, Any]]] = None,
+                   **conditions) -> np.ndarray:
+        """
+        Row positions matching every condition, without creating Apartments.
+        
+        See query() for the accepted arguments.
+        """
+        if self.store is None:
+            raise ValueError("No cleaned data available. Call clean_data() first.")
+        predicates = list(predicates) + predicates_from_conditions(conditions)
+        return run_query(self.store, predicates, explain=explain)
+    
+    @instrumented
+    def query(self, *predicates: Predicate, explain: Optional[List[Dict[str, Any]]] = None,
+              **conditions) -> List[Apartment]:
+        """
+        Apartments matching every condition, in dataset order.
+        
+        Conditions are planned together: the most selective one (estimated
+        from the hash, sorted and spatial indexes) runs first and the rest
+        are only checked against its matches.
+        
+        Args:
+            *predicates: Predicate objects (Equals, Between, OneOf, Near, Where)
+            explain: Optional list that receives the executed plan steps
+            **conditions: Field conditions in the ApartmentStore.matches
+                forms, plus near=(lat, lon, radius_km), e.g.
+                query(bedrooms=(2, 3), price=(None, 2000), state='TX',
+                      near=(30.27, -97.74, 10))
+            
+        Returns:
+            List of Apartment objects
+        """
+        return self.store.take(self.query_rows(*predicates, explain=explain, **conditions))
+    
+    def parallel(self, workers: Optional[int] = None,
+                 partition_rows: int = DEFAULT_PARTITION_ROWS,
+                 include_text: bool = False,
+                 fields: Optional[List[str]] = None) -> ParallelExecutor:
+        """
+        Process-pool executor over the current store for scans, filters and
+        group-by aggregations. Use it as a context manager:
+        
+            with manager.parallel(workers=8) as executor:
+                rows = executor.filter_rows(state='TX', price=(None, 2000))
+        
+        Args:
+            workers: Process count; None or 1 runs the same partitions in
+                this process, with identical results
+            partition_rows: Rows per partition
+            include_text: Also share text columns with the workers
+            fields: Share only these columns with the workers (default: all)
+        """
+        if self.store is None:
+            raise ValueError("No cleaned data available. Call clean_data() first.")
+        return ParallelExecutor(self.store, workers, partition_rows, include_text, fields)
+    
+    def _group_by(self, keys: List[str], rows: Optional[np.ndarray] = None,
+                  workers: Optional[int] = None, store: Optional[ApartmentStore] = None,
+                  **aggregations):
+        """
+        group_by over the store (or `store`, e.g. one with derived columns),
+        partitioned across `workers` processes (serial unless asked for).
+        Workers only receive the key and aggregated columns.
+        """
+        fields = list(keys) + [field for field, _ in aggregations.values()]
+        executor = (self.parallel(workers, fields=fields) if store is None
+                    else ParallelExecutor(store, workers, fields=fields))
+        with executor:
+            return executor.group_by(keys, rows=rows, **aggregations)
+    
+    def has_data(self) -> bool:
+        return self.store is not None and len(self.store) > 0
+    
+    @instrumented
     def get_data_info(self):
         if self.cleaned_data is None:
             print("No data loaded")
@@ -124,6 +393,8 @@ class DatasetManager:
         print("\nMissing Values:")
         print(self.cleaned_data.isnull().sum())
     
+    @instrumented(rows_out=len)
+    @memoized
     def get_descriptive_statistics(self):
         if self.cleaned_data is None:
             raise ValueError("No cleaned data available.")
@@ -0,0 +1,82 @@
+import codecs
+import threading
+from typing import NamedTuple
+
+
+# Bytes that are undefined in cp1252; a sample containing them is not cp1252
+_CP1252_UNDEFINED = {0x81, 0x8D, 0x8F, 0x90, 0x9D}
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+DEFAULT_SAMPLE_BYTES = 1 << 20
+
+# Name of the codec error handler used while parsing; registered on import
+REPLACE_AND_COUNT = 'apartment_replace_and_count'
+
+_replaced = threading.local()
+
+
+def _replace_and_count(error: UnicodeDecodeError):
+    """Replace an undecodable byte range with U+FFFD and record its length."""
+    _replaced.count = getattr(_replaced, 'count', 0) + (error.end - error.start)
+    return '\ufffd', error.end
+
+
+codecs.register_error(REPLACE_AND_COUNT, _replace_and_count)
+
+
+class EncodingReport(NamedTuple):
+    """Outcome of loading a CSV: the chosen encoding and any bytes replaced."""
+    encoding: str
+    replaced_bytes: int
+    sample_bytes: int
+    rows: int
+
+    @property
+    def clean(self) -> bool:
+        return self.replaced_bytes == 0
+
+
+def detect_encoding(path: str, sample_size: int = DEFAULT_SAMPLE_BYTES) -> str:
+    """
+    Guess a file's encoding from its first `sample_size` bytes.
+
+    Checks for a byte-order mark, then strict UTF-8, then cp1252 (the usual
+    source of stray bytes such as 0x92 in scraped listings), and finally
+    latin-1, which accepts any byte sequence.
+    """
+    with open(path, 'rb') as handle:
+        sample = handle.read(sample_size)
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    # UTF-16 without a BOM shows up as NUL bytes between ASCII characters
+    if sample and sample.count(0) > len(sample) // 4:
+        return 'utf-16-le' if sample[1::2].count(0) > sample[0::2].count(0) else 'utf-16-be'
+
+    # Decode incrementally so a multi-byte character cut off at the end of
+    # the sample is not mistaken for an invalid sequence
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    if not _CP1252_UNDEFINED.intersection(sample):
+        return 'cp1252'
+    return 'latin-1'
+
+
+def reset_replaced_count() -> None:
+    _replaced.count = 0
+
+
+def replaced_count() -> int:
+    return getattr(_replaced, 'count', 0)
+
@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Handle both notebook and package imports
+try:
+    from .apartment_store import ApartmentStore
+except ImportError:
+    from data.apartment_store import ApartmentStore
+
+
+# Aggregations understood by group_by; all skip missing values except 'size'
+AGGREGATIONS = ('size', 'count', 'sum', 'mean', 'median', 'min', 'max', 'nunique', 'first')
+
+
+class GroupedStats:
+    """
+    Result of group_by: one entry per group, in order of first appearance.
+
+    Attributes:
+        keys: Group keys (a value, or a tuple of values for several fields)
+        columns: Aggregate name -> array aligned with `keys`
+    """
+
+    def __init__(self, keys: List[Any], columns: Dict[str, np.ndarray]):
+        self.keys = keys
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def to_dict(self) -> Dict[Any, Dict[str, Any]]:
+        """{key: {aggregate: value}}, with empty-group aggregates as None."""
+        names = list(self.columns)
+        rows = zip(*(self.columns[name].tolist() for name in names))
+        return {key: {name: _optional(value) for name, value in zip(names, row)}
+                for key, row in zip(self.keys, rows)}
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, index=pd.Index(self.keys, tupleize_cols=False))
+
+
+def _field_codes(store: ApartmentStore, field: str,
+                 rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer codes of a field for `rows` (-1 where missing) and the value
+    each code stands for. Empty categorical strings count as missing.
+    """
+    if field in store.codes:
+        categories = store.categories[field]
+        present = np.array([value != '' for value in categories] + [False])
+        codes = store.codes[field][rows].astype(np.int64)
+        return np.where(present[codes], codes, -1), categories
+
+    values = store.column(field)[rows]
+    if field in store.numeric:
+        valid = ~np.isnan(values) if values.dtype.kind == 'f' else np.ones(len(values), dtype=bool)
+        uniques, inverse = np.unique(values[valid], return_inverse=True)
+        codes = np.full(len(values), -1, dtype=np.int64)
+        codes[valid] = inverse
+        return codes, uniques
+
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    return codes.astype(np.int64), np.asarray(uniques, dtype=object)
+
+
+def _group_ids(store: ApartmentStore, keys: Sequence[str],
+               rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+    """
+    Number the groups of `rows` by first appearance.
+
+    Returns:
+        (rows that have every key, group id per such row, key per group)
+    """
+    field_codes = [_field_codes(store, field, rows) for field in keys]
+
+    valid = np.logical_and.reduce([codes >= 0 for codes, _ in field_codes])
+    combined = np.zeros(np.count_nonzero(valid), dtype=np.int64)
+    for codes, uniques in field_codes:
+        combined = combined * len(uniques) + codes[valid]
+
+    combos, first_seen, inverse = np.unique(combined, return_index=True, return_inverse=True)
+    # np.unique numbers groups in key order; renumber them by first appearance
+    order = np.argsort(first_seen, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    group_keys = []
+    for combo in combos[order].tolist():
+        parts = []
+        for _, uniques in reversed(field_codes):
+            combo, code = divmod(combo, len(uniques))
+            parts.append(_plain(uniques[code]))
+        group_keys.append(parts[0] if len(parts) == 1 else tuple(reversed(parts)))
+
+    return rows[valid], rank[inverse.ravel()], group_keys
+
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _sorted_layout(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Values laid out group by group, each group sorted ascending."""
+    # Sort by value, then stably by group; group ids fit a narrower type
+    # than row positions, which keeps the second sort cheap
+    by_value = np.argsort(values)
+    narrow = groups.astype(np.int32) if len(groups) and groups.max() < 2**31 else groups
+    return values[by_value[np.argsort(narrow[by_value], kind='stable')]].astype(float)
+
+
+def _aggregate(store: ApartmentStore, field: str, how: str, rows: np.ndarray,
+               groups: np.ndarray, n_groups: int, layouts: Dict[str, np.ndarray]) -> np.ndarray:
+    if how == 'size':
+        return np.bincount(groups, minlength=n_groups)
+    if not store.has_field(field):
+        # A column the dataset lacks aggregates like one with no values
+        if how in ('count', 'nunique'):
+            return np.zeros(n_groups, dtype=np.int64)
+        return np.full(n_groups, np.nan)
+
+    if how in ('nunique', 'first') or field not in store.numeric:
+        codes, uniques = _field_codes(store, field, rows)
+        present = codes >= 0
+        codes, value_groups = codes[present], groups[present]
+        if how == 'count':
+            return np.bincount(value_groups, minlength=n_groups)
+        if how == 'nunique':
+            if not len(uniques):
+                return np.zeros(n_groups, dtype=np.int64)
+            pairs = np.unique(value_groups * len(uniques) + codes)
+            return np.bincount(pairs // len(uniques), minlength=n_groups)
+        if how == 'first':
+            result = np.full(n_groups, None, dtype=object)
+            # Assigning in reverse row order leaves each group's first value
+            result[value_groups[::-1]] = np.asarray(uniques, dtype=object)[codes[::-1]]
+            if field in store.numeric:
+                return np.array([np.nan if v is None else v for v in result], dtype=float)
+            return result
+        raise ValueError(f"Aggregation {how!r} needs a numeric field, got {field!r}")
+
+    values = store.numeric[field][rows]
+    if values.dtype.kind == 'f':
+        present = ~np.isnan(values)
+        values, groups = values[present], groups[present]
+    counts = np.bincount(groups, minlength=n_groups)
+
+    if how == 'count':
+        return counts
+    if how in ('sum', 'mean'):
+        sums = np.bincount(groups, weights=values, minlength=n_groups)
+        if how == 'sum':
+            return sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    if how in ('median', 'min', 'max'):
+        # Shared by every order statistic of the same field
+        ordered = layouts.get(field)
+        if ordered is None:
+            ordered = layouts[field] = _sorted_layout(values, groups)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        result = np.full(n_groups, np.nan)
+        filled = counts > 0
+        first, count = starts[filled], counts[filled]
+        if how == 'min':
+            result[filled] = ordered[first]
+        elif how == 'max':
+            result[filled] = ordered[first + count - 1]
+        else:
+            result[filled] = (ordered[first + (count - 1) // 2] + ordered[first + count // 2]) / 2
+        return result
+    raise ValueError(f"Unknown aggregation: {how!r} (expected one of {AGGREGATIONS})")
+
+
+def group_by(store: ApartmentStore, keys: Sequence[str],
+             rows: Optional[np.ndarray] = None,
+             **aggregations: Tuple[str, str]) -> GroupedStats:
+    """
+    Group rows by one or more fields and aggregate other fields per group.
+
+    Every aggregate is computed with a constant number of vectorized passes
+    (bincount, plus one sort per field for median/min/max), regardless of
+    the number of groups. Rows missing any key field are left out, as are empty
+    categorical strings.
+
+    Args:
+        store: Store to aggregate
+        keys: Field names to group by, e.g. ['state', 'bedrooms']
+        rows: Optional row positions or boolean mask to restrict the input
+        **aggregations: name=(field, how) pairs, how being one of
+            AGGREGATIONS, e.g. avg_price=('price', 'mean')
+
+    Returns:
+        GroupedStats with groups in order of first appearance
+
+    Example:
+        group_by(store, ['state', 'bedrooms'], count=('price', 'count'),
+                 median_price=('price', 'median'))
+    """
+    if rows is None:
+        rows = np.arange(len(store))
+    else:
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+
+    rows, groups, group_keys = _group_ids(store, list(keys), rows)
+    layouts = {}
+    columns = {name: _aggregate(store, field, how, rows, groups, len(group_keys), layouts)
+               for name, (field, how) in aggregations.items()}
+    return GroupedStats(group_keys, columns)
+
+
+def group_rows(store: ApartmentStore, keys: Sequence[str],
+               rows: Optional[np.ndarray] = None) -> Tuple[List[Any], List[np.ndarray]]:
+    """
+    The rows of each group, for per-group work group_by cannot express.
+
+    Returns:
+        (group keys in order of first appearance, row positions of each
+        group in input order)
+    """
+    rows = np.arange(len(store)) if rows is None else np.asarray(rows)
+    if rows.dtype == bool:
+        rows = np.flatnonzero(rows)
+    rows, groups, group_keys = _group_ids(store, list(keys), rows)
+
+    order = np.argsort(groups, kind='stable')
+    bounds = np.cumsum(np.bincount(groups, minlength=len(group_keys)))
+    return group_keys, np.split(rows[order], bounds[:-1])
+
+
+def _optional(value):
+    """Map a NaN aggregate (empty group) to None."""
+    return None if isinstance(value, float) and value != value else value
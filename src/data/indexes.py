@@ -0,0 +1,215 @@
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Handle both notebook and package imports
+try:
+    from .apartment_store import ApartmentStore
+    from ..algorithms.spatial import GridIndex
+except ImportError:
+    from data.apartment_store import ApartmentStore
+    from algorithms.spatial import GridIndex
+
+
+def fold_key(value):
+    """Lower-case a lookup key (or each part of a composite key)."""
+    if isinstance(value, tuple):
+        return tuple(fold_key(part) for part in value)
+    return value.lower() if isinstance(value, str) else value
+
+
+class HashIndex:
+    """
+    Maps lower-cased categorical values to the row positions holding them.
+
+    Rows are grouped by value once at build time (a CSR layout: one sorted
+    array of rows plus per-group offsets), so a lookup costs time
+    proportional to the number of matching rows.
+    """
+
+    def __init__(self, group_codes: np.ndarray, group_keys: Sequence[Hashable]):
+        """
+        Args:
+            group_codes: Group number for every row, -1 for rows to leave out
+            group_keys: Lookup key of each group number
+        """
+        valid = np.flatnonzero(group_codes >= 0)
+        codes = group_codes[valid]
+        order = np.argsort(codes, kind='stable')
+
+        self.rows = valid[order]
+        counts = np.bincount(codes, minlength=len(group_keys))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.group_keys = list(group_keys)
+
+        # Several raw values can fold to the same key ("Denver", "denver")
+        self.groups: Dict[Hashable, List[int]] = {}
+        for group, key in enumerate(group_keys):
+            if counts[group]:
+                self.groups.setdefault(fold_key(key), []).append(group)
+
+    def lookup(self, key) -> np.ndarray:
+        """Row positions (ascending) whose value matches `key`, ignoring case."""
+        groups = self.groups.get(fold_key(key), [])
+        if not groups:
+            return np.empty(0, dtype=np.int64)
+        if len(groups) == 1:
+            g = groups[0]
+            return self.rows[self.offsets[g]:self.offsets[g + 1]]
+        return np.sort(np.concatenate([self.rows[self.offsets[g]:self.offsets[g + 1]]
+                                       for g in groups]))
+
+    def count(self, key) -> int:
+        """Number of matching rows, without materializing them."""
+        return int(sum(self.offsets[g + 1] - self.offsets[g]
+                       for g in self.groups.get(fold_key(key), [])))
+
+    def partitions(self) -> Tuple[List[Hashable], List[np.ndarray]]:
+        """
+        Every non-empty group's original (unfolded) key and rows, groups in
+        order of first appearance.
+        """
+        starts, ends = self.offsets[:-1], self.offsets[1:]
+        occupied = np.flatnonzero(ends > starts)
+        # Rows are ascending within a group, so a group's first row is its start
+        occupied = occupied[np.argsort(self.rows[starts[occupied]], kind='stable')]
+        return ([self.group_keys[g] for g in occupied],
+                [self.rows[starts[g]:ends[g]] for g in occupied])
+
+    def keys(self) -> List[Hashable]:
+        return list(self.groups)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+
+# Numeric fields that get a sorted index
+SORTED_INDEX_FIELDS = ('price', 'square_feet', 'bedrooms', 'bathrooms', 'time')
+
+
+class SortedIndex:
+    """
+    A numeric field's row positions ordered by value (a stable argsort).
+
+    Bound lookups are binary searches over the sorted values, so a range
+    query costs O(log n) to locate plus O(k) to return k rows, and counting
+    matches costs O(log n). Missing (NaN) values are left out.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values)
+        valid = np.flatnonzero(~np.isnan(values)) if values.dtype.kind == 'f' \
+            else np.arange(len(values))
+        order = np.argsort(values[valid], kind='stable')
+
+        self.rows = valid[order]
+        self.values = values[self.rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def lower_bound(self, value) -> int:
+        """Position of the first entry >= value (leftmost insertion point)."""
+        return int(np.searchsorted(self.values, value, side='left'))
+
+    def upper_bound(self, value) -> int:
+        """Position just past the last entry <= value (rightmost insertion point)."""
+        return int(np.searchsorted(self.values, value, side='right'))
+
+    def bounds(self, low=None, high=None, include_low: bool = True,
+               include_high: bool = True) -> Tuple[int, int]:
+        """[start, stop) positions of the entries inside a range."""
+        start = 0 if low is None else (self.lower_bound(low) if include_low
+                                       else self.upper_bound(low))
+        stop = len(self) if high is None else (self.upper_bound(high) if include_high
+                                               else self.lower_bound(high))
+        return start, max(start, stop)
+
+    def range(self, low=None, high=None, include_low: bool = True,
+              include_high: bool = True, row_order: bool = False) -> np.ndarray:
+        """
+        Rows whose value lies in the range; None leaves a side open.
+
+        Rows come back in value order (ties in row order) at O(log n + k)
+        for k matches.
+
+        Args:
+            row_order: Return ascending row positions instead, at the cost
+                of an extra O(k log k) sort
+        """
+        start, stop = self.bounds(low, high, include_low, include_high)
+        rows = self.rows[start:stop]
+        return np.sort(rows) if row_order else rows
+
+    def count(self, low=None, high=None, include_low: bool = True,
+              include_high: bool = True) -> int:
+        """Number of rows in the range, without materializing them."""
+        start, stop = self.bounds(low, high, include_low, include_high)
+        return stop - start
+
+    def equal(self, value) -> np.ndarray:
+        """Rows equal to `value`, in row order (the sort is stable)."""
+        return self.range(value, value)
+
+    def first_equal(self, value) -> Optional[int]:
+        """Lowest row equal to `value` (the sort is stable), or None."""
+        position = self.lower_bound(value)
+        if position < len(self) and self.values[position] == value:
+            return int(self.rows[position])
+        return None
+
+
+def _build_hash_index(store: ApartmentStore, fields: Tuple[str, ...]) -> HashIndex:
+    codes = [store.codes[field].astype(np.int64) for field in fields]
+    categories = [store.categories[field] for field in fields]
+
+    # Empty strings are treated as missing, like the `if apt.cityname` checks
+    present = [np.append([value != '' for value in cats], False)[c]
+               for c, cats in zip(codes, categories)]
+
+    if len(fields) == 1:
+        group_codes = np.where(present[0], codes[0], -1)
+        return HashIndex(group_codes, list(categories[0]))
+
+    # Composite key: number each distinct combination that actually occurs
+    valid = np.logical_and.reduce(present)
+    combined = np.zeros(len(store), dtype=np.int64)
+    for c, cats in zip(codes, categories):
+        combined = combined * len(cats) + c
+    combos, inverse = np.unique(combined[valid], return_inverse=True)
+
+    group_codes = np.full(len(store), -1, dtype=np.int64)
+    group_codes[valid] = inverse
+    keys = []
+    for combo in combos.tolist():
+        parts = []
+        for cats in reversed(categories):
+            combo, code = divmod(combo, len(cats))
+            parts.append(cats[code])
+        keys.append(tuple(reversed(parts)))
+    return HashIndex(group_codes, keys)
+
+
+def hash_index(store: ApartmentStore, *fields: str) -> HashIndex:
+    """The store's hash index over one or more categorical fields, built once."""
+    return store.get_index(('hash',) + fields, lambda s: _build_hash_index(s, fields))
+
+
+def sorted_index(store: ApartmentStore, field: str) -> SortedIndex:
+    """The store's sorted index over a numeric field, built once."""
+    return store.get_index(('sorted', field), lambda s: SortedIndex(s.column(field)))
+
+
+def spatial_index(store: ApartmentStore) -> GridIndex:
+    """The store's grid index over latitude/longitude, built once."""
+    return store.get_index('spatial', lambda s: GridIndex(s.column('latitude'),
+                                                          s.column('longitude')))
+
+
+def build_indexes(store: ApartmentStore) -> None:
+    """Build the standard hash and sorted indexes up front."""
+    for fields in (('cityname',), ('state',), ('cityname', 'state')):
+        if all(field in store.codes for field in fields):
+            hash_index(store, *fields)
+    for field in SORTED_INDEX_FIELDS:
+        if field in store.numeric:
+            sorted_index(store, field)
@@ -1,52 +1,82 @@
 import numpy as np
 import math
-from typing import List, Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 # Handle both notebook and package imports
 try:
     from .dataset_manager import DatasetManager
+    from .indexes import hash_index, spatial_index
     from ..models.apartment import Apartment
+    from ..algorithms.spatial import GridIndex, batch_query_radius
+    from ..utils.instrumentation import instrumented, single_row
+    from ..utils.memo import memoized
 except ImportError:
     from data.dataset_manager import DatasetManager
+    from data.indexes import hash_index, spatial_index
     from models.apartment import Apartment
+    from algorithms.spatial import GridIndex, batch_query_radius
+    from utils.instrumentation import instrumented, single_row
+    from utils.memo import memoized
 
 
 class LocationAnalysis(DatasetManager):
-    def __init__(self, data_path: str = None):
-        super().__init__(data_path)
+    def __init__(self, data_path: str = None, session=None, instrumentation=None):
+        super().__init__(data_path, session, instrumentation)
     
+    @instrumented(rows_out=single_row)
+    @memoized
     def get_summary(self) -> str:
-        if not self.apartments:
+        if not self.has_data():
             return "No apartments loaded for location analysis"
         
-        cities = set(apt.cityname for apt in self.apartments if apt.cityname)
-        states = set(apt.state for apt in self.apartments if apt.state)
+        cities = self._present_mask('cityname')
+        states = self._present_mask('state')
         
-        valid_coords = [(apt.latitude, apt.longitude) for apt in self.apartments 
-                       if apt.latitude is not None and apt.longitude is not None]
+        valid_coords = self.store.valid_mask('latitude') & self.store.valid_mask('longitude')
         
         return f"""Location Analysis Summary:
-        Total Apartments: {len(self.apartments)}
-        Unique Cities: {len(cities)}
-        Unique States: {len(states)}
-        Valid Coordinates: {len(valid_coords)}
+        Total Apartments: {len(self.store)}
+        Unique Cities: {len(np.unique(self.store.codes['cityname'][cities]))}
+        Unique States: {len(np.unique(self.store.codes['state'][states]))}
+        Valid Coordinates: {int(np.count_nonzero(valid_coords))}
         Top Cities: {self._get_top_cities(5)}"""
     
+    def _present_mask(self, field: str) -> np.ndarray:
+        """Rows where a categorical field holds a non-empty value."""
+        codes = self.store.codes[field]
+        non_empty = np.array([bool(value) for value in self.store.categories[field]] + [False])
+        return non_empty[codes]
+    
+    @memoized
     def _get_top_cities(self, n: int = 10) -> List[Tuple[str, int]]:
-        city_counts = {}
-        for apt in self.apartments:
-            if apt.cityname:
-                city_counts[apt.cityname] = city_counts.get(apt.cityname, 0) + 1
+        if not self.has_data():
+            return []
+        
+        codes = self.store.codes['cityname'][self._present_mask('cityname')]
+        counts = np.bincount(codes, minlength=len(self.store.categories['cityname']))
         
-        return sorted(city_counts.items(), key=lambda x: x[1], reverse=True)[:n]
+        # Stable sort keeps first-seen order among ties, like the dict-based count
+        order = np.argsort(-counts, kind='stable')[:n]
+        return [(self.store.categories['cityname'][code], int(counts[code]))
+                for code in order if counts[code] > 0]
     
+    @instrumented
     def filter_by_city(self, city_name: str) -> List[Apartment]:
-        return [apt for apt in self.apartments 
-                if apt.cityname and apt.cityname.lower() == city_name.lower()]
+        if not self.has_data():
+            return []
+        return self.store.take(hash_index(self.store, 'cityname').lookup(city_name))
     
+    @instrumented
     def filter_by_state(self, state: str) -> List[Apartment]:
-        return [apt for apt in self.apartments 
-                if apt.state and apt.state.lower() == state.lower()]
+        if not self.has_data():
+            return []
+        return self.store.take(hash_index(self.store, 'state').lookup(state))
+    
+    @instrumented
+    def filter_by_city_and_state(self, city_name: str, state: str) -> List[Apartment]:
+        if not self.has_data():
+            return []
+        return self.store.take(hash_index(self.store, 'cityname', 'state').lookup((city_name, state)))
     
     def calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         R = 6371.0
@@ -64,89 +94,93 @@ class LocationAnalysis(DatasetManager):
         
         return R * c
     
+    @property
+    def spatial_index(self) -> GridIndex:
+        """Grid index over apartment coordinates, built once per dataset."""
+        return spatial_index(self.store)
+    
+    @instrumented
     def filter_by_proximity(self, target_lat: float, target_lon: float, 
                            radius_km: float) -> List[Apartment]:
-        nearby_apartments = []
-        
-        for apt in self.apartments:
-            if apt.latitude is not None and apt.longitude is not None:
-                distance = self.calculate_distance(target_lat, target_lon, 
-                                                 apt.latitude, apt.longitude)
-                if distance <= radius_km:
-                    nearby_apartments.append(apt)
+        if not self.has_data():
+            return []
         
-        return nearby_apartments
+        return self.store.take(self.spatial_index.query_radius(target_lat, target_lon, radius_km))
     
-    def get_city_statistics(self) -> Dict[str, Dict[str, any]]:
-        city_stats = {}
-        
-        for apt in self.apartments:
-            if apt.cityname:
-                city = apt.cityname
-                if city not in city_stats:
-                    city_stats[city] = {
-                        'count': 0,
-                        'prices': [],
-                        'avg_bedrooms': [],
-                        'state': apt.state
-                    }
-                
-                city_stats[city]['count'] += 1
-                
-                if apt.price is not None:
-                    city_stats[city]['prices'].append(apt.price)
-                
-                if apt.bedrooms is not None:
-                    city_stats[city]['avg_bedrooms'].append(apt.bedrooms)
-        
-        for city, stats in city_stats.items():
-            if stats['prices']:
-                stats['avg_price'] = np.mean(stats['prices'])
-                stats['median_price'] = np.median(stats['prices'])
-            else:
-                stats['avg_price'] = None
-                stats['median_price'] = None
+    @instrumented
+    def filter_by_proximity_batch(self, target_lats, target_lons, radius_km,
+                                  counts_only: bool = False,
+                                  workers: Optional[int] = None):
+        """
+        Answer the same radius question for many target points at once.
+        
+        Args:
+            target_lats, target_lons: Arrays of target coordinates
+            radius_km: One radius for every target, or an array of radii
+            counts_only: Return only the number of matches per target
+            workers: Worker processes; None runs large batches on all cores
             
-            if stats['avg_bedrooms']:
-                stats['avg_bedrooms'] = np.mean(stats['avg_bedrooms'])
-            else:
-                stats['avg_bedrooms'] = None
-            
-            del stats['prices']
-        
-        return city_stats
+        Returns:
+            Per-target arrays of row positions (use store.take() to get
+            Apartments), or an array of counts when counts_only is set
+        """
+        if not self.has_data():
+            n_targets = len(np.atleast_1d(target_lats))
+            return np.zeros(n_targets, dtype=np.int64) if counts_only else \
+                [np.empty(0, dtype=np.int64) for _ in range(n_targets)]
+        
+        return batch_query_radius(self.spatial_index, target_lats, target_lons, radius_km,
+                                  counts_only=counts_only, workers=workers)
     
-    def get_state_statistics(self) -> Dict[str, Dict[str, any]]:
-        state_stats = {}
-        
-        for apt in self.apartments:
-            if apt.state:
-                state = apt.state
-                if state not in state_stats:
-                    state_stats[state] = {
-                        'count': 0,
-                        'prices': [],
-                        'cities': set()
-                    }
-                
-                state_stats[state]['count'] += 1
-                
-                if apt.price is not None:
-                    state_stats[state]['prices'].append(apt.price)
-                
-                if apt.cityname:
-                    state_stats[state]['cities'].add(apt.cityname)
-        
-        for state, stats in state_stats.items():
-            if stats['prices']:
-                stats['avg_price'] = np.mean(stats['prices'])
-                stats['median_price'] = np.median(stats['prices'])
-            else:
-                stats['avg_price'] = None
-                stats['median_price'] = None
+    @instrumented
+    def nearest(self, lat: float, lon: float, k: int = 10,
+                filters: Optional[Dict[str, Any]] = None) -> List[Tuple[Apartment, float]]:
+        """
+        Find the k apartments closest to a point.
+        
+        Args:
+            lat, lon: Query point in degrees
+            k: Number of apartments to return
+            filters: Optional field conditions, e.g. {'bedrooms': 2,
+                'price': (None, 2000), 'state': 'TX'}; see
+                ApartmentStore.matches for the accepted forms. Filters are
+                only evaluated on listings near the query point.
             
-            stats['unique_cities'] = len(stats['cities'])
-            del stats['prices']
-            del stats['cities']
-        
-        return state_stats
\ No newline at end of file
+        Returns:
+            List of (apartment, distance_km) sorted by distance
+        """
+        if not self.has_data():
+            return []
+        
+        row_filter = None
+        if filters:
+            def row_filter(rows):
+                mask = np.ones(len(rows), dtype=bool)
+                for field, condition in filters.items():
+                    mask &= self.store.matches(field, condition, rows)
+                return mask
+        
+        rows, distances = self.spatial_index.nearest(lat, lon, k, row_filter)
+        return list(zip(self.store.take(rows), distances.tolist()))
+    
+    @instrumented(rows_out=len)
+    @memoized
+    def get_city_statistics(self, workers: Optional[int] = None) -> Dict[str, Dict[str, any]]:
+        if not self.has_data():
+            return {}
+        
+        return self._group_by(['cityname'], workers=workers,
+                              count=('cityname', 'size'), avg_bedrooms=('bedrooms', 'mean'),
+                              state=('state', 'first'), avg_price=('price', 'mean'),
+                              median_price=('price', 'median')).to_dict()
+    
+    @instrumented(rows_out=len)
+    @memoized
+    def get_state_statistics(self, workers: Optional[int] = None) -> Dict[str, Dict[str, any]]:
+        if not self.has_data():
+            return {}
+        
+        return self._group_by(['state'], workers=workers,
+                              count=('state', 'size'), avg_price=('price', 'mean'),
+                              median_price=('price', 'median'),
+                              unique_cities=('cityname', 'nunique')).to_dict()
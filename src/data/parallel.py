@@ -0,0 +1,473 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Handle both notebook and package imports
+try:
+    from .apartment_store import ApartmentStore
+    from .cache import MappedTextColumn
+    from .groupby import AGGREGATIONS, GroupedStats, _aggregate, _field_codes, _group_ids
+    from .query import Predicate, predicates_from_conditions
+    from .streaming import PriceStatsAccumulator
+    from ..algorithms.online_stats import DEFAULT_SKETCH_K, RunningStats
+except ImportError:
+    from data.apartment_store import ApartmentStore
+    from data.cache import MappedTextColumn
+    from data.groupby import AGGREGATIONS, GroupedStats, _aggregate, _field_codes, _group_ids
+    from data.query import Predicate, predicates_from_conditions
+    from data.streaming import PriceStatsAccumulator
+    from algorithms.online_stats import DEFAULT_SKETCH_K, RunningStats
+
+
+# Rows per partition. Partitions depend only on this, never on the worker
+# count, so every worker count (including the serial fallback) computes
+# exactly the same partial results and merges them in the same order
+DEFAULT_PARTITION_ROWS = 1 << 18
+
+
+class SharedColumns:
+    """
+    The numeric and categorical columns of a store, placed where worker
+    processes can map them without copying or pickling.
+
+    Columns that are already memory-mapped (a store read from the dataset
+    cache) are shared by file name; everything else is copied once into a
+    POSIX shared memory block. Only small metadata (block names, dtypes,
+    category tables) travels to the workers. Text columns are shared only
+    when asked for, in the cache's offsets/bytes layout, and `fields`
+    limits sharing to the columns an operation reads.
+    """
+
+    def __init__(self, store: ApartmentStore, include_text: bool = False,
+                 fields: Optional[Sequence[str]] = None):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        wanted = (lambda name: True) if fields is None else set(fields).__contains__
+        self.spec = {
+            'length': len(store),
+            'column_order': store.column_order,
+            'categories': {name: values for name, values in store.categories.items()
+                           if wanted(name)},
+            'numeric': {},
+            'codes': {},
+            'text': {},
+        }
+        try:
+            for name, values in store.numeric.items():
+                if wanted(name):
+                    self.spec['numeric'][name] = self._share(values)
+            for name, codes in store.codes.items():
+                if wanted(name):
+                    self.spec['codes'][name] = self._share(codes)
+            if include_text:
+                for name, values in store.text.items():
+                    if not wanted(name):
+                        continue
+                    column = values if isinstance(values, MappedTextColumn) else MappedTextColumn.encode(values)
+                    self.spec['text'][name] = tuple(self._share(part) for part in
+                                                    (column.offsets, column.data, column.nulls))
+        except BaseException:
+            self.close()
+            raise
+
+    def _share(self, values: np.ndarray) -> Tuple:
+        if _whole_file(values):
+            return ('mmap', str(values.filename), values.dtype.str, values.shape, values.offset)
+
+        values = np.ascontiguousarray(values)
+        block = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+        self._blocks.append(block)
+        np.ndarray(values.shape, values.dtype, buffer=block.buf)[...] = values
+        return ('shm', block.name, values.dtype.str, values.shape)
+
+    def close(self) -> None:
+        """Release the shared memory blocks (workers must be done with them)."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def _whole_file(values: np.ndarray) -> bool:
+    # Views of a memmap inherit its file name and offset, so check that the
+    # array covers the file's data to the end rather than some slice of it
+    filename = getattr(values, 'filename', None)
+    if not isinstance(values, np.memmap) or not filename or not values.flags.c_contiguous:
+        return False
+    try:
+        return values.offset + values.nbytes == os.path.getsize(filename)
+    except OSError:
+        return False
+
+
+def attach_store(spec: Dict[str, Any]) -> Tuple[ApartmentStore, List[shared_memory.SharedMemory]]:
+    """
+    Rebuild a read-only store over the columns described by SharedColumns.spec.
+
+    Returns:
+        (store, shared memory handles that must stay open while it is used)
+    """
+    handles = []
+
+    def attach(ref):
+        kind, location, dtype, shape = ref[:4]
+        if kind == 'mmap':
+            return np.memmap(location, dtype=dtype, mode='r', shape=shape, offset=ref[4])
+        block = _open_block(location)
+        handles.append(block)
+        values = np.ndarray(shape, dtype, buffer=block.buf)
+        values.flags.writeable = False
+        return values
+
+    numeric = {name: attach(ref) for name, ref in spec['numeric'].items()}
+    codes = {name: attach(ref) for name, ref in spec['codes'].items()}
+    text = {name: MappedTextColumn(*(attach(ref) for ref in refs))
+            for name, refs in spec['text'].items()}
+    column_order = [name for name in spec['column_order']
+                    if name in numeric or name in codes or name in text]
+    store = ApartmentStore(numeric, codes, dict(spec['categories']), text,
+                           spec['length'], column_order)
+    return store, handles
+
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The creating process owns the block; keep workers from unlinking it
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+# Store rebuilt over the shared columns, set once per worker by _init_worker
+_worker_store = None
+_worker_handles = []
+
+
+def _init_worker(spec: Dict[str, Any]) -> None:
+    global _worker_store, _worker_handles
+    _worker_store, _worker_handles = attach_store(spec)
+
+
+def _run_partition(task):
+    func, rows, args = task
+    return func(_worker_store, rows, *args)
+
+
+class ParallelExecutor:
+    """
+    Runs scans, filters and aggregations over row-range partitions of a
+    store in a process pool and merges the partial results.
+
+    Workers read the columns through SharedColumns rather than receiving
+    pickled rows. With one worker every partition runs in this process
+    instead, through the same partial and merge steps, so the results are
+    identical whatever the worker count. (Sums may still differ in the last
+    bits from the unpartitioned group_by, which adds in a different order.)
+
+    Use as a context manager, or call close(), to shut the pool down and
+    release the shared memory:
+
+        with ParallelExecutor(store, workers=8) as executor:
+            stats = executor.group_by(['state'], avg_price=('price', 'mean'))
+    """
+
+    def __init__(self, store: ApartmentStore, workers: Optional[int] = None,
+                 partition_rows: int = DEFAULT_PARTITION_ROWS, include_text: bool = False,
+                 fields: Optional[Sequence[str]] = None):
+        """
+        Args:
+            store: Store to process
+            workers: Process count; None or 1 runs every partition in this
+                process, so a pool is only started when asked for
+            partition_rows: Rows per partition
+            include_text: Also share text columns, for filters on text fields
+            fields: Share only these columns with the workers (default: all);
+                operations must then read no others
+        """
+        if partition_rows <= 0:
+            raise ValueError("partition_rows must be positive")
+        self.store = store
+        self.partition_rows = partition_rows
+        self.bounds = list(range(0, len(store), partition_rows)) + [len(store)]
+
+        self.workers = max(1, min(workers or 1, len(self.bounds) - 1))
+
+        self._shared = None
+        self._pool = None
+        if self.workers > 1:
+            self._shared = SharedColumns(store, include_text, fields)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._shared.spec,))
+
+    def __enter__(self) -> 'ParallelExecutor':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def partitions(self) -> List[Tuple[int, int]]:
+        """(start, stop) row range of every partition, in order."""
+        return list(zip(self.bounds[:-1], self.bounds[1:]))
+
+    def map_partitions(self, func: Callable, *args, rows: Optional[np.ndarray] = None) -> List[Any]:
+        """
+        Call func(store, partition_rows, *args) on every partition.
+
+        `func` and `args` must be picklable (a module-level function, not a
+        lambda) when running with several workers.
+
+        Args:
+            func: Partial computation over a partition's row positions
+            *args: Extra arguments passed to every call
+            rows: Optional row positions or boolean mask to restrict the
+                input; each partition receives its share, in order
+
+        Returns:
+            The partial results, in partition order
+        """
+        tasks = [(func, part, args) for part in self._partition_rows(rows)]
+        if self._pool is None:
+            return [func(self.store, part, *args) for _, part, _ in tasks]
+        return list(self._pool.map(_run_partition, tasks))
+
+    def _partition_rows(self, rows: Optional[np.ndarray]) -> List[np.ndarray]:
+        if rows is None:
+            return [np.arange(start, stop) for start, stop in self.partitions()]
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else np.sort(rows)
+        cuts = np.searchsorted(rows, self.bounds[1:-1])
+        return np.split(rows, cuts)
+
+    def filter_rows(self, *predicates: Predicate, **conditions) -> np.ndarray:
+        """
+        Row positions matching every predicate and condition, ascending.
+
+        Accepts the same arguments as DatasetManager.query_rows. Each
+        partition scans its own rows, so no index is built.
+        """
+        predicates = list(predicates) + predicates_from_conditions(conditions)
+        parts = self.map_partitions(_filter_partition, predicates)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def count(self, *predicates: Predicate, **conditions) -> int:
+        """Number of rows matching every predicate and condition."""
+        predicates = list(predicates) + predicates_from_conditions(conditions)
+        return int(sum(self.map_partitions(_count_partition, predicates)))
+
+    def running_stats(self, field: str, rows: Optional[np.ndarray] = None) -> RunningStats:
+        """Exact count, mean, variance, min and max of a numeric field."""
+        stats = RunningStats()
+        for part in self.map_partitions(_stats_partition, field, rows=rows):
+            stats.merge(part)
+        return stats
+
+    def price_stats(self, column: str = 'price', sketch_k: int = DEFAULT_SKETCH_K,
+                    rows: Optional[np.ndarray] = None) -> PriceStatsAccumulator:
+        """
+        Moments and a quantile sketch of a numeric field, built per partition
+        (each sketch seeded by the partition's first row) and merged in order.
+        """
+        parts = self.map_partitions(_accumulate_partition, column, sketch_k, rows=rows)
+        accumulator = PriceStatsAccumulator(column, sketch_k, seed=0)
+        for part in parts:
+            accumulator.merge(part)
+        return accumulator
+
+    def group_by(self, keys: Sequence[str], rows: Optional[np.ndarray] = None,
+                 **aggregations: Tuple[str, str]) -> GroupedStats:
+        """
+        Parallel equivalent of groupby.group_by, with the same arguments.
+
+        Every aggregation in AGGREGATIONS is supported. Counts, sums,
+        min/max and first values merge directly; medians and distinct
+        counts ship each partition's values per group, so they stay exact.
+        """
+        for field, how in aggregations.values():
+            if how not in AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation: {how!r} (expected one of {AGGREGATIONS})")
+        parts = self.map_partitions(_group_partition, list(keys), aggregations, rows=rows)
+        return _merge_groups(self.store, parts, aggregations)
+
+
+def _partition_mask(store: ApartmentStore, rows: np.ndarray,
+                    predicates: List[Predicate]) -> np.ndarray:
+    mask = np.ones(len(rows), dtype=bool)
+    for predicate in predicates:
+        if not mask.any():
+            break
+        candidates = np.flatnonzero(mask)
+        mask[candidates] = predicate.mask(store, rows[candidates])
+    return mask
+
+
+def _filter_partition(store: ApartmentStore, rows: np.ndarray,
+                      predicates: List[Predicate]) -> np.ndarray:
+    return rows[_partition_mask(store, rows, predicates)]
+
+
+def _count_partition(store: ApartmentStore, rows: np.ndarray,
+                     predicates: List[Predicate]) -> int:
+    return int(np.count_nonzero(_partition_mask(store, rows, predicates)))
+
+
+def _stats_partition(store: ApartmentStore, rows: np.ndarray, field: str) -> RunningStats:
+    stats = RunningStats()
+    if field in store.numeric:
+        stats.add_many(_valid(store.numeric[field][rows]))
+    return stats
+
+
+def _accumulate_partition(store: ApartmentStore, rows: np.ndarray, column: str,
+                          sketch_k: int) -> PriceStatsAccumulator:
+    seed = int(rows[0]) if len(rows) else 0
+    accumulator = PriceStatsAccumulator(column, sketch_k, seed=seed)
+    if column in store.numeric:
+        accumulator.add_many(store.numeric[column][rows])
+    return accumulator
+
+
+def _valid(values: np.ndarray) -> np.ndarray:
+    return values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+
+
+def _group_partition(store: ApartmentStore, rows: np.ndarray, keys: List[str],
+                     aggregations: Dict[str, Tuple[str, str]]) -> Tuple[List[Any], Dict[str, Any]]:
+    """Group one partition; every aggregate is left in a mergeable form."""
+    rows, groups, group_keys = _group_ids(store, keys, rows)
+    n_groups = len(group_keys)
+    partials, layouts = {}, {}
+
+    for name, (field, how) in aggregations.items():
+        if how == 'mean':
+            partials[name] = (_aggregate(store, field, 'sum', rows, groups, n_groups, layouts),
+                              _aggregate(store, field, 'count', rows, groups, n_groups, layouts))
+        elif how == 'median':
+            partials[name] = _group_values(store, field, rows, groups)
+        elif how == 'nunique':
+            partials[name] = _group_distinct(store, field, rows, groups)
+        else:
+            partials[name] = _aggregate(store, field, how, rows, groups, n_groups, layouts)
+    return group_keys, partials
+
+
+def _group_values(store: ApartmentStore, field: str, rows: np.ndarray,
+                  groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(group id, value) of every present numeric value, ascending by value."""
+    if not store.has_field(field):
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    if field not in store.numeric:
+        raise ValueError(f"Aggregation 'median' needs a numeric field, got {field!r}")
+    values = store.numeric[field][rows]
+    if values.dtype.kind == 'f':
+        present = ~np.isnan(values)
+        values, groups = values[present], groups[present]
+    # Sorting here, in the worker, leaves the merge only sorted runs to combine
+    order = np.argsort(values)
+    return groups[order], values[order]
+
+
+def _group_distinct(store: ApartmentStore, field: str, rows: np.ndarray,
+                    groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct (group id, value) pairs of a field."""
+    if not store.has_field(field):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=object)
+    codes, uniques = _field_codes(store, field, rows)
+    present = codes >= 0
+    if not len(uniques) or not present.any():
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=object)
+    pairs = np.unique(groups[present] * len(uniques) + codes[present])
+    return pairs // len(uniques), np.asarray(uniques, dtype=object)[pairs % len(uniques)]
+
+
+def _merge_groups(store: ApartmentStore, parts: List[Tuple[List[Any], Dict[str, Any]]],
+                  aggregations: Dict[str, Tuple[str, str]]) -> GroupedStats:
+    # Partitions are in row order, so numbering keys as they come keeps
+    # groups in order of first appearance
+    positions: Dict[Any, int] = {}
+    mappings = []
+    for group_keys, _ in parts:
+        mappings.append(np.array([positions.setdefault(key, len(positions)) for key in group_keys],
+                                 dtype=np.int64))
+    n_groups = len(positions)
+
+    columns = {}
+    for name, (field, how) in aggregations.items():
+        partials = [(mapping, partial[name]) for mapping, (_, partial) in zip(mappings, parts)]
+        columns[name] = _merge_aggregate(store, field, how, partials, n_groups)
+    return GroupedStats(list(positions), columns)
+
+
+def _merge_aggregate(store: ApartmentStore, field: str, how: str,
+                     partials: List[Tuple[np.ndarray, Any]], n_groups: int) -> np.ndarray:
+    if how in ('size', 'count'):
+        result = np.zeros(n_groups, dtype=np.int64)
+        for mapping, counts in partials:
+            result[mapping] += counts
+        return result
+
+    if how in ('sum', 'mean'):
+        sums, counts = np.zeros(n_groups), np.zeros(n_groups, dtype=np.int64)
+        for mapping, partial in partials:
+            part_sums, part_counts = partial if how == 'mean' else (partial, 0)
+            sums[mapping] += part_sums
+            counts[mapping] += part_counts
+        if how == 'sum':
+            return sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    if how in ('min', 'max'):
+        combine = np.fmin if how == 'min' else np.fmax
+        result = np.full(n_groups, np.nan)
+        for mapping, values in partials:
+            result[mapping] = combine(result[mapping], values)
+        return result
+
+    if how == 'first':
+        numeric = field in store.numeric or not store.has_field(field)
+        result = np.full(n_groups, np.nan if numeric else None, dtype=float if numeric else object)
+        for mapping, values in partials:
+            # A later partition only fills groups the earlier ones left empty
+            empty = np.isnan(result[mapping]) if numeric else \
+                np.array([value is None for value in result[mapping]], dtype=bool)
+            result[mapping[empty]] = values[empty]
+        return result
+
+    groups = np.concatenate([mapping[part_groups] for mapping, (part_groups, _) in partials]
+                            ) if partials else np.empty(0, dtype=np.int64)
+    values = np.concatenate([part_values for _, (_, part_values) in partials]
+                            ) if partials else np.empty(0)
+
+    if how == 'nunique':
+        if not len(values):
+            return np.zeros(n_groups, dtype=np.int64)
+        codes, uniques = pd.factorize(values)
+        pairs = np.unique(groups * len(uniques) + codes)
+        return np.bincount(pairs // len(uniques), minlength=n_groups)
+
+    # median: the midpoint rule of group_by over values laid out by group
+    counts = np.bincount(groups, minlength=n_groups)
+    result = np.full(n_groups, np.nan)
+    filled = counts > 0
+    if filled.any():
+        # Two full stable sorts: by value, then by group. Each partition's
+        # values arrive sorted, and the value sort (timsort for floats)
+        # finds those runs and merges them, so it costs O(n log partitions)
+        # rather than O(n log n); the group pass sorts from scratch
+        by_value = np.argsort(values, kind='stable')
+        groups = groups[by_value].astype(np.intp)
+        ordered = values[by_value][np.argsort(groups, kind='stable')].astype(float)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        first, count = starts[filled], counts[filled]
+        result[filled] = (ordered[first + (count - 1) // 2] + ordered[first + count // 2]) / 2
+    return result
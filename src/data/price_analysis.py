@@ -1,26 +1,67 @@
 import numpy as np
-from typing import List, Dict, Any
+import pandas as pd
+from typing import List, Dict, Any, Optional, Tuple
 
 # Handle both notebook and package imports
 try:
+    from .apartment_store import ApartmentStore
     from .dataset_manager import DatasetManager
+    from .indexes import sorted_index
+    from .streaming import PriceStatsAccumulator
+    from ..algorithms.online_stats import DEFAULT_SKETCH_K
     from ..models.apartment import Apartment
+    from ..utils.instrumentation import counted_rows, instrumented, single_row
+    from ..utils.memo import memoized
 except ImportError:
+    from data.apartment_store import ApartmentStore
     from data.dataset_manager import DatasetManager
+    from data.indexes import sorted_index
+    from data.streaming import PriceStatsAccumulator
+    from algorithms.online_stats import DEFAULT_SKETCH_K
     from models.apartment import Apartment
+    from utils.instrumentation import counted_rows, instrumented, single_row
+    from utils.memo import memoized
 
 
 class PriceAnalysis(DatasetManager):
-    def __init__(self, data_path: str = None):
-        super().__init__(data_path)
+    def __init__(self, data_path: str = None, session=None, sketch_k: int = DEFAULT_SKETCH_K,
+                 instrumentation=None):
+        super().__init__(data_path, session, instrumentation)
         self.price_stats = {}
+        self.sketch_k = sketch_k
+        self._price_accumulator = None
+        self._accumulated_store = None
     
+    @property
+    def price_accumulator(self) -> PriceStatsAccumulator:
+        """
+        Running price statistics (moments plus a quantile sketch) for the
+        loaded data. Built in one pass on first use, then kept current by
+        append_data() at O(1) per new listing instead of being recomputed.
+        """
+        if self._accumulated_store is not self.store:
+            accumulator = PriceStatsAccumulator(sketch_k=self.sketch_k, seed=0)
+            accumulator.add_many(self.store.valid_values('price'))
+            self._price_accumulator = accumulator
+            self._accumulated_store = self.store
+        return self._price_accumulator
+    
+    def append_data(self, new_data: pd.DataFrame) -> ApartmentStore:
+        previous = self.store
+        added = super().append_data(new_data)
+        if self._price_accumulator is not None and self._accumulated_store is previous:
+            self._price_accumulator.add_many(added.valid_values('price'))
+            self._accumulated_store = self.store
+        return added
+    
+    @instrumented(rows_out=single_row)
+    @memoized
     def get_summary(self) -> str:
-        if not self.apartments:
+        if not self.has_data():
             return "No apartments loaded for price analysis"
         
-        prices = [apt.price for apt in self.apartments if apt.price is not None]
-        if not prices:
+        prices = self.store.valid_values('price')
+        if not len(prices):
             return "No valid price data available"
         
         mean_price = np.mean(prices)
@@ -29,7 +70,7 @@ class PriceAnalysis(DatasetManager):
         max_price = np.max(prices)
         
         return f"""Price Analysis Summary:
-        Total Apartments: {len(self.apartments)}
+        Total Apartments: {len(self.store)}
         Valid Price Records: {len(prices)}
         Mean Price: ${mean_price:,.2f}
         Median Price: ${median_price:,.2f}
@@ -37,66 +78,122 @@ class PriceAnalysis(DatasetManager):
         Max Price: ${max_price:,.2f}
         Price Range: ${max_price - min_price:,.2f}"""
     
-    def compute_price_statistics(self) -> Dict[str, float]:
-        if not self.apartments:
+    def _valid_prices(self) -> np.ndarray:
+        if not self.has_data():
             raise ValueError("No apartments loaded")
         
-        prices = [apt.price for apt in self.apartments if apt.price is not None]
-        if not prices:
+        prices = self.store.valid_values('price')
+        if not len(prices):
             raise ValueError("No valid price data")
-        
-        self.price_stats = {
-            'mean': np.mean(prices),
-            'median': np.median(prices),
-            'std': np.std(prices),
-            'min': np.min(prices),
-            'max': np.max(prices),
-            'q25': np.percentile(prices, 25),
-            'q75': np.percentile(prices, 75),
-            'count': len(prices)
-        }
-        
-        return self.price_stats
+        return prices
     
-    def get_price_percentiles(self, percentiles: List[float] = [10, 25, 50, 75, 90]) -> Dict[float, float]:
-        if not self.apartments:
+    def _accumulated_prices(self) -> PriceStatsAccumulator:
+        if not self.has_data():
             raise ValueError("No apartments loaded")
         
-        prices = [apt.price for apt in self.apartments if apt.price is not None]
-        if not prices:
+        accumulator = self.price_accumulator
+        if not accumulator.count:
             raise ValueError("No valid price data")
-        
-        return {p: np.percentile(prices, p) for p in percentiles}
+        return accumulator
     
-    def filter_by_price_range(self, min_price: float, max_price: float) -> List[Apartment]:
-        if not self.apartments:
-            return []
+    @instrumented(rows_out=single_row)
+    def compute_price_statistics(self, approximate: bool = False) -> Dict[str, float]:
+        """
+        Summary statistics of price.
         
-        return [apt for apt in self.apartments 
-                if apt.price is not None and min_price <= apt.price <= max_price]
+        Args:
+            approximate: Read median and quartiles from the running quantile
+                sketch (see get_percentile_bounds for its error) instead of
+                the loaded prices; mean, std, min, max and count stay exact
+        """
+        self.price_stats = self._price_statistics(approximate)
+        return self.price_stats
     
-    def get_price_by_bedrooms(self) -> Dict[int, Dict[str, float]]:
-        if not self.apartments:
-            return {}
+    @memoized
+    def _price_statistics(self, approximate: bool) -> Dict[str, float]:
+        if not approximate:
+            prices = self._valid_prices()
+            return {
+                'mean': np.mean(prices),
+                'median': np.median(prices),
+                'std': np.std(prices),
+                'min': np.min(prices),
+                'max': np.max(prices),
+                'q25': np.percentile(prices, 25),
+                'q75': np.percentile(prices, 75),
+                'count': len(prices)
+            }
         
-        bedroom_prices = {}
+        result = self._accumulated_prices().result()
+        result.pop('rank_error')
+        return result
+    
+    @instrumented(rows_out=len)
+    @memoized
+    def get_price_percentiles(self, percentiles: List[float] = [10, 25, 50, 75, 90],
+                              approximate: bool = False) -> Dict[float, float]:
+        if approximate:
+            values = self._accumulated_prices().percentiles(percentiles)
+        else:
+            values = np.percentile(self._valid_prices(), percentiles)
+        return dict(zip(percentiles, values))
+    
+    @instrumented(rows_out=len)
+    @memoized
+    def get_percentile_bounds(self, percentiles: List[float] = [10, 25, 50, 75, 90]
+                              ) -> Dict[float, Tuple[float, float]]:
+        """
+        Price range each sketched percentile is guaranteed to lie in (with
+        about 99% confidence), from the sketch's rank error. The bounds
+        collapse to the exact value while the sketch still holds every price.
+        """
+        sketch = self._accumulated_prices().sketch
+        error = sketch.rank_error
+        qs = np.asarray(percentiles, dtype=float) / 100.0
+        lows = sketch.quantiles(np.clip(qs - error, 0.0, 1.0))
+        highs = sketch.quantiles(np.clip(qs + error, 0.0, 1.0))
+        return {p: (low, high) for p, low, high in zip(percentiles, lows, highs)}
+    
+    @instrumented
+    def filter_by_price_range(self, min_price: float, max_price: float,
+                              row_order: bool = True) -> List[Apartment]:
+        """
+        Apartments priced within [min_price, max_price], in dataset order,
+        read from the price index in O(log n + k log k).
         
-        for apt in self.apartments:
-            if apt.price is not None and apt.bedrooms is not None:
-                bedrooms = int(apt.bedrooms) if apt.bedrooms == apt.bedrooms else apt.bedrooms
-                if bedrooms not in bedroom_prices:
-                    bedroom_prices[bedrooms] = []
-                bedroom_prices[bedrooms].append(apt.price)
+        Args:
+            min_price, max_price: Inclusive price bounds
+            row_order: Pass False to get them cheapest first (equal prices
+                in dataset order) in O(log n + k), skipping the sort
+        """
+        if not self.has_data():
+            return []
         
-        stats = {}
-        for bedrooms, prices in bedroom_prices.items():
-            if prices:
-                stats[bedrooms] = {
-                    'mean': np.mean(prices),
-                    'median': np.median(prices),
-                    'count': len(prices),
-                    'min': np.min(prices),
-                    'max': np.max(prices)
-                }
+        rows = sorted_index(self.store, 'price').range(min_price, max_price, row_order=row_order)
+        return self.store.take(rows)
+    
+    @instrumented(rows_out=counted_rows)
+    def count_in_price_range(self, min_price: float, max_price: float) -> int:
+        if not self.has_data():
+            return 0
+        return sorted_index(self.store, 'price').count(min_price, max_price)
+    
+    @instrumented(rows_out=len)
+    @memoized
+    def get_price_by_bedrooms(self, workers: Optional[int] = None) -> Dict[int, Dict[str, float]]:
+        if not self.has_data() or not self.store.has_field('bedrooms'):
+            return {}
         
-        return stats
\ No newline at end of file
+        valid = self.store.valid_mask('price') & self.store.valid_mask('bedrooms')
+        # Truncate before grouping, as int() did per apartment: 1.5 bedrooms
+        # pool with the 1-bedroom listings
+        bedrooms = self.store.column('bedrooms')
+        if bedrooms.dtype.kind == 'f':
+            bedrooms = np.trunc(bedrooms)
+        whole = ApartmentStore({'price': self.store.column('price'), 'bedrooms': bedrooms},
+                               {}, {}, {}, len(self.store))
+        stats = self._group_by(['bedrooms'], rows=valid, workers=workers, store=whole,
+                               mean=('price', 'mean'), median=('price', 'median'),
+                               count=('price', 'count'), min=('price', 'min'),
+                               max=('price', 'max'))
+        return {int(bedrooms): group_stats for bedrooms, group_stats in stats.to_dict().items()}
@@ -0,0 +1,252 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Handle both notebook and package imports
+try:
+    from ..algorithms.spatial import haversine_km
+    from .apartment_store import ApartmentStore
+    from .indexes import fold_key, hash_index, sorted_index, spatial_index
+except ImportError:
+    from algorithms.spatial import haversine_km
+    from data.apartment_store import ApartmentStore
+    from data.indexes import fold_key, hash_index, sorted_index, spatial_index
+
+
+class Predicate(ABC):
+    """
+    One condition of a conjunctive query.
+
+    A predicate can produce its matching rows on its own (ideally from an
+    index), test a given set of candidate rows, and estimate how many rows
+    it matches so the planner can order predicates by selectivity.
+    """
+
+    def estimate(self, store: ApartmentStore) -> int:
+        """Expected (or upper bound on the) number of matching rows."""
+        return len(store)
+
+    def rows(self, store: ApartmentStore) -> np.ndarray:
+        """All matching row positions, ascending."""
+        return np.flatnonzero(self.mask(store, None))
+
+    @abstractmethod
+    def mask(self, store: ApartmentStore, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Boolean mask over `rows` (every row if None) of the rows that match."""
+
+    def indexed(self, store: ApartmentStore) -> bool:
+        """Whether rows() is answered from an index rather than a scan."""
+        return False
+
+
+class Where(Predicate):
+    """Any condition accepted by ApartmentStore.matches, evaluated by scanning."""
+
+    def __init__(self, field: str, condition: Any):
+        self.field = field
+        self.condition = condition
+
+    def mask(self, store, rows):
+        return store.matches(self.field, self.condition, rows)
+
+    def __repr__(self):
+        return f"Where({self.field!r}, {self.condition!r})"
+
+
+class Equals(Where):
+    """field == value; case-insensitive for categorical fields."""
+
+    def __init__(self, field: str, value: Any):
+        super().__init__(field, value)
+
+    def indexed(self, store):
+        return self.field in store.codes or self.field in store.numeric
+
+    def estimate(self, store):
+        if self.field in store.codes:
+            return hash_index(store, self.field).count(self.condition)
+        if self.field in store.numeric:
+            return sorted_index(store, self.field).count(self.condition, self.condition)
+        return len(store)
+
+    def rows(self, store):
+        if self.field in store.codes:
+            return hash_index(store, self.field).lookup(self.condition)
+        if self.field in store.numeric:
+            return sorted_index(store, self.field).equal(self.condition)
+        return super().rows(store)
+
+    def __repr__(self):
+        return f"Equals({self.field!r}, {self.condition!r})"
+
+
+class OneOf(Where):
+    """field is any of `values`; case-insensitive for categorical fields."""
+
+    def __init__(self, field: str, values: Sequence[Any]):
+        super().__init__(field, set(values))
+
+    def indexed(self, store):
+        return self.field in store.codes or self.field in store.numeric
+
+    def estimate(self, store):
+        if self.field in store.codes:
+            index = hash_index(store, self.field)
+            return sum(index.count(value) for value in self._distinct())
+        if self.field in store.numeric:
+            index = sorted_index(store, self.field)
+            return sum(index.count(value, value) for value in self.condition)
+        return len(store)
+
+    def rows(self, store):
+        if self.field in store.codes:
+            index = hash_index(store, self.field)
+            parts = [index.lookup(value) for value in self._distinct()]
+        elif self.field in store.numeric:
+            index = sorted_index(store, self.field)
+            parts = [index.equal(value) for value in self.condition]
+        else:
+            return super().rows(store)
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+    def _distinct(self):
+        # "TX" and "tx" name the same hash group; look it up once
+        folded = {}
+        for value in self.condition:
+            folded.setdefault(fold_key(value), value)
+        return list(folded.values())
+
+    def __repr__(self):
+        return f"OneOf({self.field!r}, {sorted(self.condition, key=repr)!r})"
+
+
+class Between(Where):
+    """low <= field <= high on a numeric field; None leaves a side open."""
+
+    def __init__(self, field: str, low: Any = None, high: Any = None):
+        super().__init__(field, (low, high))
+        self.low = low
+        self.high = high
+
+    def indexed(self, store):
+        return self.field in store.numeric
+
+    def estimate(self, store):
+        if self.field in store.numeric:
+            return sorted_index(store, self.field).count(self.low, self.high)
+        return len(store)
+
+    def rows(self, store):
+        if self.field in store.numeric:
+            # Plans promise dataset order, so this scan opts into the row sort
+            return sorted_index(store, self.field).range(self.low, self.high, row_order=True)
+        return super().rows(store)
+
+    def __repr__(self):
+        return f"Between({self.field!r}, {self.low!r}, {self.high!r})"
+
+
+class Near(Predicate):
+    """Within `radius_km` of (lat, lon), by great-circle distance."""
+
+    def __init__(self, lat: float, lon: float, radius_km: float):
+        self.lat = lat
+        self.lon = lon
+        self.radius_km = radius_km
+
+    def indexed(self, store):
+        return True
+
+    def estimate(self, store):
+        # Points in the grid cells the circle touches; an upper bound
+        return spatial_index(store).estimate_radius(self.lat, self.lon, self.radius_km)
+
+    def rows(self, store):
+        return spatial_index(store).query_radius(self.lat, self.lon, self.radius_km)
+
+    def mask(self, store, rows):
+        lats, lons = store.column('latitude'), store.column('longitude')
+        if rows is not None:
+            lats, lons = lats[rows], lons[rows]
+        # NaN coordinates compare False, so rows without a location never match
+        return haversine_km(self.lat, self.lon, lats, lons) <= self.radius_km
+
+    def __repr__(self):
+        return f"Near({self.lat!r}, {self.lon!r}, {self.radius_km!r})"
+
+
+def predicates_from_conditions(conditions: Dict[str, Any]) -> List[Predicate]:
+    """
+    Turn a {field: condition} mapping into predicates.
+
+    Conditions take the ApartmentStore.matches forms: a scalar (equality), a
+    (low, high) tuple (inclusive range), a list or set (membership) or a
+    callable (custom mask). The key 'near' takes a (lat, lon, radius_km)
+    tuple.
+    """
+    predicates = []
+    for field, condition in conditions.items():
+        if field == 'near':
+            predicates.append(Near(*condition))
+        elif isinstance(condition, Predicate):
+            predicates.append(condition)
+        elif callable(condition):
+            predicates.append(Where(field, condition))
+        elif isinstance(condition, tuple):
+            predicates.append(Between(field, *condition))
+        elif isinstance(condition, (list, set, frozenset)):
+            predicates.append(OneOf(field, condition))
+        else:
+            predicates.append(Equals(field, condition))
+    return predicates
+
+
+def plan_query(store: ApartmentStore, predicates: Sequence[Predicate]
+               ) -> List[Tuple[Predicate, int]]:
+    """Predicates with their estimated match counts, most selective first."""
+    estimates = [(predicate, predicate.estimate(store)) for predicate in predicates]
+    # Index-backed predicates win ties: their rows come without a scan
+    return sorted(estimates, key=lambda pair: (pair[1], not pair[0].indexed(store)))
+
+
+def run_query(store: ApartmentStore, predicates: Sequence[Predicate],
+              explain: Optional[List[Dict[str, Any]]] = None) -> np.ndarray:
+    """
+    Rows matching every predicate, in ascending row order.
+
+    The most selective predicate produces the initial candidate rows. Each
+    remaining predicate is then applied in order of selectivity, either by
+    intersecting its indexed row set (when that set is smaller than the
+    candidates) or by testing it as a mask over the candidates only, so no
+    predicate after the first ever touches the whole dataset.
+
+    Args:
+        store: Store to query
+        predicates: Conditions that must all hold
+        explain: Optional list that receives one dict per executed step
+            (predicate, estimate, strategy, rows_out)
+
+    Returns:
+        Array of row positions; pass to store.take() for Apartments
+    """
+    if not predicates:
+        return np.arange(len(store))
+
+    rows = None
+    for predicate, estimate in plan_query(store, predicates):
+        if rows is None:
+            strategy = 'index' if predicate.indexed(store) else 'scan'
+            rows = predicate.rows(store)
+        elif not len(rows):
+            break
+        elif predicate.indexed(store) and estimate < len(rows):
+            strategy = 'intersect'
+            rows = np.intersect1d(rows, predicate.rows(store), assume_unique=True)
+        else:
+            strategy = 'filter'
+            rows = rows[predicate.mask(store, rows)]
+
+        if explain is not None:
+            explain.append({'predicate': repr(predicate), 'estimate': estimate,
+                            'strategy': strategy, 'rows_out': len(rows)})
+    return rows
@@ -0,0 +1,100 @@
+import os
+import threading
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Handle both notebook and package imports
+try:
+    from ..models.apartment import Apartment
+    from .apartment_store import ApartmentStore
+    from .dataset_manager import DatasetManager
+except ImportError:
+    from models.apartment import Apartment
+    from data.apartment_store import ApartmentStore
+    from data.dataset_manager import DatasetManager
+
+
+class DatasetSession:
+    """
+    One loaded and cleaned dataset shared by every analyzer in the process.
+
+    Analyzers attach to a session instead of loading the file themselves, so
+    the store (and any indexes built on it) exists once no matter how many
+    analyzer types are in use.
+    """
+
+    def __init__(self, data_path: str, use_cache: bool = False,
+                 cache_dir: Optional[str] = None):
+        self.data_path = data_path
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self._loader = DatasetManager(data_path)
+        self._apartments = None
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loader.store is not None
+
+    def load(self) -> 'DatasetSession':
+        """Load and clean the dataset once; later calls are no-ops."""
+        with self._lock:
+            if not self.loaded:
+                if self.use_cache:
+                    self._loader.load_cached(cache_dir=self.cache_dir)
+                else:
+                    self._loader.load_data()
+                    self._loader.clean_data()
+                    # The raw frame is not needed once the cleaned one exists
+                    self._loader.raw_data = None
+        return self
+
+    @property
+    def store(self) -> ApartmentStore:
+        return self.load()._loader.store
+
+    @property
+    def cleaned_data(self) -> pd.DataFrame:
+        with self._lock:
+            return self.load()._loader.cleaned_data
+
+    @property
+    def load_report(self):
+        return self._loader.load_report
+
+    def get_apartments(self) -> List[Apartment]:
+        """Materialize the Apartment list once and share it between analyzers."""
+        with self._lock:
+            if self._apartments is None:
+                self._apartments = self.store.to_apartments()
+            return self._apartments
+
+    def analyzer(self, analyzer_cls=DatasetManager, **kwargs):
+        """Create an analyzer (e.g. PriceAnalysis) attached to this session."""
+        return analyzer_cls(self.data_path, session=self, **kwargs)
+
+    def __repr__(self):
+        state = f"rows={len(self._loader.store)}" if self.loaded else "not loaded"
+        return f"DatasetSession({self.data_path!r}, {state})"
+
+
+_sessions: Dict[Tuple, DatasetSession] = {}
+_registry_lock = threading.Lock()
+
+
+def get_session(data_path: str, use_cache: bool = False,
+                cache_dir: Optional[str] = None) -> DatasetSession:
+    """Return the process-wide session for a path and loading options."""
+    key = (os.path.abspath(data_path), use_cache,
+           os.path.abspath(cache_dir) if cache_dir else None)
+    with _registry_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = DatasetSession(data_path, use_cache, cache_dir)
+        return session
+
+
+def clear_sessions() -> None:
+    """Drop every registered session so their data can be garbage collected."""
+    with _registry_lock:
+        _sessions.clear()
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Handle both notebook and package imports
+try:
+    from ..algorithms.online_stats import DEFAULT_SKETCH_K, QuantileSketch, RunningStats
+    from .cleaning import clean_frame
+    from .encoding import REPLACE_AND_COUNT, detect_encoding
+except ImportError:
+    from algorithms.online_stats import DEFAULT_SKETCH_K, QuantileSketch, RunningStats
+    from data.cleaning import clean_frame
+    from data.encoding import REPLACE_AND_COUNT, detect_encoding
+
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def read_chunks(path: str, chunksize: int = DEFAULT_CHUNK_ROWS,
+                encoding: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """Read the semicolon CSV in chunks of at most `chunksize` rows."""
+    encoding = encoding or detect_encoding(path)
+    reader = pd.read_csv(path, sep=';', encoding=encoding,
+                         encoding_errors=REPLACE_AND_COUNT, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def clean_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Apply the standard cleaning rules to each chunk as it arrives."""
+    for chunk in chunks:
+        yield clean_frame(chunk)
+
+
+def _with_columns(chunk: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """The chunk with any of `columns` it lacks added as all-missing."""
+    missing = [column for column in columns if column not in chunk.columns]
+    if not missing:
+        return chunk
+    return chunk.assign(**{column: np.nan for column in missing})
+
+
+def run_aggregations(chunks: Iterable[pd.DataFrame], accumulators: List[Any]) -> List[Any]:
+    """
+    Feed every chunk to every accumulator in a single pass over the stream.
+
+    Only one chunk is resident at a time; accumulators keep state whose size
+    depends on the number of groups, not the number of rows.
+
+    Returns:
+        The accumulators' results, in the order the accumulators were given
+    """
+    for chunk in chunks:
+        for accumulator in accumulators:
+            accumulator.update(chunk)
+    return [accumulator.result() for accumulator in accumulators]
+
+
+class PriceStatsAccumulator:
+    """
+    Count, mean, standard deviation, min, max and quantiles of price.
+
+    Moments are exact (RunningStats); quantiles come from a KLL sketch whose
+    rank error is reported alongside them. Values can be added one at a
+    time or a chunk at a time, and accumulators from separate partitions or
+    worker processes combine with merge().
+    """
+
+    def __init__(self, column: str = 'price', sketch_k: int = DEFAULT_SKETCH_K,
+                 seed: Optional[int] = None):
+        self.column = column
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(sketch_k, seed=seed)
+
+    @property
+    def count(self) -> int:
+        return self.stats.count
+
+    def add(self, value: float) -> None:
+        """Add a single price in O(1) (amortized for the sketch)."""
+        if value == value:  # skip NaN
+            self.stats.add(value)
+            self.sketch.add(value)
+
+    def add_many(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.stats.add_many(values)
+            self.sketch.add_many(values)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.add_many(pd.to_numeric(chunk[self.column], errors='coerce').to_numpy(dtype=float))
+
+    def merge(self, other: 'PriceStatsAccumulator') -> 'PriceStatsAccumulator':
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def percentiles(self, percentiles: List[float]) -> np.ndarray:
+        return self.sketch.percentiles(percentiles)
+
+    def result(self) -> Dict[str, float]:
+        if not self.count:
+            raise ValueError("No valid price data")
+        median, q25, q75 = self.percentiles([50, 25, 75])
+        return {
+            'mean': self.stats.mean,
+            'median': median,
+            'std': self.stats.std(),
+            'min': self.stats.min,
+            'max': self.stats.max,
+            'q25': q25,
+            'q75': q75,
+            'count': self.count,
+            'rank_error': self.sketch.rank_error
+        }
+
+
+class CityStatsAccumulator:
+    """
+    Per-city listing counts and averages over a stream.
+
+    Mirrors LocationAnalysis.get_city_statistics except for the median,
+    which cannot be computed exactly in bounded memory.
+    """
+
+    def __init__(self):
+        self.groups = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        # State, price and bedrooms are optional; absent ones count as missing
+        chunk = _with_columns(chunk, ('state', 'price', 'bedrooms'))
+        chunk = chunk[chunk['cityname'].notna() & (chunk['cityname'] != '')]
+        summary = chunk.groupby('cityname', sort=False).agg(
+            count=('cityname', 'size'), state=('state', 'first'),
+            price_sum=('price', 'sum'), price_n=('price', 'count'),
+            bed_sum=('bedrooms', 'sum'), bed_n=('bedrooms', 'count'))
+
+        for city, row in zip(summary.index, summary.itertuples(index=False)):
+            totals = self.groups.get(city)
+            if totals is None:
+                self.groups[city] = [row.count, row.state, row.price_sum, row.price_n,
+                                     row.bed_sum, row.bed_n]
+                continue
+            totals[0] += row.count
+            totals[2] += row.price_sum
+            totals[3] += row.price_n
+            totals[4] += row.bed_sum
+            totals[5] += row.bed_n
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            city: {
+                'count': int(count),
+                'avg_bedrooms': bed_sum / bed_n if bed_n else None,
+                'state': state,
+                'avg_price': price_sum / price_n if price_n else None
+            }
+            for city, (count, state, price_sum, price_n, bed_sum, bed_n) in self.groups.items()
+        }
+
+
+class StateStatsAccumulator:
+    """Per-state listing counts, average price and distinct cities over a stream."""
+
+    def __init__(self):
+        self.groups = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        chunk = chunk[chunk['state'].notna() & (chunk['state'] != '')]
+        summary = chunk.groupby('state', sort=False).agg(
+            count=('state', 'size'), price_sum=('price', 'sum'), price_n=('price', 'count'))
+        cities = chunk[chunk['cityname'] != ''].groupby('state', sort=False)['cityname'].unique()
+
+        for state, row in zip(summary.index, summary.itertuples(index=False)):
+            totals = self.groups.setdefault(state, [0, 0.0, 0, set()])
+            totals[0] += row.count
+            totals[1] += row.price_sum
+            totals[2] += row.price_n
+            if state in cities.index:
+                totals[3].update(cities[state])
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            state: {
+                'count': int(count),
+                'avg_price': price_sum / price_n if price_n else None,
+                'unique_cities': len(city_names)
+            }
+            for state, (count, price_sum, price_n, city_names) in self.groups.items()
+        }
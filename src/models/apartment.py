@@ -1,37 +1,114 @@
+# Large free-text fields that store-backed apartments read on access
+LAZY_TEXT_FIELDS = ('title', 'body', 'amenities', 'address')
+
+# Numeric fields that store-backed apartments leave unboxed in the backing
+# arrays until first read (then keep, so repeated comparisons stay cheap)
+LAZY_NUMERIC_FIELDS = ('id', 'bathrooms', 'bedrooms', 'price', 'square_feet',
+                       'latitude', 'longitude', 'time')
+
+_UNLOADED = object()
+
+
 class Apartment:
-    def __init__(self, id=None, category=None, title=None, body=None, amenities=None, 
+    __slots__ = ('_id', 'category', '_title', '_body', '_amenities', '_bathrooms',
+                 '_bedrooms', 'currency', 'fee', 'has_photo', 'pets_allowed',
+                 '_price', 'price_display', 'price_type', '_square_feet', '_address',
+                 'cityname', 'state', '_latitude', '_longitude', 'source', '_time',
+                 '_backing', '_row')
+
+    def __init__(self, id=None, category=None, title=None, body=None, amenities=None,
                  bathrooms=None, bedrooms=None, currency=None, fee=None, has_photo=None,
                  pets_allowed=None, price=None, price_display=None, price_type=None,
                  square_feet=None, address=None, cityname=None, state=None,
-                 latitude=None, longitude=None, source=None, time=None):
-        self.id = id
+                 latitude=None, longitude=None, source=None, time=None,
+                 _backing=None, _row=None):
+        # When a backing dataset is given, text and numeric fields left as
+        # None are fetched from it on access instead of being held per instance
+        self._backing = _backing
+        self._row = _row
+        lazy = _UNLOADED if _backing is not None else None
+
+        self._id = id if id is not None else lazy
         self.category = category
-        self.title = title
-        self.body = body
-        self.amenities = amenities
-        self.bathrooms = bathrooms
-        self.bedrooms = bedrooms
+        self._title = title if title is not None else lazy
+        self._body = body if body is not None else lazy
+        self._amenities = amenities if amenities is not None else lazy
+        self._bathrooms = bathrooms if bathrooms is not None else lazy
+        self._bedrooms = bedrooms if bedrooms is not None else lazy
         self.currency = currency
         self.fee = fee
         self.has_photo = has_photo
         self.pets_allowed = pets_allowed
-        self.price = price
+        self._price = price if price is not None else lazy
         self.price_display = price_display
         self.price_type = price_type
-        self.square_feet = square_feet
-        self.address = address
+        self._square_feet = square_feet if square_feet is not None else lazy
+        self._address = address if address is not None else lazy
         self.cityname = cityname
         self.state = state
-        self.latitude = latitude
-        self.longitude = longitude
+        self._latitude = latitude if latitude is not None else lazy
+        self._longitude = longitude if longitude is not None else lazy
         self.source = source
-        self.time = time
-    
+        self._time = time if time is not None else lazy
+
+    def _text(self, name):
+        value = getattr(self, '_' + name)
+        if value is _UNLOADED:
+            # Not cached: the backing column already holds the string
+            return self._backing.get_value(name, self._row)
+        return value
+
+    def _number(self, name):
+        value = getattr(self, '_' + name)
+        if value is _UNLOADED:
+            value = self._backing.get_value(name, self._row)
+            setattr(self, '_' + name, value)
+        return value
+
+    title = property(lambda self: self._text('title'),
+                     lambda self, value: setattr(self, '_title', value))
+    body = property(lambda self: self._text('body'),
+                    lambda self, value: setattr(self, '_body', value))
+    amenities = property(lambda self: self._text('amenities'),
+                         lambda self, value: setattr(self, '_amenities', value))
+    address = property(lambda self: self._text('address'),
+                       lambda self, value: setattr(self, '_address', value))
+
+    id = property(lambda self: self._number('id'),
+                  lambda self, value: setattr(self, '_id', value))
+    bathrooms = property(lambda self: self._number('bathrooms'),
+                         lambda self, value: setattr(self, '_bathrooms', value))
+    bedrooms = property(lambda self: self._number('bedrooms'),
+                        lambda self, value: setattr(self, '_bedrooms', value))
+    price = property(lambda self: self._number('price'),
+                     lambda self, value: setattr(self, '_price', value))
+    square_feet = property(lambda self: self._number('square_feet'),
+                           lambda self, value: setattr(self, '_square_feet', value))
+    latitude = property(lambda self: self._number('latitude'),
+                        lambda self, value: setattr(self, '_latitude', value))
+    longitude = property(lambda self: self._number('longitude'),
+                         lambda self, value: setattr(self, '_longitude', value))
+    time = property(lambda self: self._number('time'),
+                    lambda self, value: setattr(self, '_time', value))
+
+    def __getstate__(self):
+        # Materialize lazy fields so a pickled apartment does not drag its
+        # whole backing dataset along
+        state = {name: getattr(self, name.lstrip('_')) for name in self.__slots__
+                 if name not in ('_backing', '_row')}
+        state['_backing'] = None
+        state['_row'] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     def get_summary(self):
         return f"Apartment ID: {self.id}\nPrice: {self.price_display}\nSize: {self.square_feet} sq ft\nLocation: {self.cityname}, {self.state}\nBedrooms: {self.bedrooms}\nBathrooms: {self.bathrooms}"
-    
+
     def __str__(self):
         return self.get_summary()
-    
+
     def __repr__(self):
-        return f"Apartment(id={self.id}, price={self.price}, city='{self.cityname}')"
\ No newline at end of file
+        return f"Apartment(id={self.id}, price={self.price}, city='{self.cityname}')"
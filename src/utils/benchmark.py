@@ -0,0 +1,183 @@
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# A median this much slower than the baseline counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+# Differences below this many seconds are treated as timer noise
+DEFAULT_MIN_DELTA = 1e-4
+
+
+class Measurement(NamedTuple):
+    """Timings of one benchmark case at one dataset size."""
+    name: str
+    size: int
+    times: List[float]
+    peak_bytes: Optional[int] = None
+
+    @property
+    def median(self) -> float:
+        return float(np.median(self.times))
+
+    @property
+    def p95(self) -> float:
+        return float(np.percentile(self.times, 95))
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def mean(self) -> float:
+        return float(np.mean(self.times))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'size': self.size, 'repeat': len(self.times),
+                'median': self.median, 'p95': self.p95, 'min': self.min,
+                'mean': self.mean, 'peak_bytes': self.peak_bytes, 'times': self.times}
+
+
+class Comparison(NamedTuple):
+    """A measurement's median against the baseline's for the same case."""
+    name: str
+    size: int
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float('inf')
+
+    def regressed(self, threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+                  min_delta: float = DEFAULT_MIN_DELTA) -> bool:
+        return (self.current > self.baseline * (1 + threshold)
+                and self.current - self.baseline > min_delta)
+
+
+def measure(func: Callable, *args, name: str = '', size: int = 0,
+            repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+            setup: Optional[Callable[[], Tuple]] = None,
+            trace_memory: bool = True, **kwargs) -> Measurement:
+    """
+    Time func(*args, **kwargs) with time.perf_counter.
+
+    The function runs `warmup` times untimed (filling caches and lazily
+    built indexes), then `repeat` times timed with garbage collection
+    paused, as timeit does. Peak memory is taken from one further run under
+    tracemalloc, so tracing never inflates the timings. Results are
+    discarded as soon as each run finishes.
+
+    Args:
+        func: Code to time
+        *args, **kwargs: Passed to every call
+        name, size: Labels for the measurement
+        repeat: Timed runs
+        warmup: Untimed runs before the timed ones
+        setup: Optional callable run untimed before every call; its return
+            value (a tuple) replaces `args` for that call
+        trace_memory: Record peak traced memory of a single run
+
+    Returns:
+        Measurement with every timed run
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+
+    def call():
+        call_args = setup() if setup is not None else args
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func(*call_args, **kwargs)
+            return time.perf_counter() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    for _ in range(warmup):
+        call()
+    times = [call() for _ in range(repeat)]
+
+    peak = None
+    if trace_memory:
+        peak = peak_memory(func, *(setup() if setup is not None else args), **kwargs)
+    return Measurement(name, size, times, peak)
+
+
+def peak_memory(func: Callable, *args, **kwargs) -> int:
+    """Peak bytes allocated (as seen by tracemalloc) during one call."""
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        func(*args, **kwargs)
+        return max(0, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+
+def environment() -> Dict[str, Any]:
+    """Where a set of results was measured, stored alongside them."""
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+    }
+
+
+def write_results(measurements: Iterable[Measurement], path: str,
+                  meta: Optional[Dict[str, Any]] = None) -> None:
+    """Save measurements as JSON (with the environment they ran in)."""
+    document = {'meta': {**environment(), **(meta or {})},
+                'results': [m.to_dict() for m in measurements]}
+    with open(path, 'w') as handle:
+        json.dump(document, handle, indent=2)
+
+
+def load_results(path: str) -> Dict[Tuple[str, int], Dict[str, Any]]:
+    """Read a results file into {(name, size): result}."""
+    with open(path) as handle:
+        document = json.load(handle)
+    return {(result['name'], result['size']): result for result in document['results']}
+
+
+def compare_to_baseline(measurements: Iterable[Measurement],
+                        baseline: Dict[Tuple[str, int], Dict[str, Any]]) -> List[Comparison]:
+    """Pair each measurement with the baseline's median for the same case."""
+    return [Comparison(m.name, m.size, baseline[(m.name, m.size)]['median'], m.median)
+            for m in measurements if (m.name, m.size) in baseline]
+
+
+def format_results(measurements: Iterable[Measurement],
+                   comparisons: Optional[List[Comparison]] = None,
+                   threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> str:
+    """A plain-text table of medians, p95s and peaks, with baseline ratios."""
+    against = {(c.name, c.size): c for c in comparisons or []}
+    lines = [f"{'benchmark':<28} {'size':>11} {'median (ms)':>12} {'p95 (ms)':>10} "
+             f"{'peak (MB)':>10} {'vs base':>9}"]
+    for m in measurements:
+        peak = f"{m.peak_bytes / 2**20:.1f}" if m.peak_bytes is not None else '-'
+        comparison = against.get((m.name, m.size))
+        ratio = '-'
+        if comparison is not None:
+            ratio = f"{comparison.ratio:.2f}x" + (' !' if comparison.regressed(threshold) else '')
+        lines.append(f"{m.name:<28} {m.size:>11,} {m.median * 1e3:>12.3f} {m.p95 * 1e3:>10.3f} "
+                     f"{peak:>10} {ratio:>9}")
+    return '\n'.join(lines)
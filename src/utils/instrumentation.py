@@ -0,0 +1,354 @@
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Iterator as IteratorType
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Finished stages kept per recorder; the oldest are dropped beyond this
+DEFAULT_MAX_RECORDS = 10_000
+
+
+class StageRecord:
+    """
+    Measurements of one run of a pipeline stage or analysis method.
+
+    Attributes:
+        name: Stage name, e.g. 'PriceAnalysis.clean_data'
+        wall: Elapsed seconds (time.perf_counter)
+        cpu: Process CPU seconds (time.process_time)
+        rows_in, rows_out: Row counts going in and coming out, where known
+        peak_bytes: Peak memory above the stage's starting point, when
+            tracing memory
+        depth: Nesting level (0 for a stage not run inside another)
+        error: Exception type name if the stage raised
+        profile: cProfile.Profile of the stage, when profiling (outermost
+            stages only; nested stages are part of their parent's profile)
+    """
+
+    __slots__ = ('name', 'started', 'wall', 'cpu', 'rows_in', 'rows_out', 'peak_bytes',
+                 'depth', 'error', 'profile', '_peak_seen')
+
+    def __init__(self, name: str, rows_in: Optional[int], depth: int):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.depth = depth
+        self.started = time.time()
+        self.wall = self.cpu = 0.0
+        self.peak_bytes = None
+        self.error = None
+        self.profile = None
+        self._peak_seen = 0
+
+    def profile_stats(self) -> Optional[pstats.Stats]:
+        return pstats.Stats(self.profile) if self.profile is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'started': self.started, 'wall': self.wall, 'cpu': self.cpu,
+                'rows_in': self.rows_in, 'rows_out': self.rows_out,
+                'peak_bytes': self.peak_bytes, 'depth': self.depth, 'error': self.error}
+
+    def __repr__(self):
+        return f"StageRecord({self.name!r}, wall={self.wall:.6f}, rows_out={self.rows_out})"
+
+
+class Instrumentation:
+    """
+    Records wall time, CPU time, row counts and (optionally) peak memory and
+    cProfile data for named stages.
+
+    Disabled by default: instrumented methods then only check `enabled`
+    before running, so leaving the hooks in place costs nothing measurable.
+    Hooks registered with add_hook() receive every finished StageRecord,
+    e.g. to forward them to a log or a metrics system.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False,
+                 profile: bool = False, max_records: int = DEFAULT_MAX_RECORDS):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.profile = profile
+        self.records: deque = deque(maxlen=max_records)
+        self._hooks: List[Callable[[StageRecord], None]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def enable(self, trace_memory: bool = False, profile: bool = False) -> None:
+        """Start recording; optionally trace memory and/or profile stages."""
+        self.trace_memory = trace_memory
+        self.profile = profile
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+    def add_hook(self, hook: Callable[[StageRecord], None]) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[StageRecord], None]) -> None:
+        self._hooks.remove(hook)
+
+    def _stack(self) -> List[StageRecord]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[Optional[StageRecord]]:
+        """
+        Measure the enclosed block as one stage.
+
+        Set `rows_out` on the yielded record to report the stage's output
+        size. Yields None (and measures nothing) while disabled.
+
+            with instrumentation.stage('dedupe', rows_in=len(df)) as stage:
+                df = df.drop_duplicates()
+                if stage:
+                    stage.rows_out = len(df)
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        record = StageRecord(name, rows_in, len(self._stack()))
+        try:
+            with self._step(record):
+                yield record
+        finally:
+            self._finish(record)
+
+    def measure(self, name: str, call: Callable[[], Any], rows_in: Optional[int] = None,
+                rows_out: Callable[[Any], Optional[int]] = None) -> Any:
+        """
+        Run call() as a stage and return its result.
+
+        If the result is an iterator, the stage also covers consuming it:
+        the time spent producing each item is added to the record, rows out
+        is the total of rows_out(item), and the record is finished once the
+        iterator is exhausted, closed or raises. Otherwise rows out is
+        rows_out(result). Returns call() unchanged while disabled.
+        """
+        if not self.enabled:
+            return call()
+        rows_out = rows_out or _count
+        record = StageRecord(name, rows_in, len(self._stack()))
+        try:
+            with self._step(record):
+                result = call()
+        except BaseException:
+            self._finish(record)
+            raise
+        if not isinstance(result, IteratorType):
+            record.rows_out = rows_out(result)
+            self._finish(record)
+            return result
+        return self._consume(record, result, rows_out)
+
+    def _consume(self, record: StageRecord, items: Iterator,
+                 rows_out: Callable[[Any], Optional[int]]) -> Iterator:
+        try:
+            while True:
+                with self._step(record):
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                rows = rows_out(item)
+                if rows is not None:
+                    record.rows_out = (record.rows_out or 0) + rows
+                yield item
+        finally:
+            # Closing early must still release what the source holds open
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+            self._finish(record)
+
+    @contextmanager
+    def _step(self, record: StageRecord) -> Iterator[None]:
+        """
+        Measure one uninterrupted stretch of a stage, adding its time to the
+        record; a streamed stage is measured in one step per item.
+        """
+        stack = self._stack()
+        profiler = None
+        start_memory = 0
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # The enclosing stage keeps the peak reached so far before reset
+            if stack:
+                stack[-1]._peak_seen = max(stack[-1]._peak_seen, peak)
+            tracemalloc.reset_peak()
+            start_memory = record._peak_seen = current
+        if self.profile and not stack:
+            profiler = record.profile = record.profile or cProfile.Profile()
+
+        stack.append(record)
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        except GeneratorExit:
+            raise
+        except BaseException as exc:
+            record.error = type(exc).__name__
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record.wall += time.perf_counter() - wall
+            record.cpu += time.process_time() - cpu
+            stack.pop()
+            if self.trace_memory and tracemalloc.is_tracing():
+                peak = max(record._peak_seen, tracemalloc.get_traced_memory()[1])
+                record.peak_bytes = max(record.peak_bytes or 0, peak - start_memory)
+                if stack:
+                    stack[-1]._peak_seen = max(stack[-1]._peak_seen, peak)
+
+    def _finish(self, record: StageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+        for hook in list(self._hooks):
+            hook(record)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Every recorded stage run, oldest first, as plain dicts."""
+        with self._lock:
+            return [record.to_dict() for record in self.records]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Totals per stage name: calls, wall, cpu, rows and largest peak.
+
+        Row totals add up the runs whose counts are known; they stay None
+        (unknown) when no run of the stage reported one.
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            entry = totals.setdefault(record.name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0,
+                                                    'rows_in': None, 'rows_out': None,
+                                                    'peak_bytes': None, 'errors': 0})
+            entry['calls'] += 1
+            entry['wall'] += record.wall
+            entry['cpu'] += record.cpu
+            for field in ('rows_in', 'rows_out'):
+                rows = getattr(record, field)
+                if rows is not None:
+                    entry[field] = (entry[field] or 0) + rows
+            entry['errors'] += record.error is not None
+            if record.peak_bytes is not None:
+                entry['peak_bytes'] = max(entry['peak_bytes'] or 0, record.peak_bytes)
+        return totals
+
+    def format_report(self) -> str:
+        """A plain-text table of summary(), slowest stages first."""
+        lines = [f"{'stage':<44} {'calls':>6} {'wall (s)':>10} {'cpu (s)':>10} "
+                 f"{'rows in':>11} {'rows out':>11} {'peak (MB)':>10}"]
+        for name, entry in sorted(self.summary().items(), key=lambda item: -item[1]['wall']):
+            peak = f"{entry['peak_bytes'] / 2**20:.1f}" if entry['peak_bytes'] is not None else '-'
+            rows_in, rows_out = (f"{entry[field]:,}" if entry[field] is not None else '-'
+                                 for field in ('rows_in', 'rows_out'))
+            lines.append(f"{name:<44} {entry['calls']:>6} {entry['wall']:>10.4f} "
+                         f"{entry['cpu']:>10.4f} {rows_in:>11} {rows_out:>11} "
+                         f"{peak:>10}")
+        return '\n'.join(lines)
+
+    def profile_stats(self, name: Optional[str] = None) -> Optional[pstats.Stats]:
+        """Combined cProfile statistics of every profiled run (of one stage)."""
+        stats = None
+        with self._lock:
+            profiles = [record.profile for record in self.records
+                        if record.profile is not None and (name is None or record.name == name)]
+        for profile in profiles:
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        return stats
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w') as handle:
+            json.dump({'records': self.report(), 'summary': self.summary()}, handle, indent=2)
+
+
+# Shared by every DatasetManager unless one is given its own
+_default = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """The process-wide recorder (disabled until enable() is called)."""
+    return _default
+
+
+def _count(value) -> Optional[int]:
+    if value is None or isinstance(value, (str, bytes)):
+        return None
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def _store_rows(manager) -> Optional[int]:
+    store = getattr(manager, 'store', None)
+    return len(store) if store is not None else None
+
+
+def single_row(result) -> Optional[int]:
+    """rows_out for methods returning one summary record, e.g. a dict of statistics."""
+    return None if result is None else 1
+
+
+def counted_rows(result) -> Optional[int]:
+    """rows_out for methods returning a number of rows (or rows of a sequence)."""
+    return int(result) if isinstance(result, int) else _count(result)
+
+
+def instrumented(method: Callable = None, *,
+                 rows_in: Callable[[Any], Optional[int]] = _store_rows,
+                 rows_out: Callable[[Any], Optional[int]] = _count) -> Callable:
+    """
+    Record each call of a DatasetManager method as a stage named
+    '<class>.<method>' in the owner's `instrumentation`.
+
+    By default rows in is the size of the owner's store before the call and
+    rows out the length of the result (None, i.e. unknown, for strings and
+    scalars); pass `rows_in` (given the owner) or `rows_out` (given the
+    result) to count differently, e.g. single_row for a dict of statistics.
+    A method returning an iterator is measured until the iterator is
+    consumed, with rows_out applied to each item (see Instrumentation.measure).
+    Can be used bare (@instrumented) or with arguments.
+    """
+    if method is None:
+        return lambda func: instrumented(func, rows_in=rows_in, rows_out=rows_out)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        recorder = self.instrumentation
+        if not recorder.enabled:
+            return method(self, *args, **kwargs)
+        return recorder.measure(f"{type(self).__name__}.{method.__name__}",
+                                lambda: method(self, *args, **kwargs), rows_in(self), rows_out)
+
+    return wrapper
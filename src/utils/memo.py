@@ -0,0 +1,159 @@
+import copy
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, NamedTuple
+
+import numpy as np
+
+
+# Results kept per analyzer before the least recently used is evicted
+DEFAULT_MEMO_SIZE = 128
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class MemoCache:
+    """
+    Bounded LRU cache of analysis results with hit/miss counters.
+
+    `maxsize` can be changed at any time; 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """The cached value for `key`, or _MISSING; counts a hit or a miss."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def discard_stale(self, version: int) -> None:
+        """Drop entries computed for any data version other than `version`."""
+        with self._lock:
+            for key in [key for key in self._entries if key[1] != version]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _freeze(value: Any) -> Hashable:
+    """A hashable stand-in for call arguments (lists, dicts, arrays...)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, value.tobytes())
+    hash(value)
+    return value
+
+
+# Types of the values a result can share with its cached copy
+_IMMUTABLE = frozenset((str, bytes, int, float, complex, bool, type(None),
+                        np.float64, np.float32, np.int64, np.int32, np.bool_))
+
+
+def _copy(value: Any) -> Any:
+    """
+    Copy the containers of a result (dicts, lists, tuples, arrays) level by
+    level, sharing the immutable values inside them. For the nested dicts of
+    numbers and strings the analyzers return this is far cheaper than
+    copy.deepcopy, which tracks every object it visits.
+    """
+    kind = type(value)
+    if kind in _IMMUTABLE:
+        return value
+    if kind is dict:
+        copied = dict(value)
+        for key, item in copied.items():
+            if type(item) not in _IMMUTABLE:
+                copied[key] = _copy(item)
+        return copied
+    if kind is list:
+        return [item if type(item) in _IMMUTABLE else _copy(item) for item in value]
+    if kind is tuple:
+        return tuple(item if type(item) in _IMMUTABLE else _copy(item) for item in value)
+    if kind is np.ndarray:
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def memoized(method: Callable) -> Callable:
+    """
+    Cache a DatasetManager method's result per data version and arguments.
+
+    The owning object must provide `memo` (a MemoCache) and `data_version`
+    (an int bumped whenever its data changes). Arguments are bound to the
+    method's signature with defaults applied, so f() and f(<the default>)
+    share an entry. Results keep their types and are copied on the way
+    in and out (containers level by level, see _copy), so callers may
+    modify what they get back. Calls whose arguments cannot be hashed
+    simply run uncached; exceptions are not cached.
+    """
+    name = method.__qualname__
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.memo
+        if not cache.maxsize:
+            return method(self, *args, **kwargs)
+        try:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())[1:]
+            key = (name, self.data_version, _freeze(arguments))
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        value = cache.get(key)
+        if value is not _MISSING:
+            return _copy(value)
+        result = method(self, *args, **kwargs)
+        cache.put(key, _copy(result))
+        return result
+
+    return wrapper
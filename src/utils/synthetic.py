@@ -0,0 +1,371 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Rows drawn from one random stream. Streams are keyed on (seed, block), so
+# the rows generated never depend on the chunk size they are delivered in
+_BLOCK_ROWS = 1 << 16
+
+# Metro areas listings are placed around: (city, state, latitude, longitude,
+# relative share of listings, typical monthly rent of a 900 sq ft unit).
+# Every state plus DC appears at least once
+_METROS = [
+    ('Austin', 'TX', 30.2672, -97.7431, 5.0, 1300),
+    ('Dallas', 'TX', 32.7767, -96.7970, 5.0, 1250),
+    ('Houston', 'TX', 29.7604, -95.3698, 4.5, 1150),
+    ('San Antonio', 'TX', 29.4241, -98.4936, 3.0, 1000),
+    ('Los Angeles', 'CA', 34.0522, -118.2437, 4.0, 2400),
+    ('San Diego', 'CA', 32.7157, -117.1611, 2.0, 2200),
+    ('San Francisco', 'CA', 37.7749, -122.4194, 1.5, 3200),
+    ('San Jose', 'CA', 37.3382, -121.8863, 1.5, 2800),
+    ('Sacramento', 'CA', 38.5816, -121.4944, 1.0, 1500),
+    ('Arlington', 'VA', 38.8816, -77.0910, 3.0, 2000),
+    ('Richmond', 'VA', 37.5407, -77.4360, 1.5, 1100),
+    ('Washington', 'DC', 38.9072, -77.0369, 3.0, 2200),
+    ('Baltimore', 'MD', 39.2904, -76.6122, 2.0, 1300),
+    ('Charlotte', 'NC', 35.2271, -80.8431, 3.0, 1100),
+    ('Raleigh', 'NC', 35.7796, -78.6382, 2.0, 1050),
+    ('Denver', 'CO', 39.7392, -104.9903, 3.5, 1450),
+    ('Colorado Springs', 'CO', 38.8339, -104.8214, 1.5, 1100),
+    ('Atlanta', 'GA', 33.7490, -84.3880, 3.5, 1250),
+    ('Miami', 'FL', 25.7617, -80.1918, 2.0, 1900),
+    ('Orlando', 'FL', 28.5383, -81.3792, 2.0, 1250),
+    ('Tampa', 'FL', 27.9506, -82.4572, 1.5, 1200),
+    ('Jacksonville', 'FL', 30.3322, -81.6557, 1.5, 1050),
+    ('Seattle', 'WA', 47.6062, -122.3321, 3.0, 1900),
+    ('Spokane', 'WA', 47.6588, -117.4260, 0.5, 900),
+    ('Chicago', 'IL', 41.8781, -87.6298, 3.0, 1600),
+    ('Columbus', 'OH', 39.9612, -82.9988, 2.0, 950),
+    ('Cincinnati', 'OH', 39.1031, -84.5120, 1.5, 900),
+    ('Cleveland', 'OH', 41.4993, -81.6944, 1.0, 850),
+    ('Nashville', 'TN', 36.1627, -86.7816, 2.0, 1300),
+    ('Memphis', 'TN', 35.1495, -90.0490, 1.0, 850),
+    ('Phoenix', 'AZ', 33.4484, -112.0740, 2.5, 1100),
+    ('Tucson', 'AZ', 32.2226, -110.9747, 1.0, 850),
+    ('Minneapolis', 'MN', 44.9778, -93.2650, 2.0, 1250),
+    ('Boston', 'MA', 42.3601, -71.0589, 2.0, 2500),
+    ('New York', 'NY', 40.7128, -74.0060, 2.5, 2900),
+    ('Buffalo', 'NY', 42.8864, -78.8784, 0.5, 850),
+    ('Philadelphia', 'PA', 39.9526, -75.1652, 2.0, 1400),
+    ('Pittsburgh', 'PA', 40.4406, -79.9959, 1.0, 1000),
+    ('Detroit', 'MI', 42.3314, -83.0458, 1.5, 950),
+    ('Indianapolis', 'IN', 39.7684, -86.1581, 1.5, 900),
+    ('Kansas City', 'MO', 39.0997, -94.5786, 1.5, 950),
+    ('St. Louis', 'MO', 38.6270, -90.1994, 1.0, 900),
+    ('Milwaukee', 'WI', 43.0389, -87.9065, 1.0, 950),
+    ('Las Vegas', 'NV', 36.1699, -115.1398, 1.5, 1100),
+    ('Portland', 'OR', 45.5152, -122.6784, 1.5, 1400),
+    ('Salt Lake City', 'UT', 40.7608, -111.8910, 1.0, 1150),
+    ('Oklahoma City', 'OK', 35.4676, -97.5164, 1.5, 800),
+    ('Omaha', 'NE', 41.2565, -95.9345, 1.0, 900),
+    ('Louisville', 'KY', 38.2527, -85.7585, 1.0, 850),
+    ('Birmingham', 'AL', 33.5186, -86.8104, 0.8, 850),
+    ('New Orleans', 'LA', 29.9511, -90.0715, 0.8, 1100),
+    ('Columbia', 'SC', 34.0007, -81.0348, 0.8, 900),
+    ('Little Rock', 'AR', 34.7465, -92.2896, 0.5, 750),
+    ('Jackson', 'MS', 32.2988, -90.1848, 0.4, 750),
+    ('Albuquerque', 'NM', 35.0844, -106.6504, 0.6, 850),
+    ('Des Moines', 'IA', 41.5868, -93.6250, 0.6, 850),
+    ('Wichita', 'KS', 37.6872, -97.3301, 0.5, 700),
+    ('Boise', 'ID', 43.6150, -116.2023, 0.4, 1000),
+    ('Newark', 'NJ', 40.7357, -74.1724, 1.0, 1700),
+    ('Hartford', 'CT', 41.7658, -72.6734, 0.5, 1200),
+    ('Providence', 'RI', 41.8240, -71.4128, 0.4, 1300),
+    ('Wilmington', 'DE', 39.7391, -75.5398, 0.3, 1100),
+    ('Manchester', 'NH', 42.9956, -71.4548, 0.3, 1200),
+    ('Burlington', 'VT', 44.4759, -73.2121, 0.2, 1300),
+    ('Portland', 'ME', 43.6591, -70.2568, 0.2, 1200),
+    ('Charleston', 'WV', 38.3498, -81.6326, 0.2, 750),
+    ('Fargo', 'ND', 46.8772, -96.7898, 0.2, 750),
+    ('Sioux Falls', 'SD', 43.5446, -96.7311, 0.2, 750),
+    ('Billings', 'MT', 45.7833, -108.5007, 0.2, 850),
+    ('Cheyenne', 'WY', 41.1400, -104.8202, 0.1, 850),
+    ('Anchorage', 'AK', 61.2181, -149.9003, 0.2, 1200),
+    ('Honolulu', 'HI', 21.3069, -157.8583, 0.3, 2100),
+]
+
+# Towns around each metro get names built from these parts
+_TOWN_PREFIXES = ('Oak', 'Cedar', 'Maple', 'Spring', 'River', 'Lake', 'Fair', 'Green',
+                  'Pine', 'Elm', 'Wood', 'Clear', 'Rock', 'Silver', 'Brook', 'Mill',
+                  'Ash', 'Bay', 'Glen', 'Stone', 'Red', 'West', 'North', 'East',
+                  'Willow', 'Hazel', 'Fox', 'Bear', 'Deer', 'Eagle', 'Sun', 'Bright',
+                  'Kings', 'Forest', 'Haven', 'New', 'South', 'Ridge', 'Hunt', 'Chester')
+_TOWN_SUFFIXES = ('field', 'ville', ' Park', ' Heights', 'wood', ' Hills', 'dale',
+                  'ton', ' Springs', ' Grove', 'port', ' Valley', 'view', 'bury')
+
+AMENITIES = ('AC', 'Alarm', 'Basketball', 'Cable or Satellite', 'Clubhouse', 'Dishwasher',
+             'Doorman', 'Elevator', 'Fireplace', 'Garbage Disposal', 'Gated', 'Golf',
+             'Gym', 'Hot Tub', 'Internet Access', 'Luxury', 'Parking', 'Patio/Deck',
+             'Playground', 'Pool', 'Refrigerator', 'Storage', 'TV', 'Tennis', 'View',
+             'Washer Dryer', 'Wood Floors')
+_AMENITY_RATES = np.array([0.20, 0.04, 0.06, 0.12, 0.30, 0.35, 0.02, 0.08, 0.08, 0.15,
+                           0.12, 0.02, 0.45, 0.12, 0.10, 0.03, 0.45, 0.40, 0.20, 0.50,
+                           0.25, 0.18, 0.05, 0.10, 0.06, 0.40, 0.12])
+
+_STREETS = ('Main', 'Oak', 'Park', 'Pine', 'Maple', 'Cedar', 'Elm', 'Washington', 'Lake',
+            'Hill', 'Sunset', 'Highland', 'Church', 'Mill', 'River', 'Jefferson', 'Lincoln')
+_STREET_TYPES = ('St', 'Ave', 'Blvd', 'Dr', 'Ln', 'Rd', 'Ct', 'Way')
+_BEDROOM_LABELS = ('Studio', 'One BR', 'Two BR', 'Three BR', 'Four BR', 'Five BR', 'Six BR')
+
+# (value, probability) tables for the low-cardinality columns
+_CHOICES = {
+    'category': (('housing/rent/apartment', 0.9990), ('housing/rent/home', 0.0005),
+                 ('housing/rent/short_term', 0.0003), ('housing/rent/condo', 0.0002)),
+    'fee': (('No', 0.998), ('Yes', 0.002)),
+    'has_photo': (('Yes', 0.56), ('Thumbnail', 0.41), ('No', 0.03)),
+    'pets_allowed': (('Cats,Dogs', 0.75), ('Cats', 0.12), ('Dogs', 0.08), ('None', 0.05)),
+    'price_type': (('Monthly', 0.9997), ('Weekly', 0.0003)),
+    'source': (('RentLingo', 0.57), ('RentDigs.com', 0.16), ('ListedBuy', 0.09),
+               ('RealRentals', 0.06), ('GoSection8', 0.04), ('Listanza', 0.03),
+               ('rentbits', 0.02), ('RENTOCULAR', 0.015), ('Home Rentals', 0.01),
+               ('tenantcloud', 0.005)),
+}
+
+# Share of rows left empty per column, close to the UCI feed's
+MISSING_RATES = {
+    'amenities': 0.16,
+    'pets_allowed': 0.60,
+    'address': 0.92,
+    'bathrooms': 0.001,
+    'bedrooms': 0.0012,
+    'cityname': 0.003,
+    'state': 0.003,
+    'latitude': 0.0003,  # longitude goes missing with it
+    'price': 0.00001,
+}
+
+_FIRST_TIME, _LAST_TIME = 1_544_000_000, 1_577_000_000
+
+
+def _build_cities() -> Tuple[List[str], List[str], np.ndarray, np.ndarray, np.ndarray,
+                             np.ndarray, np.ndarray]:
+    """
+    The fixed city table: every metro's core city plus satellite towns.
+
+    Returns:
+        (names, states, latitudes, longitudes, spread in degrees, rent level,
+        cumulative probability of a listing landing in each city)
+    """
+    rng = np.random.default_rng(830)
+    cities = []  # (name, state, lat, lon, spread, rent, weight)
+    for city, state, lat, lon, share, rent in _METROS:
+        # The core city takes half the metro's listings
+        cities.append((city, state, lat, lon, 0.06, rent, share / 2))
+
+        towns = max(3, int(share * 12))
+        town_names = set()
+        while len(town_names) < towns:
+            town_names.add(rng.choice(_TOWN_PREFIXES) + rng.choice(_TOWN_SUFFIXES))
+        # Towns lie 10-50 km out and share the other half Zipf-style
+        zipf = 1.0 / np.arange(1, towns + 1)
+        distance = rng.uniform(0.1, 0.45, towns)
+        bearing = rng.uniform(0, 2 * np.pi, towns)
+        rent_factor = rng.uniform(0.75, 1.0, towns)
+        for i, town in enumerate(rng.permutation(sorted(town_names)).tolist()):
+            cities.append((town, state,
+                           lat + distance[i] * np.sin(bearing[i]),
+                           lon + distance[i] * np.cos(bearing[i]) / np.cos(np.radians(lat)),
+                           0.025, rent * rent_factor[i], share / 2 * zipf[i] / zipf.sum()))
+
+    names, states, lats, lons, spreads, rents, weights = zip(*cities)
+    weights = np.asarray(weights)
+    return (list(names), list(states), np.asarray(lats), np.asarray(lons), np.asarray(spreads),
+            np.asarray(rents), np.cumsum(weights / weights.sum()))
+
+
+_CITIES = None
+
+
+def _cities():
+    global _CITIES
+    if _CITIES is None:
+        _CITIES = _build_cities()
+    return _CITIES
+
+
+def _choose(rng: np.random.Generator, column: str, n: int) -> np.ndarray:
+    values, probabilities = zip(*_CHOICES[column])
+    cumulative = np.cumsum(probabilities)
+    picks = np.searchsorted(cumulative / cumulative[-1], rng.random(n), side='right')
+    return np.asarray(values, dtype=object)[np.minimum(picks, len(values) - 1)]
+
+
+_AMENITY_TABLES = None
+
+
+def _amenity_tables() -> List[List[str]]:
+    """Pre-joined text for every combination within each 9-amenity group."""
+    global _AMENITY_TABLES
+    if _AMENITY_TABLES is None:
+        _AMENITY_TABLES = [[','.join(AMENITIES[group + bit] for bit in range(9) if mask >> bit & 1)
+                            for mask in range(512)]
+                           for group in range(0, len(AMENITIES), 9)]
+    return _AMENITY_TABLES
+
+
+def _amenity_lists(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Comma-joined amenity lists; each distinct combination is joined once."""
+    chosen = rng.random((n, len(AMENITIES))) < _AMENITY_RATES
+    masks = chosen.astype(np.int64) @ (np.int64(1) << np.arange(len(AMENITIES), dtype=np.int64))
+    uniques, inverse = np.unique(masks, return_inverse=True)
+    low, middle, high = _amenity_tables()
+    texts = np.array([','.join(filter(None, (low[mask & 511], middle[mask >> 9 & 511],
+                                             high[mask >> 18]))) or None
+                      for mask in uniques.tolist()], dtype=object)
+    return texts[inverse.ravel()]
+
+
+def _generate_block(seed: int, block: int, n: int,
+                    missing_rates: Dict[str, float]) -> pd.DataFrame:
+    rng = np.random.default_rng([seed, block])
+    names, states, city_lats, city_lons, spreads, rents, cumulative = _cities()
+    first_row = block * _BLOCK_ROWS
+
+    city = np.minimum(np.searchsorted(cumulative, rng.random(n), side='right'), len(names) - 1)
+    latitude = city_lats[city] + rng.normal(0, 1, n) * spreads[city]
+    longitude = city_lons[city] + rng.normal(0, 1, n) * spreads[city]
+
+    bedrooms = np.searchsorted(np.cumsum([0.05, 0.34, 0.40, 0.15, 0.045, 0.01, 0.005]),
+                               rng.random(n), side='right').clip(0, 6)
+    bathrooms = (np.round((0.6 + 0.55 * bedrooms + rng.normal(0, 0.35, n)) * 2) / 2).clip(1, 8)
+    square_feet = np.exp(rng.normal(np.log(450 + 330 * bedrooms), 0.22)).round().clip(150)
+    # Rent scales with size (sub-linearly) and the city's price level
+    price = (rents[city] * (square_feet / 900) ** 0.65 * rng.lognormal(0, 0.28, n)).round().clip(100)
+
+    price_type = _choose(rng, 'price_type', n)
+    weekly = price_type == 'Weekly'
+    price[weekly] = (price[weekly] / 4).round()
+
+    city_names = np.asarray(names, dtype=object)[city]
+    state_names = np.asarray(states, dtype=object)[city]
+    labels = np.asarray(_BEDROOM_LABELS, dtype=object)[bedrooms]
+    streets = (rng.integers(1, 9999, n).astype(str).astype(object) + ' '
+               + np.asarray(_STREETS, dtype=object)[rng.integers(0, len(_STREETS), n)] + ' '
+               + np.asarray(_STREET_TYPES, dtype=object)[rng.integers(0, len(_STREET_TYPES), n)])
+    amenities = _amenity_lists(rng, n)
+
+    frame = pd.DataFrame({
+        'id': 5_508_000_000 + (first_row + np.arange(n)) * 3 + rng.integers(0, 3, n),
+        'category': _choose(rng, 'category', n),
+        'title': [f"{label} {street}" for label, street in zip(labels, streets)],
+        'body': [f"{label} apartment in {c}, {s}. {int(sq)} square feet, {ba:g} bath. "
+                 f"Features: {a or 'call for details'}."
+                 for label, c, s, sq, ba, a in zip(labels, city_names, state_names,
+                                                  square_feet.tolist(), bathrooms.tolist(),
+                                                  amenities)],
+        'amenities': amenities,
+        'bathrooms': bathrooms,
+        'bedrooms': bedrooms.astype(float),
+        'currency': 'USD',
+        'fee': _choose(rng, 'fee', n),
+        'has_photo': _choose(rng, 'has_photo', n),
+        'pets_allowed': _choose(rng, 'pets_allowed', n),
+        'price': price,
+        'price_display': [f"${p:,.0f}" + (" Weekly" if w else "")
+                          for p, w in zip(price.tolist(), weekly.tolist())],
+        'price_type': price_type,
+        'square_feet': square_feet.astype(np.int64),
+        'address': streets,
+        'cityname': city_names,
+        'state': state_names,
+        'latitude': latitude.round(4),
+        'longitude': longitude.round(4),
+        'source': _choose(rng, 'source', n),
+        'time': rng.integers(_FIRST_TIME, _LAST_TIME, n),
+    })
+
+    for col, rate in missing_rates.items():
+        missing = rng.random(n) < rate
+        if col == 'latitude':
+            frame.loc[missing, 'longitude'] = np.nan
+        if missing.any():
+            frame[col] = frame[col].where(~missing)
+    frame.index = pd.RangeIndex(first_row, first_row + n)
+    return frame
+
+
+def iter_apartment_chunks(n_rows: int, seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                          missing_rates: Optional[Dict[str, float]] = None
+                          ) -> Iterator[pd.DataFrame]:
+    """
+    Generate a synthetic apartment feed chunk by chunk.
+
+    Rows have the 22 columns of the UCI feed with realistic shapes: listings
+    cluster around cities (skewed toward large metros, with satellite towns
+    for thousands of distinct cities), price grows with square footage and
+    the city's rent level, and optional fields go missing at about the
+    source's rates. The same seed always yields the same rows, whatever
+    `chunk_rows` is, and memory use depends only on the chunk size.
+
+    Args:
+        n_rows: Total rows to generate
+        seed: Random seed
+        chunk_rows: Rows per yielded DataFrame
+        missing_rates: Per-column share of missing values (defaults to
+            MISSING_RATES); columns not listed are always filled
+
+    Yields:
+        DataFrames indexed by global row number
+    """
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+    missing_rates = MISSING_RATES if missing_rates is None else missing_rates
+
+    pending, pending_rows = [], 0
+    for block, start in enumerate(range(0, n_rows, _BLOCK_ROWS)):
+        frame = _generate_block(seed, block, min(_BLOCK_ROWS, n_rows - start), missing_rates)
+        while len(frame):
+            take = min(chunk_rows - pending_rows, len(frame))
+            pending.append(frame.iloc[:take])
+            pending_rows += take
+            frame = frame.iloc[take:]
+            if pending_rows == chunk_rows:
+                yield pd.concat(pending) if len(pending) > 1 else pending[0]
+                pending, pending_rows = [], 0
+    if pending:
+        yield pd.concat(pending) if len(pending) > 1 else pending[0]
+
+
+def make_apartment_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build an in-memory DataFrame with the same 22 columns as the UCI feed.
+
+    Intended for benchmarks and quick experiments when the real dataset is
+    not available; see iter_apartment_chunks for how values are shaped.
+    """
+    chunks = list(iter_apartment_chunks(n_rows, seed, chunk_rows=max(1, n_rows)))
+    frame = chunks[0] if chunks else next(iter_apartment_chunks(1, seed)).iloc[:0]
+    return frame.reset_index(drop=True)
+
+
+def write_apartment_csv(path: str, n_rows: int, seed: int = 0,
+                        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                        missing_rates: Optional[Dict[str, float]] = None) -> int:
+    """
+    Write a synthetic feed as semicolon-separated CSV, like the source file.
+
+    The file is written under a temporary name and moved into place only
+    once complete.
+
+    Returns:
+        Number of rows written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, partial = tempfile.mkstemp(prefix='.generating_', suffix='.csv', dir=directory)
+    rows = 0
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8', newline='') as output:
+            for chunk in iter_apartment_chunks(n_rows, seed, chunk_rows, missing_rates):
+                chunk.to_csv(output, sep=';', index=False, header=rows == 0)
+                rows += len(chunk)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return rows
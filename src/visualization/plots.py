@@ -1,4 +1,6 @@
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+from matplotlib.image import AxesImage
 import seaborn as sns
 import numpy as np
 import pandas as pd
@@ -7,8 +9,108 @@ from typing import List, Dict, Any, Optional, Tuple
 # Handle both notebook and package imports
 try:
     from ..models.apartment import Apartment
+    from ..data.apartment_store import ApartmentStore
 except ImportError:
     from models.apartment import Apartment
+    from data.apartment_store import ApartmentStore
+
+
+CORRELATION_FIELDS = ['price', 'square_feet', 'bathrooms', 'bedrooms', 'latitude', 'longitude']
+
+# Scatter plots with more points than this are drawn as a binned density image
+DENSITY_THRESHOLD = 50_000
+
+# Density grid resolution (x bins, y bins)
+DENSITY_BINS = (400, 300)
+
+
+def _field_arrays(apartments, fields: List[str]) -> List[np.ndarray]:
+    """
+    Pull numeric fields out of an ApartmentStore or a list of apartments.
+    
+    Missing values (None or NaN) come back as NaN.
+    """
+    if isinstance(apartments, ApartmentStore):
+        return [apartments.column(field).astype(float) if apartments.has_field(field)
+                else np.full(len(apartments), np.nan) for field in fields]
+    
+    return [np.array([getattr(apt, field) for apt in apartments], dtype=float)
+            if apartments else np.array([], dtype=float)
+            for field in fields]
+
+
+def _valid_columns(apartments, fields: List[str]) -> List[np.ndarray]:
+    """Numeric fields restricted to rows where every field has a value."""
+    arrays = _field_arrays(apartments, fields)
+    valid = np.ones(len(arrays[0]), dtype=bool)
+    for values in arrays:
+        valid &= ~np.isnan(values)
+    return [values[valid] for values in arrays]
+
+
+def _bedroom_price_groups(apartments) -> Tuple[List[int], List[float], List[int]]:
+    """Average price and listing count per bedroom count, sorted by bedrooms."""
+    bedrooms, prices = _valid_columns(apartments, ['bedrooms', 'price'])
+    # Whole bedrooms, as int() grouped them: 1.5 counts as 1
+    groups, inverse, counts = np.unique(np.trunc(bedrooms), return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=prices, minlength=len(groups))
+    return [int(br) for br in groups], list(sums / np.maximum(counts, 1)), [int(c) for c in counts]
+
+
+def _density_grid(x: np.ndarray, y: np.ndarray, bins: Tuple[int, int] = DENSITY_BINS
+                  ) -> Tuple[np.ndarray, Tuple[float, float, float, float]]:
+    """
+    Count points per cell of a regular grid spanning the data.
+    
+    Cells are computed directly and counted with one bincount, which is
+    several times faster than np.histogram2d on millions of points.
+    
+    Returns:
+        (counts with shape (y bins, x bins), (xmin, xmax, ymin, ymax))
+    """
+    nx, ny = bins
+    xmin, xmax = float(x.min()), float(x.max())
+    ymin, ymax = float(y.min()), float(y.max())
+    # A constant column still gets one non-empty row of cells
+    if xmax == xmin:
+        xmin, xmax = xmin - 0.5, xmax + 0.5
+    if ymax == ymin:
+        ymin, ymax = ymin - 0.5, ymax + 0.5
+    
+    ix = np.minimum(((x - xmin) * (nx / (xmax - xmin))).astype(np.intp), nx - 1)
+    iy = np.minimum(((y - ymin) * (ny / (ymax - ymin))).astype(np.intp), ny - 1)
+    counts = np.bincount(iy * nx + ix, minlength=nx * ny).reshape(ny, nx)
+    return counts, (xmin, xmax, ymin, ymax)
+
+
+def _draw_points(ax, x: np.ndarray, y: np.ndarray, mode: str = 'auto',
+                 density_threshold: int = DENSITY_THRESHOLD,
+                 bins: Tuple[int, int] = DENSITY_BINS, size: float = 20):
+    """
+    Draw x against y as a scatter plot, or as a density image for large inputs.
+    
+    Args:
+        ax: Axes to draw on
+        x, y: Point coordinates (no missing values)
+        mode: 'scatter', 'density', or 'auto' (density above density_threshold points)
+        density_threshold: Point count at which 'auto' switches to density
+        bins: Density grid resolution (x bins, y bins)
+        size: Marker size in scatter mode
+        
+    Returns:
+        The PathCollection (scatter) or AxesImage (density) that was drawn
+    """
+    if mode not in ('auto', 'scatter', 'density'):
+        raise ValueError(f"Unknown mode {mode!r}; use 'auto', 'scatter' or 'density'")
+    
+    if mode == 'scatter' or (mode == 'auto' and len(x) <= density_threshold):
+        return ax.scatter(x, y, alpha=0.6, c='blue', s=size)
+    
+    counts, extent = _density_grid(x, y, bins)
+    # Empty cells stay blank; a log scale keeps sparse regions visible
+    return ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', extent=extent,
+                     aspect='auto', interpolation='nearest', cmap='viridis',
+                     norm=LogNorm(vmin=1, vmax=max(int(counts.max()), 1)))
 
 
 class ApartmentVisualizer:
@@ -35,7 +137,7 @@ class ApartmentVisualizer:
         Returns:
             Matplotlib figure object
         """
-        prices = [apt.price for apt in apartments if apt.price is not None]
+        prices, = _valid_columns(apartments, ['price'])
         
         fig, ax = plt.subplots(figsize=(12, 6))
         
@@ -61,30 +163,39 @@ class ApartmentVisualizer:
     
     def plot_price_vs_sqft_scatter(self, apartments: List[Apartment],
                                   title: str = "Square Feet vs. Price Scatter Plot",
-                                  save_path: Optional[str] = None) -> plt.Figure:
+                                  save_path: Optional[str] = None,
+                                  mode: str = 'auto',
+                                  density_threshold: int = DENSITY_THRESHOLD,
+                                  bins: Tuple[int, int] = DENSITY_BINS) -> plt.Figure:
         """
         Create a scatter plot of square feet vs price.
         
+        Above density_threshold points the plot is drawn as a 2D histogram
+        image (listings per cell, log color scale) instead of one marker per
+        apartment, which keeps rendering time flat for millions of rows.
+        
         Args:
-            apartments: List of apartment objects
+            apartments: List of apartment objects or an ApartmentStore
             title: Plot title
             save_path: Optional path to save the plot
+            mode: 'auto', 'scatter' or 'density'
+            density_threshold: Point count above which 'auto' uses density
+            bins: Density grid resolution (x bins, y bins)
             
         Returns:
             Matplotlib figure object
         """
-        # Filter apartments with both price and square feet data
-        valid_data = [(apt.square_feet, apt.price) for apt in apartments 
-                     if apt.square_feet is not None and apt.price is not None]
+        # Keep apartments with both price and square feet data
+        sqft, prices = _valid_columns(apartments, ['square_feet', 'price'])
         
-        if not valid_data:
+        if not len(sqft):
             raise ValueError("No apartments with both square feet and price data")
         
-        sqft, prices = zip(*valid_data)
-        
         fig, ax = plt.subplots(figsize=(12, 8))
         
-        scatter = ax.scatter(sqft, prices, alpha=0.6, c='blue', s=20)
+        drawn = _draw_points(ax, sqft, prices, mode, density_threshold, bins)
+        if isinstance(drawn, AxesImage):
+            fig.colorbar(drawn, ax=ax, label='Listings per cell')
         ax.set_xlabel('Square Feet')
         ax.set_ylabel('Price ($)')
         ax.set_title(title)
@@ -117,22 +228,7 @@ class ApartmentVisualizer:
             Matplotlib figure object
         """
         # Group by bedrooms and calculate average price
-        bedroom_prices = {}
-        for apt in apartments:
-            if apt.bedrooms is not None and apt.price is not None:
-                bedrooms = int(apt.bedrooms) if apt.bedrooms == apt.bedrooms else apt.bedrooms
-                if bedrooms not in bedroom_prices:
-                    bedroom_prices[bedrooms] = []
-                bedroom_prices[bedrooms].append(apt.price)
-        
-        # Calculate averages
-        bedroom_avg = {bedrooms: np.mean(prices) 
-                      for bedrooms, prices in bedroom_prices.items()}
-        
-        # Sort by number of bedrooms
-        sorted_bedrooms = sorted(bedroom_avg.keys())
-        avg_prices = [bedroom_avg[br] for br in sorted_bedrooms]
-        counts = [len(bedroom_prices[br]) for br in sorted_bedrooms]
+        sorted_bedrooms, avg_prices, counts = _bedroom_price_groups(apartments)
         
         fig, ax = plt.subplots(figsize=(12, 6))
         
@@ -175,20 +271,7 @@ class ApartmentVisualizer:
             Matplotlib figure object
         """
         # Extract numerical data
-        data = []
-        for apt in apartments:
-            row = {
-                'price': apt.price,
-                'square_feet': apt.square_feet,
-                'bathrooms': apt.bathrooms,
-                'bedrooms': apt.bedrooms,
-                'latitude': apt.latitude,
-                'longitude': apt.longitude
-            }
-            data.append(row)
-        
-        # Create DataFrame and calculate correlation
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(dict(zip(CORRELATION_FIELDS, _field_arrays(apartments, CORRELATION_FIELDS))))
         correlation_matrix = df.corr()
         
         fig, ax = plt.subplots(figsize=(10, 8))
@@ -212,13 +295,18 @@ class ApartmentVisualizer:
         return fig
     
     def create_comprehensive_dashboard(self, apartments: List[Apartment],
-                                     save_path: Optional[str] = None) -> plt.Figure:
+                                     save_path: Optional[str] = None,
+                                     scatter_mode: str = 'auto',
+                                     density_threshold: int = DENSITY_THRESHOLD) -> plt.Figure:
         """
         Create a comprehensive dashboard with multiple visualizations.
         
         Args:
-            apartments: List of apartment objects
+            apartments: List of apartment objects or an ApartmentStore
             save_path: Optional path to save the plot
+            scatter_mode: 'auto', 'scatter' or 'density' for the square feet
+                vs. price panel (see plot_price_vs_sqft_scatter)
+            density_threshold: Point count above which 'auto' uses density
             
         Returns:
             Matplotlib figure object
@@ -227,7 +315,7 @@ class ApartmentVisualizer:
         
         # Price histogram
         ax1 = plt.subplot(2, 3, 1)
-        prices = [apt.price for apt in apartments if apt.price is not None]
+        prices, = _valid_columns(apartments, ['price'])
         plt.hist(prices, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
         plt.xlabel('Price ($)')
         plt.ylabel('Frequency')
@@ -236,11 +324,9 @@ class ApartmentVisualizer:
         
         # Scatter plot
         ax2 = plt.subplot(2, 3, 2)
-        valid_data = [(apt.square_feet, apt.price) for apt in apartments 
-                     if apt.square_feet is not None and apt.price is not None]
-        if valid_data:
-            sqft, prices = zip(*valid_data)
-            plt.scatter(sqft, prices, alpha=0.6, c='blue', s=10)
+        sqft, prices = _valid_columns(apartments, ['square_feet', 'price'])
+        if len(sqft):
+            _draw_points(ax2, sqft, prices, scatter_mode, density_threshold, size=10)
             plt.xlabel('Square Feet')
             plt.ylabel('Price ($)')
             plt.title('Square Feet vs. Price')
@@ -248,20 +334,9 @@ class ApartmentVisualizer:
         
         # Bar chart
         ax3 = plt.subplot(2, 3, 3)
-        bedroom_prices = {}
-        for apt in apartments:
-            if apt.bedrooms is not None and apt.price is not None:
-                bedrooms = int(apt.bedrooms) if apt.bedrooms == apt.bedrooms else apt.bedrooms
-                if bedrooms not in bedroom_prices:
-                    bedroom_prices[bedrooms] = []
-                bedroom_prices[bedrooms].append(apt.price)
-        
-        if bedroom_prices:
-            bedroom_avg = {bedrooms: np.mean(prices) 
-                          for bedrooms, prices in bedroom_prices.items()}
-            sorted_bedrooms = sorted(bedroom_avg.keys())
-            avg_prices = [bedroom_avg[br] for br in sorted_bedrooms]
-            
+        sorted_bedrooms, avg_prices, _ = _bedroom_price_groups(apartments)
+        
+        if sorted_bedrooms:
             plt.bar(range(len(sorted_bedrooms)), avg_prices, 
                    color='lightcoral', alpha=0.7)
             plt.xlabel('Number of Bedrooms')
@@ -272,19 +347,7 @@ class ApartmentVisualizer:
         
         # Correlation heatmap
         ax4 = plt.subplot(2, 3, (4, 6))
-        data = []
-        for apt in apartments:
-            row = {
-                'price': apt.price,
-                'square_feet': apt.square_feet,
-                'bathrooms': apt.bathrooms,
-                'bedrooms': apt.bedrooms,
-                'latitude': apt.latitude,
-                'longitude': apt.longitude
-            }
-            data.append(row)
-        
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(dict(zip(CORRELATION_FIELDS, _field_arrays(apartments, CORRELATION_FIELDS))))
         correlation_matrix = df.corr()
         
         sns.heatmap(correlation_matrix, 
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from data.apartment_store import ApartmentStore
+from data.cleaning import clean_frame
+from utils.synthetic import make_apartment_frame
+
+SAMPLE_ROWS = 3000
+
+
+@pytest.fixture(scope='session')
+def raw_frame():
+    """A seeded synthetic feed with the source CSV's columns."""
+    return make_apartment_frame(SAMPLE_ROWS, seed=7)
+
+
+@pytest.fixture(scope='session')
+def cleaned_frame(raw_frame):
+    return clean_frame(raw_frame.copy())
+
+
+@pytest.fixture
+def store(cleaned_frame):
+    return ApartmentStore.from_dataframe(cleaned_frame)
+
+
+@pytest.fixture
+def csv_path(raw_frame, tmp_path):
+    path = tmp_path / 'apartments.csv'
+    raw_frame.to_csv(path, sep=';', index=False)
+    return str(path)
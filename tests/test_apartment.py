@@ -0,0 +1,87 @@
+import math
+import pickle
+import tracemalloc
+
+from data.apartment_store import APARTMENT_FIELDS
+from models.apartment import _UNLOADED, Apartment
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def _eager(store):
+    """Apartments holding every field themselves, as the original model did."""
+    rows = range(len(store))
+    # Copy strings so each apartment owns its text, as when read from a CSV
+    columns = [[(value + ' ')[:-1] if isinstance(value, str) else value
+                for value in store._field_values(field, rows)]
+               for field in APARTMENT_FIELDS]
+    return [Apartment(*values) for values in zip(*columns)]
+
+
+def _traced_bytes(build):
+    tracemalloc.start()
+    try:
+        objects = build()
+        return objects, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_store_backed_apartments_match_eager_model(store):
+    eager = _eager(store)
+    compact = store.to_apartments()
+
+    for full, lazy in zip(eager, compact):
+        for field in APARTMENT_FIELDS:
+            assert _same(getattr(full, field), getattr(lazy, field)), field
+        assert full.get_summary() == lazy.get_summary()
+        assert repr(full) == repr(lazy)
+
+
+def test_compact_model_uses_much_less_memory(store):
+    eager, eager_bytes = _traced_bytes(lambda: _eager(store))
+    del eager
+    compact, compact_bytes = _traced_bytes(store.to_apartments)
+
+    assert len(compact) == len(store)
+    assert compact_bytes * 3 < eager_bytes
+
+
+def test_numeric_fields_stay_in_the_store_until_read(store):
+    apartment = store.get_apartment(0)
+    assert apartment._price is _UNLOADED
+
+    assert apartment.price == store.get_value('price', 0)
+    assert apartment._price == apartment.price
+
+
+def test_lazy_fields_can_be_overwritten(store):
+    apartment = store.get_apartment(1)
+    apartment.price = 1234.0
+    apartment.body = 'replaced'
+    apartment.square_feet = None
+
+    assert apartment.price == 1234.0
+    assert apartment.body == 'replaced'
+    assert apartment.square_feet is None
+
+
+def test_pickling_materializes_lazy_fields(store):
+    apartment = store.get_apartment(2)
+    restored = pickle.loads(pickle.dumps(apartment))
+
+    assert restored._backing is None
+    for field in APARTMENT_FIELDS:
+        assert _same(getattr(restored, field), getattr(apartment, field))
+
+
+def test_plain_apartment_keeps_given_values():
+    apartment = Apartment(id=5, price=900.0, cityname='Austin', state='TX', bedrooms=1)
+
+    assert apartment.id == 5
+    assert apartment.title is None
+    assert repr(apartment) == "Apartment(id=5, price=900.0, city='Austin')"
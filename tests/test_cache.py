@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.apartment_store import TEXT_FIELDS
+from data.cache import is_cache_valid, source_fingerprint
+from data.dataset_manager import DatasetManager
+
+
+def _loaded(csv_path):
+    manager = DatasetManager(csv_path)
+    manager.load_data()
+    manager.clean_data()
+    return manager
+
+
+def test_cached_store_matches_fresh_load(csv_path, tmp_path):
+    expected = _loaded(csv_path).cleaned_data.reset_index(drop=True)
+
+    manager = DatasetManager(csv_path)
+    manager.load_cached(cache_dir=tmp_path / 'cache')
+    reloaded = DatasetManager(csv_path)
+    store = reloaded.load_cached(cache_dir=tmp_path / 'cache')
+
+    pd.testing.assert_frame_equal(store.to_dataframe().reset_index(drop=True), expected,
+                                  check_dtype=False)
+
+
+def test_cached_text_columns_are_arrays(csv_path, tmp_path):
+    fresh = _loaded(csv_path).store
+    cached = DatasetManager(csv_path).load_cached(cache_dir=tmp_path / 'cache')
+
+    for name in TEXT_FIELDS:
+        if not cached.has_field(name):
+            continue
+        values = cached.column(name)
+        assert isinstance(values, np.ndarray)
+        assert values.dtype == object
+        assert pd.Series(values).equals(pd.Series(fresh.column(name)))
+
+
+def test_cache_written_with_hash_is_reused_without_hashing(csv_path, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    DatasetManager(csv_path).load_cached(cache_dir=cache_dir)
+    assert is_cache_valid(cache_dir, source_fingerprint(csv_path, hash_content=False))
+
+    def fail():
+        raise AssertionError("cache was rebuilt")
+    manager = DatasetManager(csv_path)
+    monkeypatch.setattr(manager, 'load_data', fail)
+    manager.load_cached(cache_dir=cache_dir, verify_content=False)
+
+
+def test_hashed_check_rejects_cache_written_without_hash(csv_path, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    DatasetManager(csv_path).load_cached(cache_dir=cache_dir, verify_content=False)
+
+    assert not is_cache_valid(cache_dir, source_fingerprint(csv_path))
+
+
+def test_create_apartments_keeps_cached_text_lazy(csv_path, tmp_path):
+    DatasetManager(csv_path).load_cached(cache_dir=tmp_path / 'cache')
+    manager = DatasetManager(csv_path)
+    store = manager.load_cached(cache_dir=tmp_path / 'cache')
+
+    apartments = manager.create_apartments()
+
+    assert len(apartments) == len(store)
+    assert manager._cleaned_data is None
+
+
+def test_create_apartments_without_data_fails():
+    with pytest.raises(ValueError):
+        DatasetManager().create_apartments()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.apartment_store import ApartmentStore
+from data.dataset_manager import DatasetManager
+from data.indexes import SortedIndex, hash_index
+from data.location_analysis import LocationAnalysis
+from data.price_analysis import PriceAnalysis
+
+
+@pytest.fixture
+def city_store():
+    return ApartmentStore.from_dataframe(pd.DataFrame({
+        'id': np.arange(6),
+        'cityname': ['Austin', 'AUSTIN', 'Straße', 'Dallas', None, 'austin'],
+        'state': ['TX', 'tx', 'DE', 'TX', 'TX', 'TX'],
+        'price': [1000.0, 1100.0, 900.0, 1200.0, 800.0, 950.0],
+    }))
+
+
+def test_hash_lookup_ignores_case_in_row_order(city_store):
+    index = hash_index(city_store, 'cityname')
+
+    np.testing.assert_array_equal(index.lookup('austin'), [0, 1, 5])
+    np.testing.assert_array_equal(index.lookup('AuStIn'), [0, 1, 5])
+    assert len(index.lookup('Houston')) == 0
+
+
+def test_hash_lookup_lower_cases_like_str_lower(city_store):
+    index = hash_index(city_store, 'cityname')
+
+    np.testing.assert_array_equal(index.lookup('STRASSE'), [])
+    np.testing.assert_array_equal(index.lookup('STRAßE'), [2])
+
+
+def test_filters_match_linear_scan(store):
+    analyzer = LocationAnalysis()
+    analyzer.store = store
+    city = store.get_value('cityname', 0)
+    state = store.get_value('state', 0)
+
+    cities = store.column('cityname')
+    expected = [i for i, value in enumerate(cities)
+                if isinstance(value, str) and value.lower() == city.lower()]
+    assert [apt.id for apt in analyzer.filter_by_city(city.upper())] == \
+        [store.get_value('id', i) for i in expected]
+    assert all(apt.state == state for apt in analyzer.filter_by_state(state.lower()))
+
+
+def test_sorted_range_returns_value_order():
+    values = np.array([5.0, 1.0, np.nan, 3.0, 1.0, 9.0, 3.0])
+    index = SortedIndex(values)
+
+    np.testing.assert_array_equal(index.range(1.0, 5.0), [1, 4, 3, 6, 0])
+    np.testing.assert_array_equal(index.range(1.0, 5.0, row_order=True), [0, 1, 3, 4, 6])
+    np.testing.assert_array_equal(index.range(1.0, 5.0, include_low=False), [3, 6, 0])
+    np.testing.assert_array_equal(index.range(high=3.0, include_high=False), [1, 4])
+    np.testing.assert_array_equal(index.equal(3.0), [3, 6])
+    assert index.count(2.0, None) == 4
+
+
+def test_filter_by_price_range_orders(store):
+    analyzer = PriceAnalysis()
+    analyzer.store = store
+    prices = store.column('price')
+    expected = np.flatnonzero((prices >= 800) & (prices <= 1500))
+
+    by_row = analyzer.filter_by_price_range(800, 1500)
+    by_price = analyzer.filter_by_price_range(800, 1500, row_order=False)
+
+    assert [apt.id for apt in by_row] == store.column('id')[expected].tolist()
+    assert sorted(apt.id for apt in by_price) == sorted(apt.id for apt in by_row)
+    assert [apt.price for apt in by_price] == sorted(prices[expected].tolist())
+    assert analyzer.count_in_price_range(800, 1500) == len(expected)
+
+
+def test_query_between_keeps_dataset_order(store):
+    manager = DatasetManager()
+    manager.store = store
+    prices = store.column('price')
+
+    rows = manager.query_rows(price=(800, 1500))
+    np.testing.assert_array_equal(rows, np.flatnonzero((prices >= 800) & (prices <= 1500)))
@@ -0,0 +1,90 @@
+import pytest
+
+from data.dataset_manager import DatasetManager
+from data.price_analysis import PriceAnalysis
+from data.streaming import CityStatsAccumulator
+from utils.instrumentation import Instrumentation
+
+
+@pytest.fixture
+def recorder():
+    return Instrumentation(enabled=True)
+
+
+def _analysis(store, recorder):
+    analysis = PriceAnalysis(instrumentation=recorder)
+    analysis.store = store
+    return analysis
+
+
+def test_analysis_rows_out(store, recorder):
+    analysis = _analysis(store, recorder)
+
+    analysis.compute_price_statistics()
+    analysis.get_price_percentiles()
+    matched = analysis.count_in_price_range(1000, 2000)
+    analysis.get_summary()
+
+    summary = recorder.summary()
+    assert summary['PriceAnalysis.compute_price_statistics']['rows_out'] == 1
+    assert summary['PriceAnalysis.get_price_percentiles']['rows_out'] == 5
+    assert summary['PriceAnalysis.count_in_price_range']['rows_out'] == matched
+    assert summary['PriceAnalysis.get_summary']['rows_out'] == 1
+    assert summary['PriceAnalysis.get_summary']['rows_in'] == len(store)
+
+
+def test_unknown_rows_stay_unknown(recorder):
+    manager = DatasetManager(instrumentation=recorder)
+
+    manager.get_data_info()
+
+    entry = recorder.summary()['DatasetManager.get_data_info']
+    assert entry['calls'] == 1
+    assert entry['rows_in'] is None and entry['rows_out'] is None
+    assert 'DatasetManager.get_data_info' in recorder.format_report()
+
+
+def test_streamed_stage_covers_consumption(csv_path, recorder):
+    manager = DatasetManager(csv_path, instrumentation=recorder)
+
+    chunks = manager.iter_cleaned_chunks(chunksize=500)
+    assert not recorder.records
+    rows = sum(len(chunk) for chunk in chunks)
+
+    (record,) = recorder.records
+    assert record.name == 'DatasetManager.iter_cleaned_chunks'
+    assert record.rows_out == rows
+    assert record.error is None and record.wall > 0
+
+
+def test_closing_a_stream_finishes_its_stage(csv_path, recorder):
+    manager = DatasetManager(csv_path, instrumentation=recorder)
+
+    blocks = manager.sort_stream('price', memory_budget=1 << 20)
+    first = next(blocks)
+    blocks.close()
+
+    names = [record.name for record in recorder.records]
+    assert names.count('DatasetManager.sort_stream') == 1
+    assert recorder.summary()['DatasetManager.sort_stream']['rows_out'] == len(first)
+
+
+def test_pipeline_entry_points_are_recorded(csv_path, recorder, tmp_path):
+    manager = DatasetManager(csv_path, instrumentation=recorder)
+
+    (cities,) = manager.aggregate_stream([CityStatsAccumulator()], chunksize=500)
+    written = manager.sort_stream('price', output_path=str(tmp_path / 'sorted.csv'),
+                                  memory_budget=1 << 20)
+    manager.load_data()
+    manager.clean_data()
+    statistics = manager.get_descriptive_statistics()
+
+    summary = recorder.summary()
+    assert summary['DatasetManager.aggregate_stream']['rows_out'] is None
+    assert summary['DatasetManager.sort_stream']['rows_out'] == written
+    assert summary['DatasetManager.iter_cleaned_chunks']['calls'] == 2
+    assert summary['DatasetManager.get_descriptive_statistics']['rows_out'] == len(statistics)
+    nested = [record for record in recorder.records
+              if record.name == 'DatasetManager.iter_cleaned_chunks']
+    assert all(record.depth == 1 for record in nested)
+    assert cities
@@ -0,0 +1,50 @@
+from data.location_analysis import LocationAnalysis
+from data.price_analysis import PriceAnalysis
+
+
+def _analysis(cls, store):
+    analysis = cls()
+    analysis.store = store
+    return analysis
+
+
+def test_default_arguments_share_an_entry(store):
+    analysis = _analysis(PriceAnalysis, store)
+
+    first = analysis.get_price_percentiles()
+    second = analysis.get_price_percentiles([10, 25, 50, 75, 90])
+    third = analysis.get_price_percentiles(percentiles=[10, 25, 50, 75, 90], approximate=False)
+
+    assert first == second == third
+    assert analysis.cache_info().misses == 1
+    assert analysis.cache_info().hits == 2
+
+
+def test_hits_return_modifiable_copies(store):
+    analysis = _analysis(LocationAnalysis, store)
+
+    stats = analysis.get_city_statistics()
+    city = next(iter(stats))
+    stats[city]['note'] = 'annotated'
+    del stats[next(reversed(stats))]
+    again = analysis.get_city_statistics()
+
+    assert type(again) is dict and type(again[city]) is dict
+    assert 'note' not in again[city]
+    assert len(again) == len(stats) + 1
+    assert analysis.cache_info().hits == 1
+
+
+def test_cached_types_are_unchanged(store):
+    analysis = _analysis(LocationAnalysis, store)
+
+    top = analysis._get_top_cities(5)
+    top_again = analysis._get_top_cities(5)
+
+    assert type(top_again) is list and top_again == top
+    top_again.append(('Nowhere', 0))
+    assert analysis._get_top_cities(5) == top
+
+    prices = _analysis(PriceAnalysis, store)
+    prices.compute_price_statistics()['extra'] = 1.0
+    assert 'extra' not in prices.compute_price_statistics()
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from algorithms.online_stats import QuantileSketch
+from data.price_analysis import PriceAnalysis
+from utils.synthetic import make_apartment_frame
+
+QUANTILES = np.array([0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+
+
+def _rank_errors(sketch, values):
+    estimates = sketch.quantiles(QUANTILES)
+    return np.searchsorted(np.sort(values), estimates) / len(values) - QUANTILES
+
+
+def test_exact_sketch_matches_numpy():
+    values = np.random.default_rng(0).random(150)
+    sketch = QuantileSketch(k=200)
+    sketch.add_many(values)
+
+    assert sketch.exact
+    assert sketch.rank_error == 0.0
+    np.testing.assert_allclose(sketch.quantiles(QUANTILES), np.quantile(values, QUANTILES))
+
+
+@pytest.mark.parametrize('batches', [1, 40])
+def test_sketch_is_unbiased_and_within_rank_error(batches):
+    errors = []
+    for seed in range(60):
+        values = np.random.default_rng(seed + 1000).lognormal(7, 0.5, 20000)
+        sketch = QuantileSketch(k=200, seed=seed)
+        for batch in np.array_split(values, batches):
+            sketch.add_many(batch)
+        seed_errors = _rank_errors(sketch, values)
+        assert np.all(np.abs(seed_errors) <= sketch.rank_error)
+        errors.append(seed_errors)
+
+    # Mean signed error across seeds stays far below one level's spread
+    assert np.all(np.abs(np.mean(errors, axis=0)) < 0.001)
+
+
+def test_merged_sketch_stays_within_rank_error():
+    values = np.random.default_rng(3).normal(size=30000)
+    left, right = QuantileSketch(k=200, seed=1), QuantileSketch(k=200, seed=2)
+    left.add_many(values[:12000])
+    right.add_many(values[12000:])
+    left.merge(right)
+
+    assert left.count == len(values)
+    assert np.all(np.abs(_rank_errors(left, values)) <= left.rank_error)
+
+
+def _analysis(store):
+    analysis = PriceAnalysis()
+    analysis.store = store
+    return analysis
+
+
+def test_price_statistics_are_exact_by_default(store):
+    analysis = _analysis(store)
+    prices = store.valid_values('price')
+
+    stats = analysis.compute_price_statistics()
+    percentiles = analysis.get_price_percentiles()
+
+    assert stats['median'] == np.median(prices)
+    assert stats['q25'] == np.percentile(prices, 25)
+    assert stats['q75'] == np.percentile(prices, 75)
+    assert list(percentiles.values()) == list(np.percentile(prices, [10, 25, 50, 75, 90]))
+    assert f"Median Price: ${np.median(prices):,.2f}" in analysis.get_summary()
+
+
+def test_approximate_percentiles_follow_appends(store):
+    analysis = _analysis(store)
+    analysis.get_price_percentiles(approximate=True)
+    analysis.append_data(make_apartment_frame(500, seed=11))
+    prices = np.sort(analysis.store.valid_values('price'))
+
+    approximate = analysis.get_price_percentiles(approximate=True)
+    error = analysis.price_accumulator.sketch.rank_error
+
+    assert analysis.price_accumulator.count == len(prices)
+    for percentile, value in approximate.items():
+        rank = np.searchsorted(prices, value) / len(prices)
+        assert abs(rank - percentile / 100) <= error
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from data.groupby import group_by
+from data.parallel import ParallelExecutor
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_partitioned_median_matches_group_by(store, workers):
+    aggregations = {'median_price': ('price', 'median'), 'count': ('price', 'count'),
+                    'max_price': ('price', 'max')}
+    expected = group_by(store, ['state', 'bedrooms'], **aggregations)
+
+    with ParallelExecutor(store, workers=workers, partition_rows=400) as executor:
+        result = executor.group_by(['state', 'bedrooms'], **aggregations)
+
+    assert result.keys == expected.keys
+    for name in aggregations:
+        np.testing.assert_array_equal(result.columns[name], expected.columns[name])
+
+
+def test_median_of_group_split_across_partitions(store):
+    rows = np.arange(len(store))
+    expected = group_by(store, ['state'], rows=rows, median=('price', 'median'))
+
+    # Odd partition sizes put one state's rows in many partitions
+    with ParallelExecutor(store, workers=1, partition_rows=37) as executor:
+        result = executor.group_by(['state'], rows=rows, median=('price', 'median'))
+
+    np.testing.assert_array_equal(result.columns['median'], expected.columns['median'])
+
+
+def test_workers_default_to_serial(store):
+    with ParallelExecutor(store, partition_rows=400) as executor:
+        assert executor.workers == 1
+        assert executor._pool is None and executor._shared is None
+
+
+def test_only_requested_fields_are_shared(store):
+    fields = ['state', 'price']
+    expected = group_by(store, ['state'], median=('price', 'median'))
+
+    with ParallelExecutor(store, workers=2, partition_rows=400, fields=fields) as executor:
+        shared = executor._shared.spec
+        result = executor.group_by(['state'], median=('price', 'median'))
+
+    assert set(shared['numeric']) | set(shared['codes']) == set(fields)
+    assert set(shared['categories']) <= set(fields)
+    np.testing.assert_array_equal(result.columns['median'], expected.columns['median'])
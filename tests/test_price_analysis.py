@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from data.apartment_store import ApartmentStore
+from data.price_analysis import PriceAnalysis
+from visualization.plots import _bedroom_price_groups
+
+
+@pytest.fixture
+def fractional_store(cleaned_frame):
+    frame = cleaned_frame.copy()
+    frame['bedrooms'] = frame['bedrooms'].astype(float)
+    frame.loc[frame.index[::3], 'bedrooms'] += 0.5
+    return ApartmentStore.from_dataframe(frame)
+
+
+def _baseline_groups(store):
+    # The per-apartment loop this replaced: int() before grouping
+    groups = {}
+    for apartment in store.to_apartments():
+        if apartment.price is not None and apartment.bedrooms is not None:
+            if apartment.price == apartment.price and apartment.bedrooms == apartment.bedrooms:
+                groups.setdefault(int(apartment.bedrooms), []).append(apartment.price)
+    return groups
+
+
+def test_fractional_bedrooms_pool_with_whole_ones(fractional_store):
+    analysis = PriceAnalysis()
+    analysis.store = fractional_store
+    expected = _baseline_groups(fractional_store)
+
+    stats = analysis.get_price_by_bedrooms()
+
+    assert list(stats) == list(expected)
+    for bedrooms, prices in expected.items():
+        assert stats[bedrooms]['count'] == len(prices)
+        assert stats[bedrooms]['median'] == np.median(prices)
+        assert stats[bedrooms]['mean'] == pytest.approx(np.mean(prices))
+
+
+def test_bedroom_plot_groups_pool_fractional_bedrooms(fractional_store):
+    expected = _baseline_groups(fractional_store)
+
+    bedrooms, averages, counts = _bedroom_price_groups(fractional_store.to_apartments())
+
+    assert bedrooms == sorted(expected)
+    assert counts == [len(expected[b]) for b in bedrooms]
+    np.testing.assert_allclose(averages, [np.mean(expected[b]) for b in bedrooms])
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from data.dataset_manager import DatasetManager
+from data.query import Between, Equals, OneOf, Predicate, Where
+from algorithms.spatial import haversine_km
+
+
+@pytest.fixture
+def manager(store):
+    manager = DatasetManager()
+    manager.store = store
+    return manager
+
+
+def test_incomplete_predicate_fails_at_construction():
+    class NoMask(Predicate):
+        pass
+
+    with pytest.raises(TypeError):
+        NoMask()
+
+
+def test_combined_query_matches_scan(manager, store):
+    state = store.get_value('state', 0)
+    lat, lon = store.get_value('latitude', 0), store.get_value('longitude', 0)
+    explain = []
+
+    rows = manager.query_rows(bedrooms=(1, 2), price=(None, 2000), state=state.lower(),
+                              near=(lat, lon, 200.0), explain=explain)
+
+    bedrooms, prices = store.column('bedrooms'), store.column('price')
+    distances = haversine_km(lat, lon, store.column('latitude'), store.column('longitude'))
+    expected = np.flatnonzero((bedrooms >= 1) & (bedrooms <= 2) & (prices <= 2000)
+                              & (store.column('state') == state) & (distances <= 200.0))
+    np.testing.assert_array_equal(rows, expected)
+    assert len(explain) == 4
+
+
+def test_predicate_objects(manager, store):
+    states = store.column('state')
+    wanted = list(dict.fromkeys(s for s in states[:50] if isinstance(s, str)))[:3]
+
+    rows = manager.query_rows(OneOf('state', wanted), Between('price', 500, None),
+                              Where('bathrooms', lambda values: values >= 1))
+
+    expected = np.flatnonzero(np.isin(states, wanted) & (store.column('price') >= 500)
+                              & (store.column('bathrooms') >= 1))
+    np.testing.assert_array_equal(rows, expected)
+    assert [apt.id for apt in manager.query(Equals('id', store.get_value('id', 3)))] == \
+        [store.get_value('id', 3)]
@@ -0,0 +1,21 @@
+from algorithms.search import SearchAlgorithms
+
+
+def test_search_by_city_store_and_list_agree(store):
+    city = store.get_value('cityname', 0)
+    apartments = store.to_apartments()
+
+    from_store = SearchAlgorithms.search_by_city(store, city.upper())
+    from_list = SearchAlgorithms.search_by_city(apartments, city.upper())
+
+    assert from_store
+    assert [apartment.id for apartment in from_store] == [apartment.id for apartment in from_list]
+
+
+def test_empty_city_matches_nothing(store):
+    apartments = store.to_apartments()
+    for apartment in apartments[:5]:
+        apartment.cityname = ''
+
+    assert SearchAlgorithms.search_by_city(store, '') == []
+    assert SearchAlgorithms.search_by_city(apartments, '') == []
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from data.dataset_manager import DatasetManager
+from data.price_analysis import PriceAnalysis
+from data.location_analysis import LocationAnalysis
+from data.session import DatasetSession
+
+
+def test_analyzers_share_one_store(csv_path):
+    session = DatasetSession(csv_path)
+    prices = session.analyzer(PriceAnalysis)
+    locations = session.analyzer(LocationAnalysis)
+
+    assert prices.store is locations.store is session.store
+    assert prices.cleaned_data is session.cleaned_data
+
+
+def test_load_cached_hit_detaches_session(csv_path, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    DatasetManager(csv_path).load_cached(cache_dir=cache_dir)
+    session = DatasetSession(csv_path)
+    manager = session.analyzer(PriceAnalysis)
+    other = session.analyzer(PriceAnalysis)
+
+    store = manager.load_cached(cache_dir=cache_dir)
+
+    assert manager.session is None
+    assert manager.store is store
+    assert store is not session.store
+    assert manager.cleaned_data is not session.cleaned_data
+    pd.testing.assert_frame_equal(manager.cleaned_data, store.to_dataframe())
+    assert other.session is session and other.store is session.store
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+import algorithms.spatial as spatial
+from algorithms.spatial import GridIndex, batch_query_radius, haversine_km
+
+
+@pytest.fixture(scope='module')
+def points():
+    rng = np.random.default_rng(11)
+    lats = rng.uniform(25, 49, 20_000)
+    lons = rng.uniform(-124, -67, 20_000)
+    lats[::97] = np.nan
+    # A scattering of points worldwide, including next to the antimeridian
+    lats[:100] = rng.uniform(-90, 90, 100)
+    lons[:100] = rng.uniform(-180, 180, 100)
+    lons[100:110] = [179.95, -179.95] * 5
+    lats[100:110] = 10.0
+    return lats, lons
+
+
+@pytest.fixture(scope='module')
+def targets():
+    rng = np.random.default_rng(12)
+    lats = rng.uniform(25, 49, 400)
+    lons = rng.uniform(-124, -67, 400)
+    radii = rng.choice([0.0, 1.0, 10.0, 50.0, 300.0], 400)
+    lats[:4], lons[:4] = [89.9, -89.9, 10.0, 10.0], [0.0, 120.0, 179.99, -179.99]
+    radii[:4] = [500.0, 500.0, 30.0, 30.0]
+    radii[4:8] = 5000.0
+    return lats, lons, radii
+
+
+def test_query_radius_matches_brute_force(points):
+    lats, lons = points
+    index = GridIndex(lats, lons)
+    for lat, lon, radius in [(30.27, -97.74, 25.0), (10.0, 179.99, 30.0), (89.5, 0.0, 400.0)]:
+        distances = haversine_km(lat, lon, lats, lons)
+        expected = np.flatnonzero(distances <= radius)
+        np.testing.assert_array_equal(index.query_radius(lat, lon, radius), expected)
+
+
+def test_batch_matches_single_queries(points, targets):
+    index = GridIndex(*points)
+    lats, lons, radii = targets
+    expected = [index.query_radius(lat, lon, radius) for lat, lon, radius in zip(lats, lons, radii)]
+
+    batched = index.query_radius_batch(lats, lons, radii)
+    counts = index.query_radius_batch(lats, lons, radii, counts_only=True)
+
+    assert len(batched) == len(expected)
+    for got, want in zip(batched, expected):
+        np.testing.assert_array_equal(got, want)
+    np.testing.assert_array_equal(counts, [len(rows) for rows in expected])
+
+
+def test_batch_is_independent_of_block_size(points, targets, monkeypatch):
+    index = GridIndex(*points)
+    lats, lons, radii = targets
+    expected = index.query_radius_batch(lats, lons, radii)
+
+    monkeypatch.setattr(spatial, 'BATCH_PAIR_BUDGET', 500)
+    for got, want in zip(index.query_radius_batch(lats, lons, radii), expected):
+        np.testing.assert_array_equal(got, want)
+
+
+def test_batch_edge_cases(points):
+    index = GridIndex(*points)
+
+    assert index.query_radius_batch([], [], 10.0) == []
+    counts = index.query_radius_batch([np.nan, 30.0, 30.0], [-97.0, np.nan, -97.0],
+                                      [10.0, 10.0, -1.0], counts_only=True)
+    np.testing.assert_array_equal(counts, [0, 0, 0])
+    empty = GridIndex(np.array([]), np.array([]))
+    assert [len(rows) for rows in empty.query_radius_batch([30.0], [-97.0], 10.0)] == [0]
+
+
+def test_batch_query_radius_with_workers(points, targets):
+    index = GridIndex(*points)
+    lats, lons, radii = targets
+    expected = index.query_radius_batch(lats, lons, radii, counts_only=True)
+
+    counts = batch_query_radius(index, lats, lons, radii, counts_only=True, workers=2)
+    np.testing.assert_array_equal(counts, expected)
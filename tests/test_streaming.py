@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.location_analysis import LocationAnalysis
+from data.streaming import (CityStatsAccumulator, StateStatsAccumulator, clean_chunks,
+                            read_chunks, run_aggregations)
+
+
+def test_streamed_city_stats_match_in_memory(csv_path):
+    analyzer = LocationAnalysis(csv_path)
+    analyzer.load_data()
+    analyzer.clean_data()
+    expected = analyzer.get_city_statistics()
+
+    streamed, = run_aggregations(clean_chunks(read_chunks(csv_path, 700)),
+                                 [CityStatsAccumulator()])
+
+    assert streamed.keys() == expected.keys()
+    for city, stats in expected.items():
+        assert streamed[city]['count'] == stats['count']
+        assert streamed[city]['state'] == stats['state']
+        assert streamed[city]['avg_price'] == pytest.approx(stats['avg_price'])
+
+
+def test_streamed_state_stats_match_in_memory(csv_path):
+    analyzer = LocationAnalysis(csv_path)
+    analyzer.load_data()
+    analyzer.clean_data()
+    expected = analyzer.get_state_statistics()
+
+    streamed, = run_aggregations(clean_chunks(read_chunks(csv_path, 700)),
+                                 [StateStatsAccumulator()])
+
+    assert {state: stats['count'] for state, stats in streamed.items()} == \
+        {state: stats['count'] for state, stats in expected.items()}
+
+
+def test_city_stats_without_bedrooms_column():
+    chunk = pd.DataFrame({'cityname': ['Austin', 'Austin', 'Dallas'],
+                          'state': ['TX', 'TX', 'TX'],
+                          'price': [1000.0, 2000.0, np.nan]})
+    accumulator = CityStatsAccumulator()
+    accumulator.update(chunk)
+
+    result = accumulator.result()
+    assert result['Austin'] == {'count': 2, 'avg_bedrooms': None, 'state': 'TX',
+                                'avg_price': 1500.0}
+    assert result['Dallas']['avg_price'] is None